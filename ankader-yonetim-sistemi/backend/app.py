@@ -5,16 +5,55 @@ ANKADER Dernek Yönetim Sistemi Backend API
 Python Flask uygulaması
 """
 
+import atexit
+import os
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from datetime import datetime
 from routes import auth_bp, members_bp, events_bp, admin_bp
-from models import user_manager, activity_log_manager
+from models import (user_manager, member_manager, event_manager, enrollment_manager,
+                    activity_log_manager, rollup_manager)
+from models.activity_log import parse_retention
+from middleware import cache_status
+from storage import create_store
 
 # Flask uygulaması oluştur
 app = Flask(__name__)
 CORS(app)  # CORS'u etkinleştir
 
+# Depoyu bağla ve kalıcı veriyi belleğe yükle (ANKADER_STORAGE)
+store = create_store()
+store.attach(user_manager, member_manager, event_manager, enrollment_manager,
+             activity_log_manager, rollup_manager)
+store.recover()
+
+# Üye/etkinlik üzerinde saklanmış eski katılım listelerini kayıt deposuna taşı
+migrated = enrollment_manager.migrate_legacy(member_manager, event_manager)
+
+# Aylık özet tablosu boşsa (ilk çalıştırma) ham veriden bir kez oluştur; doluysa
+# taşınan kayıtların katılımlarını özetlere yansıt
+managers = (member_manager, event_manager, enrollment_manager, activity_log_manager)
+if not rollup_manager.backfill(*managers) and migrated:
+    rollup_manager.rebuild(['attendance'], *managers)
+
+user_manager.create_default_admin()
+atexit.register(store.close)
+
+# Log saklama süreleri ve arka plan temizleyici (ANKADER_LOG_RETENTION)
+activity_log_manager.set_retention(parse_retention(os.environ.get('ANKADER_LOG_RETENTION', '')))
+activity_log_manager.start_sweeper(int(os.environ.get('ANKADER_LOG_SWEEP_INTERVAL', 3600)))
+atexit.register(activity_log_manager.stop_sweeper)
+
+# Aktivite logları istek dışında, gruplar halinde yazılır; kapanışta kuyruk boşaltılır
+activity_log_manager.start_writer(
+    queue_size=int(os.environ.get('ANKADER_AUDIT_QUEUE_SIZE', 10000)),
+    batch_size=int(os.environ.get('ANKADER_AUDIT_BATCH_SIZE', 500))
+)
+atexit.register(activity_log_manager.stop_writer)
+
+# Diğer worker'ların yazdıklarını her istekten önce al
+app.before_request(store.sync)
+
 # Blueprint'leri kaydet
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(members_bp, url_prefix='/api/members')
@@ -47,7 +86,7 @@ def test():
         "timestamp": datetime.now().isoformat(),
         "framework": "Python Flask",
         "total_users": len(user_manager.users),
-        "total_logs": len(activity_log_manager.logs)
+        "total_logs": activity_log_manager.count_logs()
     })
 
 @app.route('/api/health', methods=['GET'])
@@ -60,8 +99,12 @@ def health_check():
             "user_manager": "active",
             "member_manager": "active", 
             "event_manager": "active",
+            "enrollment_manager": "active",
             "activity_log_manager": "active"
-        }
+        },
+        "storage": store.status(),
+        "audit_log": activity_log_manager.audit_status(),
+        "cache": cache_status()
     })
 
 @app.errorhandler(404)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Storage Benchmark - Liste tabanlı yöneticiler ile SQLite deposunun karşılaştırması
+
+Kullanım (backend dizininde):
+    python benchmarks/storage_benchmark.py --members 100000 --logs 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.member import Member, MemberManager
+from models.activity_log import ActivityLog, ActivityLogManager
+from storage import MemoryStore, SQLiteStore
+
+ACTIONS = ['login', 'logout', 'member_create', 'member_update', 'event_create']
+
+
+def make_member(i: int) -> Member:
+    """Deneme üyesi oluştur"""
+    return Member(
+        name=f'Üye {i}',
+        phone=f'05{i:09d}',
+        email=f'uye{i}@ankader.org',
+        graduation_year=1990 + i % 30,
+        university=f'Üniversite {i % 50}',
+        department=f'Bölüm {i % 20}',
+        join_date=datetime(2020, 1, 1) + timedelta(minutes=i)
+    )
+
+
+def make_log(i: int, start: datetime) -> ActivityLog:
+    """Deneme log kaydı oluştur"""
+    return ActivityLog(
+        user_id=i % 25 + 1,
+        action=ACTIONS[i % len(ACTIONS)],
+        description=f'Deneme kaydı {i}',
+        created_at=start + timedelta(seconds=i)
+    )
+
+
+def timed(label: str, fn, repeat: int = 1) -> float:
+    """İşlemi çalıştır, işlem başına süreyi (ms) yazdır"""
+    started = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    elapsed = (time.perf_counter() - started) * 1000
+    per_op = elapsed / repeat
+    print(f'  {label:<42} {per_op:>12.3f} ms/işlem  ({repeat} tekrar)')
+    return per_op
+
+
+def populate(store, members: MemberManager, logs: ActivityLogManager,
+             member_count: int, log_count: int):
+    """Yöneticileri doğrudan doldur (oluşturma doğrulamasını atlayarak)"""
+    start = datetime.now() - timedelta(seconds=log_count)
+    member_list = [make_member(i) for i in range(member_count)]
+    log_list = [make_log(i, start) for i in range(log_count)]
+
+    if isinstance(store, SQLiteStore):
+        chunk = 50000
+        for offset in range(0, member_count, chunk):
+            store.insert_many('members', member_list[offset:offset + chunk])
+        for offset in range(0, log_count, chunk):
+            store.insert_many('activity_logs', log_list[offset:offset + chunk])
+        members.restore_entities(member_list)
+        logs.restore_entities(log_list)
+    else:
+        for i, entity in enumerate(member_list, 1):
+            entity.id = i
+        for i, entity in enumerate(log_list, 1):
+            entity.id = i
+        members.restore_entities(member_list)
+        logs.restore_entities(log_list)
+        # Bellek deposu sonraki ID'leri mevcut kayıtlardan hesaplar
+        store.recover()
+
+
+def run_suite(label: str, members: MemberManager, logs: ActivityLogManager,
+              member_count: int, samples: int, log_samples: int):
+    """Ortak okuma/yazma ölçümleri"""
+    print(f'\n[{label}]')
+    rng = random.Random(42)
+    offset = member_count + 1
+
+    timed('create_member', lambda i: members.create_member({
+        'name': f'Yeni Üye {i}',
+        'phone': f'05{offset + i:09d}',
+        'email': f'yeni{offset + i}@ankader.org',
+        'graduation_year': 2010,
+        'university': 'Üniversite',
+        'department': 'Bölüm'
+    }), samples)
+    timed('update_member', lambda i: members.update_member(
+        rng.randint(1, member_count), {'notes': f'not {i}'}), samples)
+    timed('get_member_by_id', lambda i: members.get_member_by_id(
+        rng.randint(1, member_count)), samples)
+    timed('get_member_by_email', lambda i: members.get_member_by_email(
+        f'uye{rng.randrange(member_count)}@ankader.org'), samples)
+    timed('create_log', lambda i: logs.log_activity(
+        user_id=1, action='login', description='Benchmark'), log_samples)
+    timed('get_logs_by_user (limit=50)', lambda i: logs.get_logs_by_user(
+        rng.randint(1, 25)), log_samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ANKADER depolama benchmark')
+    parser.add_argument('--members', type=int, default=100000)
+    parser.add_argument('--logs', type=int, default=1000000)
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--log-samples', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'Üye: {args.members}, Log: {args.logs}')
+
+    # Liste tabanlı (bellek) yöneticiler
+    list_store = MemoryStore()
+    list_members, list_logs = MemberManager(), ActivityLogManager()
+    list_store.attach(list_members, list_logs)
+    started = time.perf_counter()
+    populate(list_store, list_members, list_logs, args.members, args.logs)
+    print(f'Liste doldurma: {time.perf_counter() - started:.2f} s')
+    run_suite('liste (bellek)', list_members, list_logs,
+              args.members, args.samples, args.log_samples)
+    del list_members, list_logs
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'benchmark.db')
+
+        store = SQLiteStore(path)
+        sql_members, sql_logs = MemberManager(), ActivityLogManager()
+        store.attach(sql_members, sql_logs)
+        started = time.perf_counter()
+        populate(store, sql_members, sql_logs, args.members, args.logs)
+        print(f'\nSQLite doldurma: {time.perf_counter() - started:.2f} s '
+              f'(dosya: {os.path.getsize(path) / 1024 / 1024:.1f} MB)')
+        run_suite('sqlite (WAL)', sql_members, sql_logs,
+                  args.members, args.samples, args.log_samples)
+
+        # Yeniden başlatma: yeni worker tüm veriyi diskten yükler
+        worker = SQLiteStore(path)
+        worker_members, worker_logs = MemberManager(), ActivityLogManager()
+        worker.attach(worker_members, worker_logs)
+        worker.recover()
+        print(f'\n[yeniden başlatma]\n  {"recover()":<42} {worker.recovery["duration_ms"]:>12.1f} ms '
+              f'({worker.recovery["records"]} kayıt)')
+
+        # Worker'lar arası tutarlılık: ilk worker'ın yazdığı değişiklikler
+        for i in range(args.samples):
+            sql_members.update_member(i + 1, {'notes': f'senkron {i}'})
+        timed(f'sync() ({args.samples} değişiklik)', lambda i: worker.sync())
+        timed('sync() (değişiklik yok)', lambda i: worker.sync(), args.samples)
+        assert worker_members.get_member_by_id(1).notes == 'senkron 0'
+
+        worker.close()
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ from .auth import (
     admin_required,
     acar_required,
     log_activity,
+    audit,
     get_current_user,
     get_current_user_id,
     is_authenticated,
@@ -20,6 +21,7 @@ from .auth import (
     optional_auth,
     rate_limit
 )
+from .cache import VersionedCache, cache_status
 
 __all__ = [
     'auth_required',
@@ -28,6 +30,7 @@ __all__ = [
     'admin_required',
     'acar_required',
     'log_activity',
+    'audit',
     'get_current_user',
     'get_current_user_id',
     'is_authenticated',
@@ -35,5 +38,7 @@ __all__ = [
     'has_permission',
     'api_key_required',
     'optional_auth',
-    'rate_limit'
+    'rate_limit',
+    'VersionedCache',
+    'cache_status'
 ]
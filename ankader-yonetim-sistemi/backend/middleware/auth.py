@@ -7,10 +7,13 @@ Auth Middleware - Kimlik doğrulama ve yetkilendirme middleware'i
 from functools import wraps
 from flask import request, jsonify, g
 import base64
+import logging
 import time
 from typing import List, Callable, Any
 from models import user_manager, activity_log_manager
 
+logger = logging.getLogger(__name__)
+
 def decode_token(token: str) -> dict:
     """Token'ı decode et"""
     try:
@@ -39,36 +42,48 @@ def get_token_from_request() -> str:
     
     return ''
 
+def resolve_request_user() -> tuple:
+    """Token'ı çöz ve kullanıcıyı bul - istek başına bir kez çalışır
+
+    Dönüş: (user, token_data, hata_mesajı)
+    """
+    if '_auth_result' in g:
+        return g._auth_result
+    
+    result = _resolve_token_user()
+    g._auth_result = result
+    return result
+
+def _resolve_token_user() -> tuple:
+    """Token'dan kullanıcıyı çöz (önbelleksiz)"""
+    token = get_token_from_request()
+    if not token:
+        return None, None, 'Token bulunamadı, erişim reddedildi'
+    
+    decoded = decode_token(token)
+    if not decoded:
+        return None, None, 'Geçersiz veya süresi dolmuş token'
+    
+    user = user_manager.get_user_by_id(decoded['user_id'])
+    if not user:
+        return None, None, 'Kullanıcı bulunamadı'
+    
+    if not user.is_active:
+        return None, None, 'Hesap deaktif durumda'
+    
+    return user, decoded, None
+
 def auth_required(f: Callable) -> Callable:
     """Kimlik doğrulama gerekli decorator"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        token = get_token_from_request()
-        
-        if not token:
-            return jsonify({
-                'success': False,
-                'message': 'Token bulunamadı, erişim reddedildi'
-            }), 401
+        # Decorator'lar iç içe kullanılsa da token yalnızca bir kez çözülür
+        user, decoded, error = resolve_request_user()
         
-        decoded = decode_token(token)
-        if not decoded:
+        if error:
             return jsonify({
                 'success': False,
-                'message': 'Geçersiz veya süresi dolmuş token'
-            }), 401
-        
-        user = user_manager.get_user_by_id(decoded['user_id'])
-        if not user:
-            return jsonify({
-                'success': False,
-                'message': 'Kullanıcı bulunamadı'
-            }), 401
-        
-        if not user.is_active:
-            return jsonify({
-                'success': False,
-                'message': 'Hesap deaktif durumda'
+                'message': error
             }), 401
         
         # Kullanıcıyı global context'e ekle
@@ -129,37 +144,73 @@ def acar_required(f: Callable) -> Callable:
     """ACAR yetkisi gerekli decorator"""
     return role_required('ACAR')(f)
 
+def audit(**fields):
+    """İsteğin aktivite log kaydına bilgi ekle
+    
+    Alanlar: user_id, action, description, target_id, target_type, changes, details
+    """
+    if not hasattr(g, 'audit'):
+        g.audit = {}
+    details = fields.pop('details', None)
+    if details:
+        g.audit.setdefault('details', {}).update(details)
+    g.audit.update(fields)
+
+def _status_code(result) -> int:
+    """View dönüş değerinden HTTP durum kodunu çıkar"""
+    if isinstance(result, tuple):
+        return result[1] if len(result) > 1 and isinstance(result[1], int) else 200
+    return getattr(result, 'status_code', 200)
+
 def log_activity(action: str, description: str = '', target_id: int = None, 
                 target_type: str = None, details: dict = None) -> Callable:
-    """Aktivite logla decorator"""
+    """Aktivite logla decorator
+    
+    Her istek için tek kayıt yazılır. View fonksiyonu `audit()` ile hedef,
+    alan değişiklikleri (diff) veya farklı bir aksiyon ekleyebilir. Başarısız
+    istekler yalnızca view `audit()` çağırdıysa loglanır.
+    """
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def decorated_function(*args, **kwargs):
             # Orijinal fonksiyonu çalıştır
             result = f(*args, **kwargs)
             
-            # Eğer kullanıcı varsa aktiviteyi logla
-            if hasattr(g, 'user') and g.user:
-                try:
-                    # Request bilgilerini topla
-                    request_details = details or {}
-                    request_details.update({
-                        'ip': request.remote_addr,
-                        'user_agent': request.headers.get('User-Agent', ''),
-                        'method': request.method,
-                        'endpoint': request.endpoint
-                    })
-                    
-                    activity_log_manager.log_activity(
-                        user_id=g.user.id,
-                        action=action,
-                        description=description or f'{action} işlemi gerçekleştirildi',
-                        target_id=target_id,
-                        target_type=target_type,
-                        details=request_details
-                    )
-                except Exception as e:
-                    print(f"Aktivite loglama hatası: {e}")
+            try:
+                record = getattr(g, 'audit', {})
+                status = _status_code(result)
+                if status >= 400 and not record:
+                    return result
+                
+                user = getattr(g, 'user', None)
+                user_id = record.get('user_id', user.id if user else None)
+                if user_id is None:
+                    return result
+                
+                # Request bilgilerini topla
+                request_details = dict(details or {})
+                request_details.update({
+                    'ip': request.remote_addr,
+                    'user_agent': request.headers.get('User-Agent', ''),
+                    'method': request.method,
+                    'endpoint': request.endpoint,
+                    'status': status
+                })
+                request_details.update(record.get('details', {}))
+                if record.get('changes'):
+                    request_details['changes'] = record['changes']
+                
+                log_action = record.get('action', action)
+                activity_log_manager.log_activity(
+                    user_id=user_id,
+                    action=log_action,
+                    description=record.get('description') or description or f'{log_action} işlemi gerçekleştirildi',
+                    target_id=record.get('target_id', target_id),
+                    target_type=record.get('target_type', target_type),
+                    details=request_details
+                )
+            except Exception:
+                logger.exception('Aktivite loglama hatası')
             
             return result
         
@@ -233,15 +284,11 @@ def optional_auth(f: Callable) -> Callable:
     """İsteğe bağlı kimlik doğrulama decorator"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        token = get_token_from_request()
+        user, decoded, error = resolve_request_user()
         
-        if token:
-            decoded = decode_token(token)
-            if decoded:
-                user = user_manager.get_user_by_id(decoded['user_id'])
-                if user and user.is_active:
-                    g.user = user
-                    g.token_data = decoded
+        if not error:
+            g.user = user
+            g.token_data = decoded
         
         return f(*args, **kwargs)
     
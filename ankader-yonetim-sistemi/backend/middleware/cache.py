@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache Middleware - Veri sürümlerine bağlı yanıt önbelleği
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# İsme göre tüm önbellekler (metrikler için)
+CACHES: Dict[str, 'VersionedCache'] = {}
+
+class VersionedCache:
+    """Yöneticilerin veri sürümleriyle anahtarlanan önbellek
+    
+    Kayıt, hesaplandığı andaki sürüm demeti değişene veya `ttl` saniye dolana
+    kadar geçerlidir (zamana bağlı alanlar, ör. "son 24 saat", için). Aynı anahtar
+    için eş zamanlı ıskalamalar tek hesaplamada birleştirilir (single-flight):
+    ilk istek hesaplar, diğerleri onun sonucunu bekler.
+    """
+    
+    def __init__(self, name: str, ttl: float = 30.0):
+        self.name = name
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[Any, Any, float]] = {}
+        self._flights: Dict[Hashable, '_Flight'] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'errors': 0
+        }
+        CACHES[name] = self
+    
+    def get(self, key: Hashable, version: Any, compute: Callable[[], Any]) -> Any:
+        """Önbellekteki değeri döndür; sürüm değiştiyse veya süre dolduysa yeniden hesapla"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and entry[2] > time.monotonic():
+                self.stats['hits'] += 1
+                return entry[1]
+            
+            flight = self._flights.get(key)
+            if flight is not None and flight.version == version:
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight(version)
+                self.stats['misses'] += 1
+                leader = True
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self.stats['errors'] += 1
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = (version, flight.value, time.monotonic() + self.ttl)
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+        return flight.value
+    
+    def invalidate(self):
+        """Tüm kayıtları sil"""
+        with self._lock:
+            self._entries = {}
+    
+    def status(self) -> Dict[str, Any]:
+        """Önbellek metrikleri (health için)"""
+        with self._lock:
+            stats = dict(self.stats)
+            entries = len(self._entries)
+        requests = stats['hits'] + stats['misses'] + stats['coalesced']
+        served = stats['hits'] + stats['coalesced']
+        return {
+            **stats,
+            'entries': entries,
+            'ttl_seconds': self.ttl,
+            'hit_rate': round(served / requests, 4) if requests else 0.0
+        }
+
+
+class _Flight:
+    """Süren tek bir hesaplama; bekleyenler sonucu buradan alır"""
+    
+    def __init__(self, version: Any):
+        self.version = version
+        self.value = None
+        self.error = None
+        self.done = threading.Event()
+
+
+def cache_status() -> Dict[str, Dict[str, Any]]:
+    """Tüm önbelleklerin metrikleri"""
+    return {name: cache.status() for name, cache in CACHES.items()}
@@ -7,11 +7,15 @@ Models Package - Tüm modelleri içe aktar
 from .user import User, UserManager, user_manager
 from .member import Member, MemberManager, member_manager
 from .event import Event, EventManager, event_manager
-from .activity_log import ActivityLog, ActivityLogManager, activity_log_manager
+from .enrollment import Enrollment, EnrollmentManager, enrollment_manager
+from .rollup import MonthlyRollup, RollupManager, rollup_manager
+from .activity_log import ActivityLog, ActivityLogManager, activity_log_manager, field_diff
 
 __all__ = [
     'User', 'UserManager', 'user_manager',
     'Member', 'MemberManager', 'member_manager', 
     'Event', 'EventManager', 'event_manager',
-    'ActivityLog', 'ActivityLogManager', 'activity_log_manager'
+    'Enrollment', 'EnrollmentManager', 'enrollment_manager',
+    'MonthlyRollup', 'RollupManager', 'rollup_manager',
+    'ActivityLog', 'ActivityLogManager', 'activity_log_manager', 'field_diff'
 ]
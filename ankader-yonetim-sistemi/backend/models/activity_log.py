@@ -4,8 +4,21 @@
 ActivityLog Model - Aktivite Log Modeli
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+import heapq
+import logging
+import queue
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, date, timedelta
+from itertools import islice
+from typing import Dict, Any, Optional, List, Tuple
+from storage import MemoryStore
+from .text_index import TrigramIndex
+from .rollup import rollup_manager
+from .serialization import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
 
 class ActivityLog:
     """Aktivite log modeli"""
@@ -24,7 +37,16 @@ class ActivityLog:
         'budget_create',
         'budget_update',
         'budget_delete',
-        'admin_action'
+        'admin_action',
+        'login_attempt',
+        'login_failed',
+        'profile_update',
+        'admin_user_create',
+        'admin_user_update',
+        'admin_user_delete',
+        'admin_logs_cleanup',
+        'admin_backup',
+        'admin_restore'
     ]
     
     VALID_TARGET_TYPES = ['User', 'Member', 'Event', 'Budget']
@@ -43,8 +65,8 @@ class ActivityLog:
         """Aktivite log verilerini doğrula"""
         errors = []
         
-        # Kullanıcı ID kontrolü
-        if not self.user_id:
+        # Kullanıcı ID kontrolü (0: bilinmeyen kullanıcı, örn. başarısız giriş)
+        if self.user_id is None:
             errors.append('Kullanıcı ID zorunludur')
         
         # Aksiyon kontrolü
@@ -94,16 +116,470 @@ class ActivityLog:
         return self.__str__()
 
 
+def field_diff(before: Dict[str, Any], after: Dict[str, Any],
+               ignore: tuple = ('updated_at', 'updated_by', 'password')) -> Dict[str, List[Any]]:
+    """İki sözlük arasındaki değişen alanlar: {alan: [eski, yeni]}"""
+    changes = {}
+    for key in set(before) | set(after):
+        if key in ignore:
+            continue
+        old, new = before.get(key), after.get(key)
+        if old != new:
+            changes[key] = [old, new]
+    return changes
+
+
+class LogIndex:
+    """Zaman sıralı log listesi ve kullanıcı/aksiyon/hedef posting listeleri
+    
+    Loglar neredeyse her zaman zaman sırasıyla geldiği için ekleme sondan yapılır;
+    tüm listeler created_at'e göre artan sıradadır, son N kayıt sondan okunur.
+    Aksiyon ve açıklama için trigram indeksi ilk aramada oluşturulur; audit
+    açıklamaları çok tekrar ettiği için indekslenen birim farklı metinlerdir
+    ve her metnin logları da zaman sıralı bir posting listesidir.
+    """
+    
+    def __init__(self, logs: List[ActivityLog] = ()):
+        self.logs: List[ActivityLog] = []
+        self.times: List[datetime] = []
+        self.by_id: Dict[int, ActivityLog] = {}
+        self._text: Optional[TrigramIndex] = None
+        self._text_ids: Dict[Tuple[str, str], int] = {}
+        self._text_logs: Dict[int, List[ActivityLog]] = {}
+        self._next_text_id = 1
+        self.by_user: Dict[int, List[ActivityLog]] = {}
+        self.by_action: Dict[str, List[ActivityLog]] = {}
+        self.by_target: Dict[Tuple[str, int], List[ActivityLog]] = {}
+        
+        for log in sorted(logs, key=lambda x: x.created_at):
+            self.add(log)
+    
+    def __len__(self) -> int:
+        return len(self.logs)
+    
+    def _postings(self, log: ActivityLog) -> List[List[ActivityLog]]:
+        """Log'un bulunduğu (veya bulunacağı) posting listeleri"""
+        postings = [
+            self.by_user.setdefault(log.user_id, []),
+            self.by_action.setdefault(log.action, [])
+        ]
+        if log.target_type:
+            postings.append(self.by_target.setdefault((log.target_type, log.target_id), []))
+        if self._text is not None:
+            postings.append(self._text_posting(log))
+        return postings
+    
+    @staticmethod
+    def _insert_in_order(logs: List[ActivityLog], log: ActivityLog):
+        """Zaman sırasını koruyarak ekle (genellikle sona)"""
+        position = len(logs)
+        while position and logs[position - 1].created_at > log.created_at:
+            position -= 1
+        logs.insert(position, log)
+    
+    def add(self, log: ActivityLog):
+        """Log'u ekle"""
+        position = bisect_right(self.times, log.created_at)
+        self.logs.insert(position, log)
+        self.times.insert(position, log.created_at)
+        self.by_id[log.id] = log
+        for posting in self._postings(log):
+            self._insert_in_order(posting, log)
+    
+    def _text_posting(self, log: ActivityLog) -> List[ActivityLog]:
+        """Log'un metnine ait posting listesi (metin yeni ise indekslenir)"""
+        key = (log.action, log.description or '')
+        text_id = self._text_ids.get(key)
+        if text_id is None:
+            text_id = self._text_ids[key] = self._next_text_id
+            self._next_text_id += 1
+            self._text.add(text_id, key)
+            self._text_logs[text_id] = []
+        return self._text_logs[text_id]
+    
+    def remove_before(self, cutoff: datetime) -> int:
+        """cutoff'tan eski logları sil, silinen sayısını döndür"""
+        count = bisect_left(self.times, cutoff)
+        if not count:
+            return 0
+        
+        # Silinenler her posting listesinin başındadır
+        removed = {}
+        for log in self.logs[:count]:
+            self.by_id.pop(log.id, None)
+            for posting in self._postings(log):
+                removed.setdefault(id(posting), [posting, 0])[1] += 1
+        for posting, prefix in removed.values():
+            del posting[:prefix]
+        
+        del self.logs[:count]
+        del self.times[:count]
+        self._drop_empty()
+        return count
+    
+    def remove(self, log_id: int) -> bool:
+        """Tek bir log'u sil"""
+        if log_id not in self.by_id:
+            return False
+        for position, log in enumerate(self.logs):
+            if log.id == log_id:
+                del self.logs[position]
+                del self.times[position]
+                self.by_id.pop(log.id, None)
+                for posting in self._postings(log):
+                    posting.remove(log)
+                self._drop_empty()
+                return True
+        return False
+    
+    def remove_logs(self, logs: List[ActivityLog]) -> int:
+        """Verilen logları sil (aksiyon bazlı saklama süresi için)"""
+        removed = {id(log) for log in logs}
+        if not removed:
+            return 0
+        
+        for log in logs:
+            self.by_id.pop(log.id, None)
+        kept = [log for log in self.logs if id(log) not in removed]
+        self.logs = kept
+        self.times = [log.created_at for log in kept]
+        for postings in (self.by_user, self.by_action, self.by_target, self._text_logs):
+            for key, posting in postings.items():
+                posting[:] = [log for log in posting if id(log) not in removed]
+        self._drop_empty()
+        return len(removed)
+    
+    def _drop_empty(self):
+        for postings in (self.by_user, self.by_action, self.by_target):
+            for key in [k for k, v in postings.items() if not v]:
+                del postings[key]
+        for key in [k for k, v in self._text_ids.items() if not self._text_logs[v]]:
+            text_id = self._text_ids.pop(key)
+            del self._text_logs[text_id]
+            self._text.remove(text_id)
+    
+    @staticmethod
+    def newest(logs: List[ActivityLog], limit: int = None) -> List[ActivityLog]:
+        """Listenin sonundan en yeni `limit` kaydı döndür (yeniden eskiye)"""
+        if limit:
+            return logs[:-limit - 1:-1]
+        return logs[::-1]
+    
+    def search(self, query: str, limit: int = None) -> List[ActivityLog]:
+        """Aksiyon veya açıklamasında sorgu geçen en yeni `limit` log (yeniden eskiye)"""
+        if self._text is None:
+            self._text = TrigramIndex()
+            for log in self.logs:
+                self._text_posting(log).append(log)
+        
+        # Eşleşen metinlerin posting listeleri sondan birleştirilir; `limit` logdan sonra durulur
+        postings = [reversed(self._text_logs[text_id]) for text_id in self._text.match(query)]
+        matches = heapq.merge(*postings, key=lambda log: (log.created_at, log.id), reverse=True)
+        return list(islice(matches, limit) if limit else matches)
+    
+    def in_range(self, start: datetime, end: datetime) -> List[ActivityLog]:
+        """[start, end] aralığındaki loglar (yeniden eskiye)"""
+        low = bisect_left(self.times, start)
+        high = bisect_right(self.times, end)
+        return self.logs[low:high][::-1]
+    
+    @staticmethod
+    def seek(logs: List[ActivityLog], moment: datetime, after: bool = False) -> int:
+        """Zaman sıralı listede `moment`in konumu (after=True: eşit zamanlıların sonrası)"""
+        low, high = 0, len(logs)
+        while low < high:
+            middle = (low + high) // 2
+            value = logs[middle].created_at
+            if value < moment or (after and value == moment):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def postings_for(self, user_id: int = None, action: str = None,
+                     target: Tuple[str, int] = None) -> Optional[List[List[ActivityLog]]]:
+        """Verilen filtrelerin posting listeleri; biri bu segmentte yoksa None"""
+        postings = []
+        for index, key in ((self.by_user, user_id), (self.by_action, action), (self.by_target, target)):
+            if key is None:
+                continue
+            posting = index.get(key)
+            if not posting:
+                return None
+            postings.append(posting)
+        return postings
+
+
+class ActivityCounters:
+    """Artımlı log sayaçları
+    
+    Toplam, aksiyon ve kullanıcı dağılımları her ekleme/silmede güncellenir.
+    Kayan pencere sayımları için son 7 gün dakikalık kovalarda (halka tampon)
+    tutulur; en aktif kullanıcılar, kullanıcıları log sayılarına göre
+    gruplayan kovalardan okunur.
+    """
+    
+    WINDOW_MINUTES = 7 * 24 * 60
+    _EPOCH = datetime(1970, 1, 1)
+    _MINUTE = timedelta(minutes=1)
+    
+    def __init__(self, logs: List[ActivityLog] = ()):
+        self.total = 0
+        self.by_action: Dict[str, int] = {}
+        self.by_user: Dict[int, int] = {}
+        # Log sayısı -> o sayıya sahip kullanıcılar; artan sıralı farklı sayılar
+        self._users_by_count: Dict[int, Dict[int, None]] = {}
+        self._counts: List[int] = []
+        # Halka tampon: her yuvada bir dakikanın sayısı ve hangi dakikaya ait olduğu
+        self._buckets = [0] * self.WINDOW_MINUTES
+        self._bucket_minutes = [-1] * self.WINDOW_MINUTES
+        
+        for log in logs:
+            self.add(log)
+    
+    @classmethod
+    def minute(cls, moment: datetime) -> int:
+        """Dakika numarası (1970'ten beri)"""
+        return (moment - cls._EPOCH) // cls._MINUTE
+    
+    def _move_user(self, user_id: int, delta: int):
+        """Kullanıcının sayısını değiştir ve sayı kovasını güncelle"""
+        old = self.by_user.get(user_id, 0)
+        new = old + delta
+        if old:
+            users = self._users_by_count[old]
+            del users[user_id]
+            if not users:
+                del self._users_by_count[old]
+                del self._counts[bisect_left(self._counts, old)]
+        if new > 0:
+            self.by_user[user_id] = new
+            users = self._users_by_count.get(new)
+            if users is None:
+                users = self._users_by_count[new] = {}
+                insort(self._counts, new)
+            users[user_id] = None
+        else:
+            self.by_user.pop(user_id, None)
+    
+    def _move_action(self, action: str, delta: int):
+        count = self.by_action.get(action, 0) + delta
+        if count > 0:
+            self.by_action[action] = count
+        else:
+            self.by_action.pop(action, None)
+    
+    def add(self, log: ActivityLog):
+        """Log'u say"""
+        self.total += 1
+        self._move_action(log.action, 1)
+        self._move_user(log.user_id, 1)
+        
+        minute = self.minute(log.created_at)
+        slot = minute % self.WINDOW_MINUTES
+        if self._bucket_minutes[slot] == minute:
+            self._buckets[slot] += 1
+        elif self._bucket_minutes[slot] < minute:
+            # Yuvadaki eski dakika pencere dışına çıkmıştır
+            self._bucket_minutes[slot] = minute
+            self._buckets[slot] = 1
+    
+    def discard(self, logs: List[ActivityLog]):
+        """Silinen logları sayaçlardan düş"""
+        for log in logs:
+            self.total -= 1
+            self._move_action(log.action, -1)
+            self._move_user(log.user_id, -1)
+            minute = self.minute(log.created_at)
+            slot = minute % self.WINDOW_MINUTES
+            if self._bucket_minutes[slot] == minute:
+                self._buckets[slot] -= 1
+    
+    def discard_segment(self, segment: LogIndex, now: datetime = None):
+        """Bütün olarak silinen segmenti düş (posting uzunluklarıyla)"""
+        if not segment.logs:
+            return
+        if self.minute(segment.logs[-1].created_at) > self.minute(now or datetime.now()) - self.WINDOW_MINUTES:
+            # Pencereye giren kayıtlar var: dakika kovaları için tek tek düş
+            self.discard(segment.logs)
+            return
+        self.total -= len(segment)
+        for action, action_logs in segment.by_action.items():
+            self._move_action(action, -len(action_logs))
+        for user_id, user_logs in segment.by_user.items():
+            self._move_user(user_id, -len(user_logs))
+    
+    def count_since(self, minutes: int, now: datetime = None) -> int:
+        """Son `minutes` dakikadaki log sayısı (dakika çözünürlüğünde)"""
+        start = self.minute(now or datetime.now()) - min(minutes, self.WINDOW_MINUTES)
+        return sum(count for count, minute in zip(self._buckets, self._bucket_minutes) if minute > start)
+    
+    def top_users(self, limit: int = 5) -> List[Tuple[int, int]]:
+        """En çok logu olan kullanıcılar: (user_id, sayı)"""
+        top = []
+        for count in reversed(self._counts):
+            for user_id in self._users_by_count[count]:
+                top.append((user_id, count))
+                if len(top) >= limit:
+                    return top
+        return top
+
+
+def parse_retention(spec: str) -> Dict[str, int]:
+    """'default=180,login=90' biçimindeki saklama süresi tanımını çözümle"""
+    retention = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        action, _, days = item.partition('=')
+        retention[action.strip()] = int(days)
+    return retention
+
+
 class ActivityLogManager:
-    """Aktivite log yönetimi için yardımcı sınıf"""
+    """Aktivite log yönetimi için yardımcı sınıf
+    
+    Loglar gün bazlı segmentlerde tutulur. Saklama süresi dolan segmentler
+    arka plandaki temizleyici tarafından bütün olarak silinir; aksiyon bazlı
+    daha kısa süreler yalnızca ilgili aksiyonun kayıtlarını siler.
+    """
+    
+    KIND = 'activity_logs'
+    model = ActivityLog
+    
+    DEFAULT_RETENTION_DAYS = 180  # 6 ay
+    SWEEP_INTERVAL = 3600  # saniye
+    
+    AUDIT_QUEUE_SIZE = 10000
+    AUDIT_BATCH_SIZE = 500
+    AUDIT_FLUSH_INTERVAL = 0.05  # saniye; ilk kayıttan sonra grubu doldurmak için beklenen süre
+    AUDIT_PUT_TIMEOUT = 0.1  # saniye; kuyruk doluyken senkron yazmadan önce beklenen süre
+    AUDIT_FLUSH_TIMEOUT = 0.5  # saniye; istek içinde kuyruğun boşalması için en fazla beklenen süre
+    
+    MAX_QUERY_LIMIT = 500  # sorgu sayfası en fazla bu kadar log
+    MAX_SCAN_ROWS = 20000  # tek sorguda taranan en fazla satır
     
     def __init__(self):
-        self.logs = []
-        self._next_id = 1
+        self._segments: Dict[date, LogIndex] = {}
+        self._days: List[date] = []
+        self._counters = ActivityCounters()
+        # Veri sürümü: her değişiklikte artar (önbellek anahtarları için)
+        self.data_version = 0
+        self._lock = threading.RLock()
+        self.default_retention_days = self.DEFAULT_RETENTION_DAYS
+        self.retention_days: Dict[str, int] = {}
+        self.last_sweep = None
+        self._stop = threading.Event()
+        self._sweeper = None
+        # Asenkron yazıcı (start_writer çağrılana kadar loglar senkron yazılır)
+        self._queue = None
+        self._writer = None
+        self.batch_size = self.AUDIT_BATCH_SIZE
+        # İstek thread'leri ve yazıcı birlikte günceller; _stats_lock ile korunur
+        self._stats_lock = threading.Lock()
+        self.audit_stats = {
+            'enqueued': 0,
+            'written': 0,
+            'invalid': 0,
+            'batches': 0,
+            'last_batch_size': 0,
+            'max_queue_depth': 0,
+            'queue_full': 0,
+            'synchronous_writes': 0,
+            'failed': 0,
+            'max_lag_ms': 0.0
+        }
+        self.store = MemoryStore()
+    
+    # Segmentler
+    
+    def _add(self, activity_log: ActivityLog):
+        """Log'u gününe ait segmente ekle"""
+        day = activity_log.created_at.date()
+        with self._lock:
+            segment = self._segments.get(day)
+            if segment is None:
+                segment = self._segments[day] = LogIndex()
+                insort(self._days, day)
+            segment.add(activity_log)
+            self._counters.add(activity_log)
+            self.data_version += 1
+    
+    @staticmethod
+    def _rollup(activity_log: ActivityLog):
+        """Aylık özetlere yansıyan logları say"""
+        if activity_log.action == 'login':
+            rollup_manager.record('login_count', activity_log.created_at)
+    
+    def _drop_segment(self, day: date) -> int:
+        """Segmenti bütün olarak sil"""
+        self._days.remove(day)
+        segment = self._segments.pop(day)
+        self._counters.discard_segment(segment)
+        self.data_version += 1
+        return len(segment)
+    
+    def _newest(self, postings, limit: int = None) -> List[ActivityLog]:
+        """Segmentleri yeniden eskiye gezerek en yeni `limit` kaydı topla"""
+        results = []
+        for day in reversed(list(self._days)):
+            segment = self._segments.get(day)
+            if segment is None:
+                continue
+            remaining = limit - len(results) if limit else None
+            results.extend(LogIndex.newest(postings(segment), remaining))
+            if limit and len(results) >= limit:
+                break
+        return results
+    
+    @property
+    def logs(self) -> List[ActivityLog]:
+        """Tüm loglar (eskiden yeniye)"""
+        return [log for day in list(self._days) for log in self._segments[day].logs]
+    
+    @logs.setter
+    def logs(self, logs: List[ActivityLog]):
+        self.restore_entities(logs)
+    
+    def count_logs(self) -> int:
+        """Toplam log sayısı"""
+        return self._counters.total
+    
+    def iter_entities(self) -> List[ActivityLog]:
+        """Depo için tüm loglar"""
+        return self.logs
+    
+    def restore_entities(self, logs: List[ActivityLog]):
+        """Depodan okunan loglarla belleği baştan doldur"""
+        by_day = {}
+        for activity_log in logs:
+            by_day.setdefault(activity_log.created_at.date(), []).append(activity_log)
+        with self._lock:
+            self._segments = {day: LogIndex(day_logs) for day, day_logs in by_day.items()}
+            self._days = sorted(self._segments)
+            self._counters = ActivityCounters(logs)
+            self.data_version += 1
+    
+    def load_entity(self, activity_log: ActivityLog):
+        """Başka bir worker'ın yazdığı log'u belleğe al"""
+        self._add(activity_log)
+    
+    def unload_entity(self, log_id: int):
+        """Depoda silinen log'u bellekten çıkar"""
+        with self._lock:
+            for day in reversed(self._days):
+                segment = self._segments[day]
+                activity_log = segment.by_id.get(log_id)
+                if activity_log is not None and segment.remove(log_id):
+                    self._counters.discard([activity_log])
+                    self.data_version += 1
+                    if not segment:
+                        self._drop_segment(day)
+                    return
     
     def create_log(self, log_data: Dict[str, Any]) -> Dict[str, Any]:
         """Yeni aktivite log'u oluştur"""
-        log_data['id'] = self._next_id
+        log_data.pop('id', None)
         activity_log = ActivityLog(**log_data)
         
         validation = activity_log.validate()
@@ -113,11 +589,9 @@ class ActivityLogManager:
                 'errors': validation['errors']
             }
         
-        self.logs.append(activity_log)
-        self._next_id += 1
-        
-        # Eski logları temizle (6 aydan eski)
-        self._cleanup_expired_logs()
+        activity_log.id = self.store.insert(self.KIND, activity_log)
+        self._add(activity_log)
+        self._rollup(activity_log)
         
         return {
             'success': True,
@@ -137,169 +611,394 @@ class ActivityLogManager:
             'details': details or {}
         }
         
-        result = self.create_log(log_data)
-        return result['success']
+        pending = self._queue
+        if pending is None:
+            result = self.create_log(log_data)
+            return result['success']
+        
+        # Kuyruğa yalnızca geçerli kayıtlar girer; çağıran sonucu hemen öğrenir
+        log_data['created_at'] = datetime.now()
+        activity_log = ActivityLog(**log_data)
+        if not activity_log.validate()['is_valid']:
+            self._count_stat('invalid')
+            return False
+        
+        try:
+            pending.put_nowait(activity_log)
+        except queue.Full:
+            # Geri basınç: kısa süre bekle, yine dolu ise isteğin içinde yaz
+            self._count_stat('queue_full')
+            try:
+                pending.put(activity_log, timeout=self.AUDIT_PUT_TIMEOUT)
+            except queue.Full:
+                self._count_stat('synchronous_writes')
+                return self._write_batch([activity_log]) == 1
+        
+        depth = pending.qsize()
+        with self._stats_lock:
+            self.audit_stats['enqueued'] += 1
+            if depth > self.audit_stats['max_queue_depth']:
+                self.audit_stats['max_queue_depth'] = depth
+        return True
     
-    def get_logs_by_user(self, user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
-        """Kullanıcıya göre logları getir"""
-        user_logs = [log for log in self.logs if log.user_id == user_id]
-        user_logs.sort(key=lambda x: x.created_at, reverse=True)
+    def _count_stat(self, name: str, delta: int = 1):
+        """Yazıcı metriğini artır"""
+        with self._stats_lock:
+            self.audit_stats[name] += delta
+    
+    # Asenkron yazıcı
+    
+    def _write_batch(self, batch: List[ActivityLog]) -> int:
+        """Doğrulanmış kayıtları tek seferde (group commit) depoya yaz"""
+        self.store.insert_many(self.KIND, batch)
+        for activity_log in batch:
+            self._add(activity_log)
+            self._rollup(activity_log)
         
-        if limit:
-            user_logs = user_logs[:limit]
+        lag = round((datetime.now() - batch[0].created_at).total_seconds() * 1000, 2)
+        with self._stats_lock:
+            self.audit_stats['max_lag_ms'] = max(self.audit_stats['max_lag_ms'], lag)
+            self.audit_stats['written'] += len(batch)
+            self.audit_stats['batches'] += 1
+            self.audit_stats['last_batch_size'] = len(batch)
+        return len(batch)
+    
+    def _write_safely(self, batch: List[ActivityLog]) -> int:
+        """Grubu yaz; grup yazılamazsa kayıtları tek tek dene (yalnızca hatalı kayıt kaybolur)"""
+        try:
+            return self._write_batch(batch)
+        except Exception as e:
+            logger.warning('Aktivite log grubu yazılamadı, kayıtlar tek tek yazılıyor: %s', e)
+        
+        written = 0
+        for activity_log in batch:
+            try:
+                written += self._write_batch([activity_log])
+            except Exception:
+                self._count_stat('failed')
+                logger.exception('Aktivite log yazma hatası')
+        return written
+    
+    def _writer_loop(self):
+        """Kuyruğu gruplar halinde boşalt"""
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            
+            batch = [first]
+            deadline = time.monotonic() + self.AUDIT_FLUSH_INTERVAL
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            try:
+                self._write_safely(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
         
+        self._queue.task_done()
+    
+    def start_writer(self, queue_size: int = AUDIT_QUEUE_SIZE, batch_size: int = AUDIT_BATCH_SIZE):
+        """Asenkron log yazıcısını başlat"""
+        if self._writer is not None:
+            return
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = threading.Thread(
+            target=self._writer_loop, name='activity-log-writer', daemon=True)
+        self._writer.start()
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Kuyruktaki kayıtlar yazılana kadar bekle
+        
+        timeout verilirse en fazla o kadar beklenir; kuyruk boşalmadıysa False döner.
+        İstek içinden çağrılırken timeout verilmelidir (yazıcı takılırsa istek de takılmasın).
+        """
+        pending = self._queue
+        if pending is None:
+            return True
+        with pending.all_tasks_done:
+            return pending.all_tasks_done.wait_for(lambda: not pending.unfinished_tasks, timeout)
+    
+    def stop_writer(self):
+        """Kuyruğu boşalt ve yazıcıyı durdur (kapanışta)"""
+        if self._writer is None:
+            return
+        writer, pending = self._writer, self._queue
+        pending.put(None)
+        writer.join()
+        self._writer = None
+        self._queue = None
+        
+        # Durdurma işaretinden sonra gelen kayıtlar
+        remaining = []
+        while True:
+            try:
+                item = pending.get_nowait()
+            except queue.Empty:
+                break
+            pending.task_done()
+            if item is not None:
+                remaining.append(item)
+        if remaining:
+            self._write_safely(remaining)
+    
+    def audit_status(self) -> Dict[str, Any]:
+        """Asenkron yazıcı ve geri basınç metrikleri"""
+        with self._stats_lock:
+            status = dict(self.audit_stats)
+        status.update({
+            'mode': 'async' if self._writer is not None else 'sync',
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'queue_capacity': self._queue.maxsize if self._queue is not None else 0,
+            'batch_size': self.batch_size
+        })
+        return status
+    
+    def get_logs_by_user(self, user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """Kullanıcıya göre logları getir"""
+        user_logs = self._newest(lambda segment: segment.by_user.get(user_id, []), limit)
         return [log.to_dict() for log in user_logs]
     
     def get_logs_by_action(self, action: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Aksiyona göre logları getir"""
-        action_logs = [log for log in self.logs if log.action == action]
-        action_logs.sort(key=lambda x: x.created_at, reverse=True)
-        
-        if limit:
-            action_logs = action_logs[:limit]
-        
+        action_logs = self._newest(lambda segment: segment.by_action.get(action, []), limit)
         return [log.to_dict() for log in action_logs]
     
     def get_logs_by_target(self, target_id: int, target_type: str, 
                           limit: int = 50) -> List[Dict[str, Any]]:
         """Hedef nesneye göre logları getir"""
-        target_logs = [
-            log for log in self.logs 
-            if log.target_id == target_id and log.target_type == target_type
-        ]
-        target_logs.sort(key=lambda x: x.created_at, reverse=True)
-        
-        if limit:
-            target_logs = target_logs[:limit]
-        
+        target_key = (target_type, target_id)
+        target_logs = self._newest(lambda segment: segment.by_target.get(target_key, []), limit)
         return [log.to_dict() for log in target_logs]
     
     def get_recent_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Son logları getir"""
-        recent_logs = sorted(self.logs, key=lambda x: x.created_at, reverse=True)
-        
-        if limit:
-            recent_logs = recent_logs[:limit]
-        
-        return [log.to_dict() for log in recent_logs]
+        return [log.to_dict() for log in self._newest(lambda segment: segment.logs, limit)]
     
     def get_logs_in_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
         """Tarih aralığına göre logları getir"""
-        filtered_logs = [
-            log for log in self.logs 
-            if start_date <= log.created_at <= end_date
-        ]
-        filtered_logs.sort(key=lambda x: x.created_at, reverse=True)
+        days = list(self._days)
+        low = bisect_left(days, start_date.date())
+        high = bisect_right(days, end_date.date())
         
-        return [log.to_dict() for log in filtered_logs]
-    
-    def search_logs(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Loglarda ara (açıklama ve aksiyon)"""
-        query = query.lower().strip()
         results = []
-        
-        for log in self.logs:
-            if (query in log.action.lower() or 
-                (log.description and query in log.description.lower())):
-                results.append(log.to_dict())
-        
-        results.sort(key=lambda x: x['created_at'], reverse=True)
-        
-        if limit:
-            results = results[:limit]
-        
+        for day in reversed(days[low:high]):
+            segment = self._segments.get(day)
+            if segment is not None:
+                results.extend(log.to_dict() for log in segment.in_range(start_date, end_date))
         return results
     
-    def get_statistics(self) -> Dict[str, Any]:
-        """Log istatistikleri"""
-        total_logs = len(self.logs)
+    def query_logs(self, user_id: int = None, action: str = None, target: Tuple[str, int] = None,
+                   start: datetime = None, end: datetime = None, limit: int = 50,
+                   cursor: str = None, max_scan: int = None) -> Dict[str, Any]:
+        """Kullanıcı, aksiyon, hedef ve zaman aralığı filtrelerinin birleşimi (yeniden eskiye)
         
-        # Aksiyon dağılımı
-        action_distribution = {}
-        for log in self.logs:
-            action = log.action
-            action_distribution[action] = action_distribution.get(action, 0) + 1
+        Her gün segmentinde filtrelerin en kısa posting listesi zaman aralığına
+        ikili aramayla daraltılıp sondan gezilir, diğer filtreler log üzerinde
+        kontrol edilir (kesişim). En fazla `max_scan` satır taranır; sayfa dolarsa
+        veya tarama sınırına ulaşılırsa next_cursor son taranan log'dan devam eder.
+        """
+        after = None
+        if cursor:
+            values = decode_cursor(cursor)
+            if (not values or len(values) != 2 or not isinstance(values[0], datetime)
+                    or not isinstance(values[1], int)):
+                return {
+                    'success': False,
+                    'errors': ['Geçersiz cursor']
+                }
+            after = (values[0], values[1])
         
-        # Kullanıcı aktivite dağılımı
-        user_activity = {}
-        for log in self.logs:
-            user_id = log.user_id
-            user_activity[user_id] = user_activity.get(user_id, 0) + 1
+        max_scan = max_scan or self.MAX_SCAN_ROWS
+        upper = end
+        if after is not None and (upper is None or after[0] < upper):
+            upper = after[0]
         
-        # Son 24 saat
-        last_24h = datetime.now() - timedelta(hours=24)
-        recent_logs = [log for log in self.logs if log.created_at >= last_24h]
+        def matches(log: ActivityLog) -> bool:
+            return ((user_id is None or log.user_id == user_id)
+                    and (action is None or log.action == action)
+                    and (target is None or (log.target_type, log.target_id) == target))
         
-        # Son 7 gün
-        last_7d = datetime.now() - timedelta(days=7)
-        weekly_logs = [log for log in self.logs if log.created_at >= last_7d]
+        results, scanned, last, exhausted = [], 0, None, True
+        with self._lock:
+            low = bisect_left(self._days, start.date()) if start is not None else 0
+            high = bisect_right(self._days, upper.date()) if upper is not None else len(self._days)
+            for day in reversed(self._days[low:high]):
+                segment = self._segments[day]
+                postings = segment.postings_for(user_id, action, target)
+                if postings is None:
+                    continue
+                driver = min(postings, key=len) if postings else segment.logs
+                top = LogIndex.seek(driver, upper, after=True) if upper is not None else len(driver)
+                bottom = LogIndex.seek(driver, start) if start is not None else 0
+                
+                for position in range(top - 1, bottom - 1, -1):
+                    log = driver[position]
+                    if after is not None and (log.created_at, log.id) >= after:
+                        continue
+                    if len(results) >= limit or scanned >= max_scan:
+                        exhausted = False
+                        break
+                    scanned += 1
+                    last = log
+                    if matches(log):
+                        results.append(log)
+                if not exhausted:
+                    break
         
         return {
-            'total_logs': total_logs,
-            'last_24_hours': len(recent_logs),
-            'last_7_days': len(weekly_logs),
-            'action_distribution': action_distribution,
-            'user_activity': user_activity,
-            'most_active_users': sorted(
-                user_activity.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:5]
+            'success': True,
+            'logs': [log.to_dict() for log in results],
+            'next_cursor': encode_cursor(last.created_at, last.id) if not exhausted else None,
+            'scanned': scanned
         }
     
-    def _cleanup_expired_logs(self, expire_days: int = 180):
-        """Süresi dolmuş logları temizle"""
-        self.logs = [log for log in self.logs if not log.is_expired(expire_days)]
+    def search_logs(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Loglarda ara (açıklama ve aksiyon)
+        
+        Segmentler yeniden eskiye aranır; `limit` sonuca ulaşılınca durulur.
+        """
+        results = []
+        with self._lock:
+            for day in reversed(self._days):
+                remaining = limit - len(results) if limit else None
+                results.extend(self._segments[day].search(query, remaining))
+                if limit and len(results) >= limit:
+                    break
+        
+        return [log.to_dict() for log in results]
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Log istatistikleri (artımlı sayaçlardan)"""
+        with self._lock:
+            counters = self._counters
+            now = datetime.now()
+            return {
+                'total_logs': counters.total,
+                'last_24_hours': counters.count_since(24 * 60, now),
+                'last_7_days': counters.count_since(7 * 24 * 60, now),
+                'action_distribution': dict(counters.by_action),
+                'user_activity': dict(counters.by_user),
+                'most_active_users': counters.top_users(5)
+            }
+    
+    # Saklama süresi
+    
+    def set_retention(self, retention: Dict[str, int]):
+        """Saklama sürelerini (gün) ayarla; 'default' anahtarı varsayılanı belirler"""
+        retention = dict(retention)
+        self.default_retention_days = retention.pop('default', self.DEFAULT_RETENTION_DAYS)
+        self.retention_days = retention
+    
+    def retention_for(self, action: str) -> int:
+        """Aksiyonun saklama süresi (gün)"""
+        return self.retention_days.get(action, self.default_retention_days)
     
-    def cleanup_logs_older_than(self, days: int):
+    def sweep_expired_logs(self, now: datetime = None) -> int:
+        """Saklama süresi dolan logları sil, silinen sayısını döndür"""
+        now = now or datetime.now()
+        periods = [self.default_retention_days] + list(self.retention_days.values())
+        # Bu tarihten önce biten segmentlerde her aksiyonun süresi dolmuştur
+        drop_before = (now - timedelta(days=max(periods))).date()
+        # Bu tarihten sonra başlayan segmentlerde hiçbir aksiyonun süresi dolmamıştır
+        keep_from = now - timedelta(days=min(periods))
+        
+        removed = 0
+        expired_actions = set()
+        with self._lock:
+            for day in list(self._days):
+                if datetime.combine(day, datetime.min.time()) >= keep_from:
+                    break
+                
+                segment = self._segments[day]
+                if day < drop_before:
+                    expired_actions.update(segment.by_action)
+                    removed += self._drop_segment(day)
+                    continue
+                
+                expired = []
+                for action, action_logs in segment.by_action.items():
+                    cutoff = now - timedelta(days=self.retention_for(action))
+                    count = 0
+                    while count < len(action_logs) and action_logs[count].created_at < cutoff:
+                        count += 1
+                    if count:
+                        expired.extend(action_logs[:count])
+                        expired_actions.add(action)
+                removed += segment.remove_logs(expired)
+                self._counters.discard(expired)
+                self.data_version += 1
+                if not segment:
+                    self._drop_segment(day)
+            
+            self.last_sweep = now
+        
+        for action in sorted(expired_actions):
+            cutoff = now - timedelta(days=self.retention_for(action))
+            self.store.purge_before(self.KIND, cutoff, action=action)
+        return removed
+    
+    def _sweep_loop(self, interval: int):
+        """Arka planda periyodik temizlik"""
+        while not self._stop.wait(interval):
+            try:
+                self.sweep_expired_logs()
+            except Exception:
+                logger.exception('Log temizleme hatası')
+    
+    def start_sweeper(self, interval: int = SWEEP_INTERVAL):
+        """Arka plan temizleyicisini başlat"""
+        self.sweep_expired_logs()
+        if self._sweeper is None and interval > 0:
+            self._stop.clear()
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(interval,), name='activity-log-sweeper', daemon=True)
+            self._sweeper.start()
+    
+    def stop_sweeper(self):
+        """Arka plan temizleyicisini durdur"""
+        self._stop.set()
+        self._sweeper = None
+    
+    def cleanup_logs_older_than(self, days: int) -> int:
         """Belirtilen günden eski logları temizle"""
         cutoff_date = datetime.now() - timedelta(days=days)
-        self.logs = [log for log in self.logs if log.created_at >= cutoff_date]
+        removed = 0
+        with self._lock:
+            for day in list(self._days):
+                if day > cutoff_date.date():
+                    break
+                if day < cutoff_date.date():
+                    removed += self._drop_segment(day)
+                else:
+                    segment = self._segments[day]
+                    self._counters.discard(segment.logs[:bisect_left(segment.times, cutoff_date)])
+                    removed += segment.remove_before(cutoff_date)
+                    self.data_version += 1
+                    if not segment:
+                        self._drop_segment(day)
+        self.store.purge_before(self.KIND, cutoff_date)
+        return removed
     
     def clear_all_logs(self):
         """Tüm logları temizle"""
-        self.logs = []
-    
-    # Özel log metodları
-    def log_login(self, user_id: int, ip: str = '', user_agent: str = ''):
-        """Giriş logla"""
-        return self.log_activity(
-            user_id=user_id,
-            action='login',
-            description='Kullanıcı sisteme giriş yaptı',
-            details={
-                'ip': ip,
-                'user_agent': user_agent
-            }
-        )
-    
-    def log_logout(self, user_id: int):
-        """Çıkış logla"""
-        return self.log_activity(
-            user_id=user_id,
-            action='logout',
-            description='Kullanıcı sistemden çıkış yaptı'
-        )
-    
-    def log_member_create(self, user_id: int, member_id: int, member_name: str):
-        """Üye oluşturma logla"""
-        return self.log_activity(
-            user_id=user_id,
-            action='member_create',
-            description=f'Yeni üye oluşturuldu: {member_name}',
-            target_id=member_id,
-            target_type='Member'
-        )
-    
-    def log_event_create(self, user_id: int, event_id: int, event_title: str):
-        """Etkinlik oluşturma logla"""
-        return self.log_activity(
-            user_id=user_id,
-            action='event_create',
-            description=f'Yeni etkinlik oluşturuldu: {event_title}',
-            target_id=event_id,
-            target_type='Event'
-        )
+        with self._lock:
+            self._segments = {}
+            self._days = []
+            self._counters = ActivityCounters()
+            self.data_version += 1
+        self.store.purge_before(self.KIND, datetime.max)
 
 
 # Global aktivite log yöneticisi
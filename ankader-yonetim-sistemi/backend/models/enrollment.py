@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enrollment Model - Üye ↔ etkinlik kayıt (katılım) modeli
+"""
+
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+from storage import MemoryStore, StorageConflictError
+from .rollup import rollup_manager
+
+class Enrollment:
+    """Üyenin bir etkinliğe kaydı"""
+    
+    VALID_STATUSES = ['registered', 'attended', 'absent', 'cancelled']
+    
+    def __init__(self, **kwargs):
+        self.id = kwargs.get('id')
+        self.member_id = kwargs.get('member_id')
+        self.event_id = kwargs.get('event_id')
+        self.status = kwargs.get('status', 'registered')
+        self.notes = kwargs.get('notes', '')
+        self.registration_date = kwargs.get('registration_date', datetime.now())
+        self.status_date = kwargs.get('status_date', self.registration_date)
+    
+    def validate(self) -> Dict[str, Any]:
+        """Kayıt verilerini doğrula"""
+        errors = []
+        
+        if not self.member_id:
+            errors.append('Üye ID zorunludur')
+        
+        if not self.event_id:
+            errors.append('Etkinlik ID zorunludur')
+        
+        if self.status not in self.VALID_STATUSES:
+            errors.append(f'Geçersiz durum. Geçerli durumlar: {", ".join(self.VALID_STATUSES)}')
+        
+        return {
+            'is_valid': len(errors) == 0,
+            'errors': errors
+        }
+    
+    def to_member_view(self) -> Dict[str, Any]:
+        """Üye tarafındaki görünüm (Member.to_dict()['events'])"""
+        return {
+            'event_id': self.event_id,
+            'attendance_date': self.status_date.isoformat() if self.status_date else None,
+            'status': self.status
+        }
+    
+    def to_event_view(self) -> Dict[str, Any]:
+        """Etkinlik tarafındaki görünüm (Event.to_dict()['participants'])"""
+        return {
+            'member_id': self.member_id,
+            'registration_date': self.registration_date.isoformat() if self.registration_date else None,
+            'attendance_status': self.status,
+            'notes': self.notes
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Kaydı dictionary'ye çevir"""
+        return {
+            'id': self.id,
+            'member_id': self.member_id,
+            'event_id': self.event_id,
+            'status': self.status,
+            'notes': self.notes,
+            'registration_date': self.registration_date.isoformat() if self.registration_date else None,
+            'status_date': self.status_date.isoformat() if self.status_date else None
+        }
+    
+    def __str__(self):
+        return f"Enrollment(member_id={self.member_id}, event_id={self.event_id}, status='{self.status}')"
+    
+    def __repr__(self):
+        return self.__str__()
+
+
+class EnrollmentManager:
+    """Üye ↔ etkinlik kayıtları için tek kaynak
+    
+    Kayıtlar hem üyeye hem etkinliğe göre indekslenir (ekleme sırası korunur);
+    durum sayaçları her geçişte güncellenir.
+    """
+    
+    KIND = 'enrollments'
+    model = Enrollment
+    
+    def __init__(self):
+        self._by_id: Dict[int, Enrollment] = {}
+        self._by_member: Dict[int, Dict[int, Enrollment]] = {}
+        self._by_event: Dict[int, Dict[int, Enrollment]] = {}
+        self._member_counts: Dict[int, Dict[str, int]] = {}
+        self._event_counts: Dict[int, Dict[str, int]] = {}
+        self.store = MemoryStore()
+        # Veri sürümü: her değişiklikte artar (önbellek anahtarları için)
+        self.data_version = 0
+        # Üye/etkinlik başına son değişikliğin data_version değeri (JSON önbelleği için)
+        self._member_versions: Dict[int, int] = {}
+        self._event_versions: Dict[int, int] = {}
+    
+    @staticmethod
+    def _count(counts: Dict[int, Dict[str, int]], key: int, status: str, delta: int):
+        by_status = counts.setdefault(key, {})
+        by_status[status] = by_status.get(status, 0) + delta
+        if not by_status[status]:
+            del by_status[status]
+            if not by_status:
+                del counts[key]
+    
+    def _touch(self, enrollment: Enrollment):
+        """Sürümü artır ve kaydın üye/etkinlik sürümlerini işaretle"""
+        self.data_version += 1
+        self._member_versions[enrollment.member_id] = self.data_version
+        self._event_versions[enrollment.event_id] = self.data_version
+    
+    def member_version(self, member_id: int) -> int:
+        """Üyenin kayıtlarındaki son değişikliğin sürümü"""
+        return self._member_versions.get(member_id, 0)
+    
+    def event_version(self, event_id: int) -> int:
+        """Etkinliğin kayıtlarındaki son değişikliğin sürümü"""
+        return self._event_versions.get(event_id, 0)
+    
+    def _seq_digest(self, enrollments) -> tuple:
+        """Kayıtların depo seq'lerinden özet: (sayı, seq toplamı)
+        
+        Yazılan her kayıt öncekilerden büyük bir seq alır; aynı veriyi gören
+        worker'larda özet aynıdır ve kayıt kümesi değişince özet de değişir.
+        """
+        seqs = [self.store.entity_seq(enrollment) for enrollment in enrollments]
+        return (len(seqs), sum(seqs))
+    
+    def member_token(self, member_id: int) -> tuple:
+        """Üyenin kayıtlarının kalıcı durumu (ETag girdisi)"""
+        return self._seq_digest(self._by_member.get(member_id, {}).values())
+    
+    def event_token(self, event_id: int) -> tuple:
+        """Etkinliğin kayıtlarının kalıcı durumu (ETag girdisi)"""
+        return self._seq_digest(self._by_event.get(event_id, {}).values())
+    
+    def _index(self, enrollment: Enrollment):
+        """Kaydı indekslere ve sayaçlara ekle"""
+        self._touch(enrollment)
+        self._by_id[enrollment.id] = enrollment
+        self._by_member.setdefault(enrollment.member_id, {})[enrollment.event_id] = enrollment
+        self._by_event.setdefault(enrollment.event_id, {})[enrollment.member_id] = enrollment
+        self._count(self._member_counts, enrollment.member_id, enrollment.status, 1)
+        self._count(self._event_counts, enrollment.event_id, enrollment.status, 1)
+    
+    def _unindex(self, enrollment: Enrollment):
+        """Kaydı indekslerden ve sayaçlardan çıkar"""
+        self._touch(enrollment)
+        self._by_id.pop(enrollment.id, None)
+        for index, key, other in ((self._by_member, enrollment.member_id, enrollment.event_id),
+                                  (self._by_event, enrollment.event_id, enrollment.member_id)):
+            entries = index.get(key, {})
+            if entries.get(other) is enrollment:
+                del entries[other]
+                if not entries:
+                    del index[key]
+        self._count(self._member_counts, enrollment.member_id, enrollment.status, -1)
+        self._count(self._event_counts, enrollment.event_id, enrollment.status, -1)
+    
+    def _set_status(self, enrollment: Enrollment, status: str, when: datetime):
+        """Durum geçişi (sayaçlar birlikte güncellenir)"""
+        self._touch(enrollment)
+        self._count(self._member_counts, enrollment.member_id, enrollment.status, -1)
+        self._count(self._event_counts, enrollment.event_id, enrollment.status, -1)
+        self._record_attendance(enrollment, -1)
+        enrollment.status = status
+        enrollment.status_date = when
+        self._count(self._member_counts, enrollment.member_id, status, 1)
+        self._count(self._event_counts, enrollment.event_id, status, 1)
+        self._record_attendance(enrollment, 1)
+    
+    @staticmethod
+    def _record_attendance(enrollment: Enrollment, delta: int):
+        """Katılımı, katılım tarihinin ayındaki aylık özete yansıt"""
+        if enrollment.status == 'attended':
+            rollup_manager.record('attendance', enrollment.status_date, delta)
+    
+    def iter_entities(self) -> List[Enrollment]:
+        """Depo için tüm kayıtlar"""
+        return list(self._by_id.values())
+    
+    def restore_entities(self, enrollments: List[Enrollment]):
+        """Depodan okunan kayıtlarla belleği baştan doldur"""
+        self.data_version += 1
+        # Kayıtları kaybolan üye/etkinliklerin sürümleri de ilerlemeli
+        for member_id in self._by_member:
+            self._member_versions[member_id] = self.data_version
+        for event_id in self._by_event:
+            self._event_versions[event_id] = self.data_version
+        self._by_id, self._by_member, self._by_event = {}, {}, {}
+        self._member_counts, self._event_counts = {}, {}
+        for enrollment in enrollments:
+            self._index(enrollment)
+    
+    def load_entity(self, enrollment: Enrollment):
+        """Depodan gelen kaydı belleğe al (varsa yerine koy)"""
+        existing = self._by_id.get(enrollment.id)
+        if existing is not None:
+            self._unindex(existing)
+        self._index(enrollment)
+    
+    def unload_entity(self, enrollment_id: int):
+        """Depoda silinen kaydı bellekten çıkar"""
+        existing = self._by_id.get(enrollment_id)
+        if existing is not None:
+            self._unindex(existing)
+    
+    def get_enrollment(self, member_id: int, event_id: int) -> Optional[Enrollment]:
+        """Üyenin etkinlik kaydını bul"""
+        return self._by_member.get(member_id, {}).get(event_id)
+    
+    def enroll(self, member_id: int, event_id: int, status: str = 'registered',
+               notes: str = '', capacity: int = None) -> Dict[str, Any]:
+        """Üyeyi etkinliğe kaydet"""
+        enrollment = Enrollment(member_id=member_id, event_id=event_id, status=status, notes=notes)
+        
+        validation = enrollment.validate()
+        if not validation['is_valid']:
+            return {
+                'success': False,
+                'errors': validation['errors']
+            }
+        
+        if self.get_enrollment(member_id, event_id):
+            return {
+                'success': False,
+                'errors': ['Üye zaten bu etkinliğe kayıtlı']
+            }
+        
+        # Kontenjan kontrolü
+        if capacity and self.count_for_event(event_id) >= capacity:
+            return {
+                'success': False,
+                'errors': ['Etkinlik kontenjanı dolu']
+            }
+        
+        try:
+            enrollment.id = self.store.insert(self.KIND, enrollment)
+        except StorageConflictError as e:
+            return {
+                'success': False,
+                'errors': [str(e)]
+            }
+        
+        self._index(enrollment)
+        self._record_attendance(enrollment, 1)
+        
+        return {
+            'success': True,
+            'enrollment': enrollment.to_dict()
+        }
+    
+    def update_status(self, member_id: int, event_id: int, status: str) -> Dict[str, Any]:
+        """Kayıt durumunu güncelle"""
+        if status not in Enrollment.VALID_STATUSES:
+            return {
+                'success': False,
+                'errors': [f'Geçersiz durum. Geçerli durumlar: {", ".join(Enrollment.VALID_STATUSES)}']
+            }
+        
+        enrollment = self.get_enrollment(member_id, event_id)
+        if not enrollment:
+            return {
+                'success': False,
+                'errors': ['Üye bu etkinliğe kayıtlı değil']
+            }
+        
+        # Önce depoya yazılır; yazma başarısız olursa bellek ve sayaçlar değişmez
+        changed = Enrollment(**vars(enrollment))
+        changed.status, changed.status_date = status, datetime.now()
+        try:
+            self.store.save(self.KIND, changed)
+        except StorageConflictError as e:
+            return {
+                'success': False,
+                'errors': [str(e)]
+            }
+        self._set_status(enrollment, status, changed.status_date)
+        vars(enrollment).update(vars(changed))  # depo seq'i dahil
+        
+        return {
+            'success': True,
+            'enrollment': enrollment.to_dict()
+        }
+    
+    def withdraw(self, member_id: int, event_id: int) -> Dict[str, Any]:
+        """Üyenin etkinlik kaydını sil"""
+        enrollment = self.get_enrollment(member_id, event_id)
+        if not enrollment:
+            return {
+                'success': False,
+                'errors': ['Üye bu etkinliğe kayıtlı değil']
+            }
+        
+        self.store.delete(self.KIND, enrollment.id)
+        self._unindex(enrollment)
+        self._record_attendance(enrollment, -1)
+        
+        return {
+            'success': True,
+            'message': 'Kayıt silindi'
+        }
+    
+    def remove_event(self, event_id: int) -> int:
+        """Silinen etkinliğin tüm kayıtlarını sil"""
+        enrollments = list(self._by_event.get(event_id, {}).values())
+        for enrollment in enrollments:
+            self.store.delete(self.KIND, enrollment.id)
+            self._unindex(enrollment)
+            self._record_attendance(enrollment, -1)
+        return len(enrollments)
+    
+    def get_member_enrollments(self, member_id: int) -> List[Enrollment]:
+        """Üyenin kayıtları (kayıt sırasıyla)"""
+        return list(self._by_member.get(member_id, {}).values())
+    
+    def get_event_enrollments(self, event_id: int) -> List[Enrollment]:
+        """Etkinliğin kayıtları (kayıt sırasıyla)"""
+        return list(self._by_event.get(event_id, {}).values())
+    
+    def count_for_member(self, member_id: int, status: str = None) -> int:
+        """Üyenin kayıt sayısı (isteğe bağlı duruma göre)"""
+        counts = self._member_counts.get(member_id, {})
+        return counts.get(status, 0) if status else len(self._by_member.get(member_id, ()))
+    
+    def count_for_event(self, event_id: int, status: str = None) -> int:
+        """Etkinliğin kayıt sayısı (isteğe bağlı duruma göre)"""
+        counts = self._event_counts.get(event_id, {})
+        return counts.get(status, 0) if status else len(self._by_event.get(event_id, ()))
+    
+    def status_counts_for_event(self, event_id: int) -> Dict[str, int]:
+        """Etkinlik için durum başına kayıt sayıları"""
+        return dict(self._event_counts.get(event_id, {}))
+    
+    def migrate_legacy(self, member_manager, event_manager) -> int:
+        """Üye (events) ve etkinlik (participants) üzerinde tutulan eski kayıtları taşı
+        
+        Aynı kayıt iki tarafta da varsa etkinlik tarafındaki kullanılır; taşınan
+        üye/etkinlik eski liste olmadan yeniden kaydedilir. Taşınan kayıt sayısını döndürür.
+        """
+        imported = 0
+        
+        for event in event_manager.events:
+            participants = event.pop_legacy_participants()
+            for participant in participants:
+                imported += self._import(participant.get('member_id'), event.id,
+                                         participant.get('attendance_status'),
+                                         participant.get('notes', ''),
+                                         participant.get('registration_date'))
+            if participants:
+                event_manager.save_event(event)
+        
+        for member in member_manager.members:
+            records = member.pop_legacy_events()
+            for record in records:
+                imported += self._import(member.id, record.get('event_id'),
+                                         record.get('status'), '',
+                                         record.get('attendance_date'))
+            if records:
+                member_manager.save_member(member)
+        
+        return imported
+    
+    def _import(self, member_id: int, event_id: int, status: str, notes: str, when) -> int:
+        """Eski biçimdeki tek kaydı ekle (zaten varsa veya geçersizse atla)"""
+        if self.get_enrollment(member_id, event_id):
+            return 0
+        if isinstance(when, str):
+            when = datetime.fromisoformat(when)
+        enrollment = Enrollment(
+            member_id=member_id,
+            event_id=event_id,
+            status=status if status in Enrollment.VALID_STATUSES else 'registered',
+            notes=notes or '',
+            registration_date=when or datetime.now()
+        )
+        if not enrollment.validate()['is_valid']:
+            return 0
+        try:
+            enrollment.id = self.store.insert(self.KIND, enrollment)
+        except StorageConflictError:
+            # Aynı kaydı başka bir worker taşıdı; onunkini belleğe alıp geç
+            existing = self.store.find(self.KIND, member_id=member_id, event_id=event_id)
+            if existing is not None and not self.get_enrollment(member_id, event_id):
+                self._index(existing)
+            return 0
+        self._index(enrollment)
+        return 1
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Kayıt istatistikleri"""
+        status_distribution = {}
+        for counts in self._event_counts.values():
+            for status, count in counts.items():
+                status_distribution[status] = status_distribution.get(status, 0) + count
+        
+        return {
+            'total_enrollments': len(self._by_id),
+            'status_distribution': status_distribution
+        }
+
+
+# Global kayıt yöneticisi
+enrollment_manager = EnrollmentManager()
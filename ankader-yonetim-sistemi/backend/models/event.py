@@ -5,12 +5,22 @@ Event Model - Etkinlik Modeli
 """
 
 from datetime import datetime, date
+import heapq
 import re
-from typing import Dict, Any, Optional, List
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import Dict, Any, Optional, List, Set, Tuple
+from storage import MemoryStore, StorageConflictError, entity_state
+from .text_index import BM25Index
+from .enrollment import Enrollment, enrollment_manager
+from .rollup import rollup_manager
+from .serialization import CachedJSON, Projectable, encode_json
 
-class Event:
+class Event(CachedJSON, Projectable):
     """Etkinlik modeli"""
     
+    PARTICIPANT_STATUSES = Enrollment.VALID_STATUSES
+    
     def __init__(self, **kwargs):
         self.id = kwargs.get('id')
         self.title = kwargs.get('title', '').strip()
@@ -22,7 +32,8 @@ class Event:
         self.type = kwargs.get('type', 'other')
         self.status = kwargs.get('status', 'planning')
         self.max_participants = kwargs.get('max_participants')
-        self.participants = kwargs.get('participants', [])
+        # Katılımcılar kayıt deposunda tutulur; eski kayıtlardaki liste taşınmayı bekler
+        self._legacy_participants = kwargs.get('participants') or []
         self.budget = kwargs.get('budget', {
             'estimated_cost': 0,
             'actual_cost': 0,
@@ -36,6 +47,22 @@ class Event:
         self.updated_by = kwargs.get('updated_by')
         self.created_at = kwargs.get('created_at', datetime.now())
         self.updated_at = kwargs.get('updated_at', datetime.now())
+        
+        # start_datetime önbelleği (date değiştiğinde yeniden hesaplanır)
+        self._start_source = None
+        self._start_datetime = None
+    
+    def pop_legacy_participants(self) -> List[Dict[str, Any]]:
+        """Etkinlik üzerinde saklanmış eski katılımcı listesini al ve temizle"""
+        participants = self._legacy_participants
+        if isinstance(participants, dict):
+            participants = list(participants.values())
+        self._legacy_participants = []
+        return participants
+    
+    def participant_list(self) -> List[Dict[str, Any]]:
+        """Katılımcılar (kayıt sırasıyla)"""
+        return [e.to_event_view() for e in enrollment_manager.get_event_enrollments(self.id)]
     
     def validate(self) -> Dict[str, Any]:
         """Etkinlik verilerini doğrula"""
@@ -109,27 +136,42 @@ class Event:
     @property
     def participant_count(self) -> int:
         """Katılımcı sayısı"""
-        return len(self.participants) if self.participants else 0
+        return enrollment_manager.count_for_event(self.id)
     
     @property
     def attended_count(self) -> int:
         """Katılan katılımcı sayısı"""
-        if not self.participants:
-            return 0
-        return len([p for p in self.participants if p.get('attendance_status') == 'attended'])
+        return enrollment_manager.count_for_event(self.id, 'attended')
+    
+    def count_by_status(self) -> Dict[str, int]:
+        """Durum başına katılımcı sayıları"""
+        return enrollment_manager.status_counts_for_event(self.id)
+    
+    @property
+    def start_datetime(self) -> Optional[datetime]:
+        """Başlangıç zamanı (yerel, timezone'suz) - tarih indeksinin anahtarı"""
+        if self._start_source is not self.date:
+            value = self.date
+            if isinstance(value, datetime):
+                if value.tzinfo is not None:
+                    value = value.astimezone().replace(tzinfo=None)
+            elif isinstance(value, date):
+                value = datetime.combine(value, datetime.min.time())
+            else:
+                value = None
+            self._start_source = self.date
+            self._start_datetime = value
+        return self._start_datetime
+    
+    def is_upcoming_at(self, now: datetime) -> bool:
+        """Verilen zamana göre gelecek etkinlik mi?"""
+        start = self.start_datetime
+        return start is not None and start > now
     
     @property
     def is_upcoming(self) -> bool:
         """Gelecek etkinlik mi?"""
-        if not self.date:
-            return False
-        
-        if isinstance(self.date, date) and not isinstance(self.date, datetime):
-            event_date = datetime.combine(self.date, datetime.min.time())
-        else:
-            event_date = self.date
-        
-        return event_date > datetime.now()
+        return self.is_upcoming_at(datetime.now())
     
     @property
     def is_past(self) -> bool:
@@ -148,62 +190,6 @@ class Event:
         
         return round(sum(ratings) / len(ratings), 1)
     
-    def add_participant(self, member_id: int, notes: str = '') -> bool:
-        """Katılımcı ekle"""
-        if not self.participants:
-            self.participants = []
-        
-        # Zaten katılımcı mı kontrol et
-        for participant in self.participants:
-            if participant.get('member_id') == member_id:
-                return False
-        
-        # Maksimum katılımcı kontrolü
-        if (self.max_participants and 
-            len(self.participants) >= self.max_participants):
-            return False
-        
-        self.participants.append({
-            'member_id': member_id,
-            'registration_date': datetime.now(),
-            'attendance_status': 'registered',
-            'notes': notes
-        })
-        
-        self.updated_at = datetime.now()
-        return True
-    
-    def update_participant_status(self, member_id: int, status: str) -> bool:
-        """Katılımcı durumunu güncelle"""
-        if not self.participants:
-            return False
-        
-        valid_statuses = ['registered', 'attended', 'absent', 'cancelled']
-        if status not in valid_statuses:
-            return False
-        
-        for participant in self.participants:
-            if participant.get('member_id') == member_id:
-                participant['attendance_status'] = status
-                self.updated_at = datetime.now()
-                return True
-        
-        return False
-    
-    def remove_participant(self, member_id: int) -> bool:
-        """Katılımcı kaldır"""
-        if not self.participants:
-            return False
-        
-        original_length = len(self.participants)
-        self.participants = [p for p in self.participants if p.get('member_id') != member_id]
-        
-        if len(self.participants) < original_length:
-            self.updated_at = datetime.now()
-            return True
-        
-        return False
-    
     def add_feedback(self, member_id: int, rating: int, comment: str = '') -> bool:
         """Geri bildirim ekle"""
         if rating < 1 or rating > 5:
@@ -252,35 +238,66 @@ class Event:
         self.updated_at = datetime.now()
         return True
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Etkinliği dictionary'ye çevir"""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'date': self.date.isoformat() if self.date else None,
-            'start_time': self.start_time,
-            'end_time': self.end_time,
-            'location': self.location,
-            'type': self.type,
-            'status': self.status,
-            'max_participants': self.max_participants,
-            'participants': self.participants,
-            'participant_count': self.participant_count,
-            'attended_count': self.attended_count,
-            'budget': self.budget,
-            'organizer': self.organizer,
-            'assistants': self.assistants,
-            'attachments': self.attachments,
-            'feedback': self.feedback,
-            'average_rating': self.average_rating,
-            'is_upcoming': self.is_upcoming,
-            'is_past': self.is_past,
-            'created_by': self.created_by,
-            'updated_by': self.updated_by,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    # Alan adı -> değer üreticisi (etkinlik, referans zamanı); to_dict yalnızca
+    # istenen alanları hesaplar
+    FIELD_GETTERS = {
+        'id': lambda e, now: e.id,
+        'title': lambda e, now: e.title,
+        'description': lambda e, now: e.description,
+        'date': lambda e, now: e.date.isoformat() if e.date else None,
+        'start_time': lambda e, now: e.start_time,
+        'end_time': lambda e, now: e.end_time,
+        'location': lambda e, now: e.location,
+        'type': lambda e, now: e.type,
+        'status': lambda e, now: e.status,
+        'max_participants': lambda e, now: e.max_participants,
+        'participants': lambda e, now: e.participant_list(),
+        'participant_count': lambda e, now: e.participant_count,
+        'attended_count': lambda e, now: e.attended_count,
+        'budget': lambda e, now: e.budget,
+        'organizer': lambda e, now: e.organizer,
+        'assistants': lambda e, now: e.assistants,
+        'attachments': lambda e, now: e.attachments,
+        'feedback': lambda e, now: e.feedback,
+        'average_rating': lambda e, now: e.average_rating,
+        'is_upcoming': lambda e, now: e.is_upcoming_at(now),
+        'is_past': lambda e, now: not e.is_upcoming_at(now),
+        'created_by': lambda e, now: e.created_by,
+        'updated_by': lambda e, now: e.updated_by,
+        'created_at': lambda e, now: e.created_at.isoformat() if e.created_at else None,
+        'updated_at': lambda e, now: e.updated_at.isoformat() if e.updated_at else None
+    }
+    
+    # Liste görünümleri için adlandırılmış projeksiyonlar
+    PROJECTIONS = {
+        'summary': ('id', 'title', 'date', 'start_time', 'location', 'type', 'status',
+                    'participant_count', 'max_participants', 'is_upcoming'),
+        'detail': tuple(FIELD_GETTERS)
+    }
+    
+    def to_dict(self, now: datetime = None, fields: Tuple[str, ...] = None) -> Dict[str, Any]:
+        """Etkinliği dictionary'ye çevir
+        
+        now: liste serileştirmede tüm etkinlikler için tek referans zamanı
+        fields: yalnızca bu alanlar (varsayılan tümü)
+        """
+        now = now or datetime.now()
+        getters = self.FIELD_GETTERS
+        return {field: getters[field](self, now) for field in fields or self.PROJECTIONS['detail']}
+    
+    def to_json(self, now: datetime = None, fields: Tuple[str, ...] = None) -> bytes:
+        """to_dict() çıktısının JSON'u
+        
+        Adlandırılmış projeksiyonlar önbellekte tutulur; alan değişince, katılımcılar
+        değişince veya etkinlik geçmişe düşünce yenilenir. Özel alan listeleri her
+        seferinde kodlanır.
+        """
+        now = now or datetime.now()
+        slot = self.projection_name(fields)
+        if slot is None:
+            return encode_json(self.to_dict(now, fields))
+        key = (enrollment_manager.event_version(self.id), self.is_upcoming_at(now))
+        return self._cached_json(key, lambda: self.to_dict(now, fields), slot)
     
     def __str__(self):
         return f"Event(id={self.id}, title='{self.title}', status='{self.status}')"
@@ -292,13 +309,142 @@ class Event:
 class EventManager:
     """Etkinlik yönetimi için yardımcı sınıf"""
     
+    KIND = 'events'
+    model = Event
+    
+    # Aramada taranan alanlar ve BM25 ağırlıkları
+    SEARCH_FIELDS = ('title', 'location', 'description')
+    SEARCH_WEIGHTS = (3.0, 2.0, 1.0)
+    
     def __init__(self):
         self.events = []
-        self._next_id = 1
+        # ID -> events listesindeki konum (senkronizasyonda O(1) yer değiştirme için)
+        self._positions: Dict[int, int] = {}
+        self.store = MemoryStore()
+        
+        # İndeksler: ID, başlangıç zamanına göre sıralı (start_datetime, id) listesi,
+        # durum ve tip başına ID kümeleri
+        self._by_id: Dict[int, Event] = {}
+        self._date_index: List[Tuple[datetime, int]] = []
+        self._by_status: Dict[str, Set[int]] = {}
+        self._by_type: Dict[str, Set[int]] = {}
+        self._search = BM25Index(self.SEARCH_WEIGHTS)
+        # Veri sürümü: her değişiklikte artar (önbellek anahtarları için)
+        self.data_version = 0
+    
+    @staticmethod
+    def _date_key(event: Event) -> Optional[Tuple[datetime, int]]:
+        start = event.start_datetime
+        return (start, event.id) if start is not None else None
+    
+    def _index(self, event: Event):
+        """Etkinliği indekslere ekle"""
+        self.data_version += 1
+        self._by_id[event.id] = event
+        key = self._date_key(event)
+        if key is not None:
+            insort(self._date_index, key)
+        self._index_filters(event.id, event.status, event.type, True)
+        self._index_text(event)
+    
+    def _index_filters(self, event_id: int, status: str, event_type: str, add: bool):
+        """Durum ve tip kümelerine ekle (add=True) veya çıkar"""
+        for buckets, value in ((self._by_status, status), (self._by_type, event_type)):
+            if add:
+                buckets.setdefault(value, set()).add(event_id)
+            else:
+                bucket = buckets.get(value)
+                if bucket is not None:
+                    bucket.discard(event_id)
+                    if not bucket:
+                        del buckets[value]
+    
+    def _index_text(self, event: Event):
+        """Etkinliği arama indeksine ekle (varsa güncelle)"""
+        self.data_version += 1
+        self._search.add(event.id, [getattr(event, f) or '' for f in self.SEARCH_FIELDS])
+    
+    def _unindex_date(self, key: Optional[Tuple[datetime, int]]):
+        """Tarih indeksinden anahtarı çıkar"""
+        if key is None:
+            return
+        position = bisect_left(self._date_index, key)
+        if position < len(self._date_index) and self._date_index[position] == key:
+            del self._date_index[position]
+    
+    def _unindex(self, event: Event):
+        """Etkinliği indekslerden çıkar"""
+        self.data_version += 1
+        self._by_id.pop(event.id, None)
+        self._unindex_date(self._date_key(event))
+        self._index_filters(event.id, event.status, event.type, False)
+        self._search.remove(event.id)
+    
+    def _now_position(self, now: datetime) -> int:
+        """Tarih indeksinde şimdinin konumu: öncesi geçmiş, sonrası gelecek"""
+        return bisect_right(self._date_index, (now, float('inf')))
+    
+    @staticmethod
+    def _serialize(event: Event, now: datetime, as_json: bool, fields: Tuple[str, ...] = None):
+        return event.to_json(now, fields) if as_json else event.to_dict(now, fields)
+    
+    def _page(self, positions: range, now: datetime, limit: int = None, offset: int = 0,
+              event_type: str = None, as_json: bool = False,
+              fields: Tuple[str, ...] = None) -> List[Any]:
+        """Tarih indeksinde verilen konumlardaki etkinliklerden bir sayfa"""
+        events = (self._by_id[self._date_index[position][1]] for position in positions)
+        if event_type:
+            events = (event for event in events if event.type == event_type)
+        end = offset + limit if limit is not None else None
+        return [self._serialize(event, now, as_json, fields) for event in islice(events, offset, end)]
+    
+    def iter_entities(self) -> List[Event]:
+        """Depo için tüm etkinlikler"""
+        return self.events
+    
+    def restore_entities(self, events: List[Event]):
+        """Depodan okunan etkinliklerle belleği baştan doldur"""
+        self.events = list(events)
+        self._positions = {event.id: position for position, event in enumerate(self.events)}
+        self._by_id = {event.id: event for event in self.events}
+        self._date_index = sorted(
+            key for key in map(self._date_key, self.events) if key is not None
+        )
+        self._by_status, self._by_type = {}, {}
+        self._search.clear()
+        self.data_version += 1
+        for event in self.events:
+            self._index_filters(event.id, event.status, event.type, True)
+            self._index_text(event)
+    
+    def load_entity(self, event: Event):
+        """Depodan gelen etkinliği belleğe al (varsa yerine koy)"""
+        existing = self._by_id.get(event.id)
+        if existing is not None:
+            self._unindex(existing)
+            self.events[self._positions[event.id]] = event
+        else:
+            self._positions[event.id] = len(self.events)
+            self.events.append(event)
+        self._index(event)
+    
+    def unload_entity(self, event_id: int):
+        """Depoda silinen etkinliği bellekten çıkar"""
+        existing = self._by_id.get(event_id)
+        if existing is not None:
+            self._unindex(existing)
+            self._remove_position(event_id)
+    
+    def _remove_position(self, event_id: int):
+        """Etkinliği listeden çıkar; sonraki konumlar kayar (liste oluşturma sırasını korur)"""
+        position = self._positions.pop(event_id)
+        del self.events[position]
+        for later in self.events[position:]:
+            self._positions[later.id] -= 1
     
     def create_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Yeni etkinlik oluştur"""
-        event_data['id'] = self._next_id
+        event_data.pop('id', None)
         event = Event(**event_data)
         
         validation = event.validate()
@@ -308,8 +454,18 @@ class EventManager:
                 'errors': validation['errors']
             }
         
+        try:
+            event.id = self.store.insert(self.KIND, event)
+        except StorageConflictError as e:
+            return {
+                'success': False,
+                'errors': [str(e)]
+            }
+        
+        self._positions[event.id] = len(self.events)
         self.events.append(event)
-        self._next_id += 1
+        self._index(event)
+        rollup_manager.record('new_events', event.created_at)
         
         return {
             'success': True,
@@ -318,44 +474,158 @@ class EventManager:
     
     def get_event_by_id(self, event_id: int) -> Optional[Event]:
         """ID'ye göre etkinlik bul"""
-        for event in self.events:
-            if event.id == event_id:
-                return event
-        return None
+        return self._by_id.get(event_id)
     
-    def get_all_events(self, status: str = None) -> List[Dict[str, Any]]:
-        """Tüm etkinlikleri getir"""
+    def get_all_events(self, status: str = None, event_type: str = None,
+                       as_json: bool = False, fields: Tuple[str, ...] = None) -> List[Any]:
+        """Tüm etkinlikleri getir (as_json: önbellekli JSON parçaları, fields: yalnızca bu alanlar)"""
         filtered_events = self.events
         
         if status:
-            filtered_events = [event for event in self.events if event.status == status]
+            filtered_events = [event for event in filtered_events if event.status == status]
+        if event_type:
+            filtered_events = [event for event in filtered_events if event.type == event_type]
         
-        return [event.to_dict() for event in filtered_events]
+        now = datetime.now()
+        return [self._serialize(event, now, as_json, fields) for event in filtered_events]
+    
+    def get_upcoming_events(self, limit: int = None, offset: int = 0, event_type: str = None,
+                            as_json: bool = False, fields: Tuple[str, ...] = None) -> List[Any]:
+        """Gelecek etkinlikleri getir (en yakından uzağa)"""
+        now = datetime.now()
+        positions = range(self._now_position(now), len(self._date_index))
+        return self._page(positions, now, limit, offset, event_type, as_json, fields)
+    
+    def get_past_events(self, limit: int = None, offset: int = 0, event_type: str = None,
+                        as_json: bool = False, fields: Tuple[str, ...] = None) -> List[Any]:
+        """Geçmiş etkinlikleri getir (en yeniden eskiye)"""
+        now = datetime.now()
+        positions = range(self._now_position(now) - 1, -1, -1)
+        return self._page(positions, now, limit, offset, event_type, as_json, fields)
+    
+    def count_upcoming_events(self) -> int:
+        """Gelecek etkinlik sayısı"""
+        return len(self._date_index) - self._now_position(datetime.now())
     
-    def get_upcoming_events(self) -> List[Dict[str, Any]]:
-        """Gelecek etkinlikleri getir"""
-        upcoming = [event for event in self.events if event.is_upcoming]
-        upcoming.sort(key=lambda x: x.date)
-        return [event.to_dict() for event in upcoming]
+    def count_past_events(self) -> int:
+        """Geçmiş etkinlik sayısı"""
+        return self._now_position(datetime.now())
     
-    def get_past_events(self) -> List[Dict[str, Any]]:
-        """Geçmiş etkinlikleri getir"""
-        past = [event for event in self.events if event.is_past]
-        past.sort(key=lambda x: x.date, reverse=True)
-        return [event.to_dict() for event in past]
+    def search_events(self, query: str, limit: int = None, offset: int = 0,
+                      event_type: str = None, as_json: bool = False,
+                      fields: Tuple[str, ...] = None) -> Dict[str, Any]:
+        """Etkinlik ara (başlık, yer, açıklama); BM25 puanına göre sıralı"""
+        scores = self._search.scores(query)
+        if event_type:
+            scores = {i: s for i, s in scores.items() if self._by_id[i].type == event_type}
+        
+        now = datetime.now()
+        return {
+            'results': [self._serialize(self._by_id[i], now, as_json, fields)
+                        for i in BM25Index.top(scores, limit, offset)],
+            'total': len(scores)
+        }
     
-    def search_events(self, query: str) -> List[Dict[str, Any]]:
-        """Etkinlik ara (başlık, açıklama)"""
-        query = query.lower().strip()
-        results = []
+    def query_events(self, status: str = None, event_type: str = None,
+                     start: datetime = None, end: datetime = None, when: str = None,
+                     search: str = None, limit: int = None, offset: int = 0,
+                     as_json: bool = False, fields: Tuple[str, ...] = None) -> Dict[str, Any]:
+        """Filtreleri birleştiren etkinlik sorgusu
+        
+        Koşullar: durum, tip, başlangıç aralığı (start..end, dahil), when
+        ('upcoming' | 'past') ve metin araması. Aday kümesi en seçici indeksten
+        (durum/tip kümesi, tarih indeksindeki aralık veya arama eşleşmeleri) alınır,
+        diğer koşullar bu adaylara filtre olarak uygulanır; yalnızca dönen sayfa
+        serileştirilir. Sıralama: aramada puan, tarih koşulunda başlangıç zamanı
+        (geçmişte yeniden eskiye), aksi halde oluşturulma (ID) sırası.
+        """
+        now = datetime.now()
+        
+        # Tarih koşulları -> tarih indeksinde konum aralığı
+        dated = start is not None or end is not None or when is not None
+        positions = None
+        if dated:
+            low = bisect_left(self._date_index, (start,)) if start is not None else 0
+            high = (bisect_right(self._date_index, (end, float('inf')))
+                    if end is not None else len(self._date_index))
+            now_position = self._now_position(now)
+            if when == 'upcoming':
+                low = max(low, now_position)
+            elif when == 'past':
+                high = min(high, now_position)
+            positions = range(low, max(low, high))
+        
+        scores = self._search.scores(search) if search else None
+        
+        # Aday kaynakları: (ad, ID'ler, boyut); en küçüğü sürücü olur
+        sources = []
+        if scores is not None:
+            sources.append(('search', scores.keys(), len(scores)))
+        if status:
+            ids = self._by_status.get(status, ())
+            sources.append(('status', ids, len(ids)))
+        if event_type:
+            ids = self._by_type.get(event_type, ())
+            sources.append(('type', ids, len(ids)))
+        if positions is not None:
+            sources.append(('date', positions, len(positions)))
+        if not sources:
+            sources.append(('all', self._by_id.keys(), len(self._by_id)))
+        driver, candidates, _ = min(sources, key=lambda source: source[2])
+        
+        # Sürücü dışındaki koşullar filtre olarak
+        checks = []
+        if scores is not None and driver != 'search':
+            checks.append(lambda event: event.id in scores)
+        if status and driver != 'status':
+            checks.append(lambda event: event.status == status)
+        if event_type and driver != 'type':
+            checks.append(lambda event: event.type == event_type)
+        if positions is not None and driver != 'date':
+            # Aralığın ilk ve son anahtarı arasında kalan etkinlikler
+            first = self._date_index[positions.start] if positions else None
+            last = self._date_index[positions.stop - 1] if positions else None
+            
+            def in_range(event: Event) -> bool:
+                key = self._date_key(event)
+                return key is not None and first is not None and first <= key <= last
+            
+            checks.append(in_range)
+        
+        if driver == 'date':
+            if not checks:
+                # Yalnızca tarih koşulu: sayfa doğrudan aralıktan kesilir
+                ordered = positions if when != 'past' else positions[::-1]
+                end_index = offset + limit if limit is not None else None
+                page = [self._by_id[self._date_index[p][1]] for p in ordered[offset:end_index]]
+                return {
+                    'results': [self._serialize(event, now, as_json, fields) for event in page],
+                    'total': len(positions)
+                }
+            candidates = (self._date_index[p][1] for p in positions)
+        
+        matched = [
+            event_id for event_id in candidates
+            if all(check(self._by_id[event_id]) for check in checks)
+        ]
         
-        for event in self.events:
-            if (query in event.title.lower() or 
-                query in event.description.lower() or
-                query in event.location.lower()):
-                results.append(event.to_dict())
+        if scores is not None:
+            ordered = BM25Index.top({i: scores[i] for i in matched}, limit, offset)
+        else:
+            if dated:
+                if driver != 'date':
+                    matched.sort(key=lambda i: self._date_key(self._by_id[i]))
+                if when == 'past':
+                    matched.reverse()
+            else:
+                matched.sort()
+            end_index = offset + limit if limit is not None else None
+            ordered = matched[offset:end_index]
         
-        return results
+        return {
+            'results': [self._serialize(self._by_id[i], now, as_json, fields) for i in ordered],
+            'total': len(matched)
+        }
     
     def update_event(self, event_id: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Etkinlik bilgilerini güncelle"""
@@ -366,6 +636,11 @@ class EventManager:
                 'errors': ['Etkinlik bulunamadı']
             }
         
+        # Doğrulama başarısız olursa geri dönebilmek için önceki durum
+        previous = entity_state(event)
+        previous_key = self._date_key(event)
+        previous_filters = (event.status, event.type)
+        
         # Güncellenebilir alanları güncelle
         updatable_fields = [
             'title', 'description', 'date', 'start_time', 'end_time', 
@@ -381,11 +656,23 @@ class EventManager:
         
         validation = event.validate()
         if not validation['is_valid']:
+            vars(event).update(previous)
             return {
                 'success': False,
                 'errors': validation['errors']
             }
         
+        self.store.save(self.KIND, event)
+        
+        key = self._date_key(event)
+        if key != previous_key:
+            self._unindex_date(previous_key)
+            insort(self._date_index, key)
+        if (event.status, event.type) != previous_filters:
+            self._index_filters(event.id, *previous_filters, False)
+            self._index_filters(event.id, event.status, event.type, True)
+        self._index_text(event)
+        
         return {
             'success': True,
             'event': event.to_dict()
@@ -400,30 +687,30 @@ class EventManager:
                 'errors': ['Etkinlik bulunamadı']
             }
         
-        self.events = [e for e in self.events if e.id != event_id]
+        self._remove_position(event_id)
+        self._unindex(event)
+        self.store.delete(self.KIND, event_id)
+        enrollment_manager.remove_event(event_id)
         
         return {
             'success': True,
             'message': 'Etkinlik başarıyla silindi'
         }
     
+    def save_event(self, event: Event):
+        """Etkinlik nesnesinde doğrudan yapılan değişiklikleri kaydet"""
+        self.data_version += 1
+        self.store.save(self.KIND, event)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Etkinlik istatistikleri"""
         total_events = len(self.events)
-        upcoming_events = len([e for e in self.events if e.is_upcoming])
-        past_events = len([e for e in self.events if e.is_past])
+        past_events = self._now_position(datetime.now())
+        upcoming_events = len(self._date_index) - past_events
         
-        # Durum dağılımı
-        status_distribution = {}
-        for event in self.events:
-            status = event.status
-            status_distribution[status] = status_distribution.get(status, 0) + 1
-        
-        # Tip dağılımı
-        type_distribution = {}
-        for event in self.events:
-            event_type = event.type
-            type_distribution[event_type] = type_distribution.get(event_type, 0) + 1
+        # Durum ve tip dağılımı (indeks kümelerinden)
+        status_distribution = {status: len(ids) for status, ids in self._by_status.items()}
+        type_distribution = {event_type: len(ids) for event_type, ids in self._by_type.items()}
         
         return {
             'total_events': total_events,
@@ -432,11 +719,7 @@ class EventManager:
             'status_distribution': status_distribution,
             'type_distribution': type_distribution,
             'recent_events': [
-                e.to_dict() for e in sorted(
-                    self.events, 
-                    key=lambda x: x.created_at, 
-                    reverse=True
-                )[:5]
+                e.to_dict() for e in heapq.nlargest(5, self.events, key=lambda x: x.created_at)
             ]
         }
 
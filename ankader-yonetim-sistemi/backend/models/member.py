@@ -6,9 +6,15 @@ Member Model - Üye Modeli
 
 from datetime import datetime
 import re
-from typing import Dict, Any, Optional, List
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Any, Optional, List, Tuple
+from storage import MemoryStore, StorageConflictError, entity_state
+from .text_index import TrigramIndex, turkish_sort_key
+from .enrollment import enrollment_manager
+from .rollup import rollup_manager
+from .serialization import CachedJSON, Projectable, encode_json, encode_cursor, decode_cursor
 
-class Member:
+class Member(CachedJSON, Projectable):
     """Üye modeli"""
     
     def __init__(self, **kwargs):
@@ -24,7 +30,8 @@ class Member:
         self.join_date = kwargs.get('join_date', datetime.now())
         self.custom_fields = kwargs.get('custom_fields', {})
         self.notes = kwargs.get('notes', '')
-        self.events = kwargs.get('events', [])
+        # Etkinlik kayıtları kayıt deposunda tutulur; eski kayıtlardaki liste taşınmayı bekler
+        self._legacy_events = kwargs.get('events') or []
         self.created_by = kwargs.get('created_by')
         self.updated_by = kwargs.get('updated_by')
         self.created_at = kwargs.get('created_at', datetime.now())
@@ -55,6 +62,8 @@ class Member:
         # Mezuniyet yılı kontrolü
         if not self.graduation_year:
             errors.append('Mezuniyet yılı zorunludur')
+        elif isinstance(self.graduation_year, bool) or not isinstance(self.graduation_year, int):
+            errors.append('Mezuniyet yılı sayı olmalıdır')
         elif self.graduation_year < 1990:
             errors.append('Mezuniyet yılı 1990\'dan küçük olamaz')
         elif self.graduation_year > datetime.now().year:
@@ -96,92 +105,71 @@ class Member:
         pattern = r'^\w+([.-]?\w+)*@\w+([.-]?\w+)*(\.\w{2,3})+$'
         return bool(re.match(pattern, self.email))
     
+    def pop_legacy_events(self) -> List[Dict[str, Any]]:
+        """Üye üzerinde saklanmış eski etkinlik listesini al ve temizle"""
+        events, self._legacy_events = self._legacy_events, []
+        return events
+    
+    def event_list(self) -> List[Dict[str, Any]]:
+        """Üyenin etkinlik kayıtları (kayıt sırasıyla)"""
+        return [e.to_member_view() for e in enrollment_manager.get_member_enrollments(self.id)]
+    
     @property
     def event_count(self) -> int:
         """Toplam etkinlik sayısı"""
-        return len(self.events) if self.events else 0
+        return enrollment_manager.count_for_member(self.id)
     
     @property
     def attended_event_count(self) -> int:
         """Katıldığı etkinlik sayısı"""
-        if not self.events:
-            return 0
-        return len([e for e in self.events if e.get('status') == 'attended'])
-    
-    def add_event(self, event_id: int, status: str = 'registered') -> bool:
-        """Üyeye etkinlik ekle"""
-        if not self.events:
-            self.events = []
-        
-        # Aynı etkinlik zaten ekli mi kontrol et
-        for event in self.events:
-            if event.get('event_id') == event_id:
-                return False
-        
-        self.events.append({
-            'event_id': event_id,
-            'attendance_date': datetime.now(),
-            'status': status
-        })
-        
-        self.updated_at = datetime.now()
-        return True
-    
-    def update_event_status(self, event_id: int, status: str) -> bool:
-        """Etkinlik durumunu güncelle"""
-        if not self.events:
-            return False
-        
-        valid_statuses = ['attended', 'registered', 'cancelled']
-        if status not in valid_statuses:
-            return False
-        
-        for event in self.events:
-            if event.get('event_id') == event_id:
-                event['status'] = status
-                event['attendance_date'] = datetime.now()
-                self.updated_at = datetime.now()
-                return True
-        
-        return False
-    
-    def remove_event(self, event_id: int) -> bool:
-        """Üyeden etkinlik kaldır"""
-        if not self.events:
-            return False
-        
-        original_length = len(self.events)
-        self.events = [e for e in self.events if e.get('event_id') != event_id]
-        
-        if len(self.events) < original_length:
-            self.updated_at = datetime.now()
-            return True
-        
-        return False
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Üyeyi dictionary'ye çevir"""
-        return {
-            'id': self.id,
-            'photo': self.photo,
-            'name': self.name,
-            'phone': self.phone,
-            'email': self.email,
-            'graduation_year': self.graduation_year,
-            'university': self.university,
-            'department': self.department,
-            'status': self.status,
-            'join_date': self.join_date.isoformat() if self.join_date else None,
-            'custom_fields': self.custom_fields,
-            'notes': self.notes,
-            'events': self.events,
-            'event_count': self.event_count,
-            'attended_event_count': self.attended_event_count,
-            'created_by': self.created_by,
-            'updated_by': self.updated_by,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return enrollment_manager.count_for_member(self.id, 'attended')
+    
+    # Alan adı -> değer üreticisi; to_dict yalnızca istenen alanları hesaplar
+    FIELD_GETTERS = {
+        'id': lambda m: m.id,
+        'photo': lambda m: m.photo,
+        'name': lambda m: m.name,
+        'phone': lambda m: m.phone,
+        'email': lambda m: m.email,
+        'graduation_year': lambda m: m.graduation_year,
+        'university': lambda m: m.university,
+        'department': lambda m: m.department,
+        'status': lambda m: m.status,
+        'join_date': lambda m: m.join_date.isoformat() if m.join_date else None,
+        'custom_fields': lambda m: m.custom_fields,
+        'notes': lambda m: m.notes,
+        'events': lambda m: m.event_list(),
+        'event_count': lambda m: m.event_count,
+        'attended_event_count': lambda m: m.attended_event_count,
+        'created_by': lambda m: m.created_by,
+        'updated_by': lambda m: m.updated_by,
+        'created_at': lambda m: m.created_at.isoformat() if m.created_at else None,
+        'updated_at': lambda m: m.updated_at.isoformat() if m.updated_at else None
+    }
+    
+    # Liste görünümleri için adlandırılmış projeksiyonlar
+    PROJECTIONS = {
+        'summary': ('id', 'photo', 'name', 'phone', 'email', 'university',
+                    'graduation_year', 'status'),
+        'detail': tuple(FIELD_GETTERS)
+    }
+    
+    def to_dict(self, fields: Tuple[str, ...] = None) -> Dict[str, Any]:
+        """Üyeyi dictionary'ye çevir (fields: yalnızca bu alanlar, varsayılan tümü)"""
+        getters = self.FIELD_GETTERS
+        return {field: getters[field](self) for field in fields or self.PROJECTIONS['detail']}
+    
+    def to_json(self, fields: Tuple[str, ...] = None) -> bytes:
+        """to_dict() çıktısının JSON'u
+        
+        Adlandırılmış projeksiyonlar önbellekte tutulur (alan veya kayıt değişince
+        yenilenir); özel alan listeleri her seferinde kodlanır.
+        """
+        slot = self.projection_name(fields)
+        if slot is None:
+            return encode_json(self.to_dict(fields))
+        return self._cached_json(enrollment_manager.member_version(self.id),
+                                 lambda: self.to_dict(fields), slot)
     
     def __str__(self):
         return f"Member(id={self.id}, name='{self.name}', status='{self.status}')"
@@ -193,13 +181,174 @@ class Member:
 class MemberManager:
     """Üye yönetimi için yardımcı sınıf"""
     
+    KIND = 'members'
+    model = Member
+    
+    # Aramada taranan alanlar (sıra, eşit kalitedeki eşleşmelerde önceliği belirler)
+    SEARCH_FIELDS = ('name', 'email', 'phone', 'university', 'department')
+    
+    # İstatistiklerde gösterilen son katılan üye sayısı
+    RECENT_MEMBERS = 5
+    
+    # Sayfalı listede desteklenen sıralamalar ve sayfa boyutu sınırı
+    SORT_FIELDS = ('name', 'join_date', 'graduation_year')
+    MAX_PAGE_SIZE = 200
+    
     def __init__(self):
         self.members = []
-        self._next_id = 1
+        # ID -> members listesindeki konum (senkronizasyonda O(1) yer değiştirme için)
+        self._positions: Dict[int, int] = {}
+        self.store = MemoryStore()
+        
+        # İndeksler: ID (tüm üyeler), email ve telefon (yalnızca aktif üyeler, benzersiz)
+        self._by_id: Dict[int, Member] = {}
+        self._by_email: Dict[str, Member] = {}
+        self._by_phone: Dict[str, Member] = {}
+        # Arama indeksi (yalnızca aktif üyeler)
+        self._search = TrigramIndex()
+        # Sıralı indeksler: durum -> sıralama alanı -> [(anahtar, id)]
+        self._sorted: Dict[str, Dict[str, List[Tuple[Any, int]]]] = {}
+        self._reset_statistics()
+        # Veri sürümü: her değişiklikte artar (önbellek anahtarları için)
+        self.data_version = 0
+    
+    def _reset_statistics(self):
+        """İstatistik sayaçlarını sıfırla (her ekleme/çıkarmada güncellenirler)"""
+        self._status_counts: Dict[str, int] = {}
+        self._graduation_years: Dict[Any, int] = {}
+        self._universities: Dict[str, int] = {}
+        # Aktif üyeler katılım tarihine göre sıralı: (join_date, id)
+        self._join_index: List[Tuple[datetime, int]] = []
+    
+    @staticmethod
+    def _bump(counts: Dict[Any, int], key: Any, delta: int):
+        count = counts.get(key, 0) + delta
+        if count:
+            counts[key] = count
+        else:
+            counts.pop(key, None)
+    
+    def _count_member(self, member: Member, delta: int):
+        """Üyeyi istatistik sayaçlarına ekle (delta=1) veya çıkar (delta=-1)"""
+        self._bump(self._status_counts, member.status, delta)
+        if member.status != 'active':
+            return
+        
+        self._bump(self._graduation_years, member.graduation_year, delta)
+        self._bump(self._universities, member.university, delta)
+        key = (member.join_date, member.id)
+        if delta > 0:
+            insort(self._join_index, key)
+        else:
+            position = bisect_left(self._join_index, key)
+            if position < len(self._join_index) and self._join_index[position] == key:
+                del self._join_index[position]
+    
+    @staticmethod
+    def _sort_value(member: Member, sort: str) -> Any:
+        """Üyenin verilen sıralamadaki anahtarı"""
+        if sort == 'name':
+            return turkish_sort_key(member.name)
+        if sort == 'join_date':
+            return member.join_date or datetime.min
+        return member.graduation_year or 0
+    
+    def _sort_member(self, member: Member, add: bool):
+        """Üyeyi durumunun sıralı indekslerine ekle veya çıkar"""
+        indexes = self._sorted.setdefault(member.status, {sort: [] for sort in self.SORT_FIELDS})
+        for sort, index in indexes.items():
+            key = (self._sort_value(member, sort), member.id)
+            if add:
+                insort(index, key)
+            else:
+                position = bisect_left(index, key)
+                if position < len(index) and index[position] == key:
+                    del index[position]
+    
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return (email or '').strip().lower()
+    
+    @staticmethod
+    def _phone_key(phone: str) -> str:
+        return (phone or '').strip()
+    
+    def _index(self, member: Member):
+        """Üyeyi indekslere ve istatistiklere ekle"""
+        self.data_version += 1
+        self._by_id[member.id] = member
+        self._count_member(member, 1)
+        self._sort_member(member, True)
+        if member.status == 'active':
+            self._by_email[self._email_key(member.email)] = member
+            self._by_phone[self._phone_key(member.phone)] = member
+            self._search.add(member.id, [getattr(member, f) or '' for f in self.SEARCH_FIELDS])
+    
+    def _unindex(self, member: Member):
+        """Üyeyi benzersiz indekslerden, arama indeksinden ve istatistiklerden çıkar (ID indeksi korunur)"""
+        self.data_version += 1
+        self._count_member(member, -1)
+        self._sort_member(member, False)
+        self._search.remove(member.id)
+        email_key = self._email_key(member.email)
+        if self._by_email.get(email_key) is member:
+            del self._by_email[email_key]
+        phone_key = self._phone_key(member.phone)
+        if self._by_phone.get(phone_key) is member:
+            del self._by_phone[phone_key]
+    
+    def _uniqueness_errors(self, member: Member) -> List[str]:
+        """Email ve telefonun başka bir aktif üyede olup olmadığını kontrol et"""
+        errors = []
+        owner = self._by_email.get(self._email_key(member.email))
+        if owner is not None and owner is not member:
+            errors.append('Bu email adresi zaten kullanılıyor')
+        owner = self._by_phone.get(self._phone_key(member.phone))
+        if owner is not None and owner is not member:
+            errors.append('Bu telefon numarası zaten kullanılıyor')
+        return errors
+    
+    def iter_entities(self) -> List[Member]:
+        """Depo için tüm üyeler"""
+        return self.members
+    
+    def restore_entities(self, members: List[Member]):
+        """Depodan okunan üyelerle belleği baştan doldur"""
+        self.members = list(members)
+        self._positions = {member.id: position for position, member in enumerate(self.members)}
+        self._by_id, self._by_email, self._by_phone = {}, {}, {}
+        self._search.clear()
+        self._sorted = {}
+        self._reset_statistics()
+        self.data_version += 1
+        for member in self.members:
+            self._index(member)
+    
+    def load_entity(self, member: Member):
+        """Depodan gelen üyeyi belleğe al (varsa yerine koy)"""
+        existing = self._by_id.get(member.id)
+        if existing is not None:
+            self._unindex(existing)
+            self.members[self._positions[member.id]] = member
+        else:
+            self._positions[member.id] = len(self.members)
+            self.members.append(member)
+        self._index(member)
+    
+    def unload_entity(self, member_id: int):
+        """Depoda silinen üyeyi bellekten çıkar"""
+        existing = self._by_id.pop(member_id, None)
+        if existing is not None:
+            self._unindex(existing)
+            # Seyrek işlem (üyeler soft delete edilir): sonraki konumlar kayar
+            position = self._positions.pop(member_id)
+            del self.members[position]
+            for later in self.members[position:]:
+                self._positions[later.id] -= 1
     
     def create_member(self, member_data: Dict[str, Any]) -> Dict[str, Any]:
         """Yeni üye oluştur"""
-        member_data['id'] = self._next_id
+        member_data.pop('id', None)
         member = Member(**member_data)
         
         validation = member.validate()
@@ -209,22 +358,26 @@ class MemberManager:
                 'errors': validation['errors']
             }
         
-        # Email benzersizlik kontrolü
-        if self.get_member_by_email(member.email):
+        # Email ve telefon benzersizlik kontrolü
+        errors = self._uniqueness_errors(member)
+        if errors:
             return {
                 'success': False,
-                'errors': ['Bu email adresi zaten kullanılıyor']
+                'errors': errors[:1]
             }
         
-        # Telefon benzersizlik kontrolü
-        if self.get_member_by_phone(member.phone):
+        try:
+            member.id = self.store.insert(self.KIND, member)
+        except StorageConflictError as e:
             return {
                 'success': False,
-                'errors': ['Bu telefon numarası zaten kullanılıyor']
+                'errors': [str(e)]
             }
         
+        self._positions[member.id] = len(self.members)
         self.members.append(member)
-        self._next_id += 1
+        self._index(member)
+        rollup_manager.record('new_members', member.join_date)
         
         return {
             'success': True,
@@ -233,47 +386,97 @@ class MemberManager:
     
     def get_member_by_id(self, member_id: int) -> Optional[Member]:
         """ID'ye göre üye bul"""
-        for member in self.members:
-            if member.id == member_id and member.status == 'active':
-                return member
+        member = self._by_id.get(member_id)
+        if member is not None and member.status == 'active':
+            return member
         return None
     
     def get_member_by_email(self, email: str) -> Optional[Member]:
         """Email'e göre üye bul"""
-        for member in self.members:
-            if member.email.lower() == email.lower() and member.status == 'active':
-                return member
-        return None
+        return self._by_email.get(self._email_key(email))
     
     def get_member_by_phone(self, phone: str) -> Optional[Member]:
         """Telefon numarasına göre üye bul"""
-        for member in self.members:
-            if member.phone == phone and member.status == 'active':
-                return member
-        return None
+        return self._by_phone.get(self._phone_key(phone))
+    
+    @staticmethod
+    def _serialize(member: Member, as_json: bool, fields: Tuple[str, ...] = None):
+        return member.to_json(fields) if as_json else member.to_dict(fields)
+    
+    def get_members_by_status(self, status: str = 'active') -> List[Member]:
+        """Durumdaki üye nesneleri (serileştirmeden; akış yanıtları öğeleri gönderirken serileştirir)"""
+        return [member for member in self.members if member.status == status]
     
-    def get_all_members(self, status: str = 'active') -> List[Dict[str, Any]]:
-        """Tüm üyeleri getir"""
-        filtered_members = [member for member in self.members if member.status == status]
-        return [member.to_dict() for member in filtered_members]
+    def get_all_members(self, status: str = 'active', as_json: bool = False,
+                        fields: Tuple[str, ...] = None) -> List[Any]:
+        """Tüm üyeleri getir (as_json: önbellekli JSON parçaları, fields: yalnızca bu alanlar)"""
+        return [self._serialize(member, as_json, fields)
+                for member in self.get_members_by_status(status)]
     
-    def search_members(self, query: str) -> List[Dict[str, Any]]:
-        """Üye ara (ad, email, telefon)"""
-        query = query.lower().strip()
-        results = []
+    def get_members_page(self, status: str = 'active', sort: str = 'name', order: str = 'asc',
+                         limit: int = 50, cursor: str = None, as_json: bool = False,
+                         fields: Tuple[str, ...] = None) -> Dict[str, Any]:
+        """Üyeleri sıralı indeksten keyset (cursor) ile sayfala
+        
+        Cursor, önceki sayfanın son üyesinin (anahtar, id) değeridir; sayfa başlangıcı
+        ikili aramayla bulunur, maliyet üye sayısına değil sayfa boyutuna bağlıdır.
+        Araya eklenen/silinen üyeler sayfaların kaymasına yol açmaz.
+        """
+        index = self._sorted.get(status, {}).get(sort, [])
+        after = None
+        if cursor:
+            values = decode_cursor(cursor)
+            if not values or len(values) != 5 or values[:3] != [status, sort, order]:
+                return {
+                    'success': False,
+                    'errors': ['Geçersiz cursor']
+                }
+            after = (values[3], values[4])
+        
+        try:
+            if order == 'desc':
+                end = bisect_left(index, after) if after is not None else len(index)
+                start = max(0, end - limit)
+                keys = index[start:end][::-1]
+                has_more = start > 0
+            else:
+                start = bisect_right(index, after) if after is not None else 0
+                keys = index[start:start + limit]
+                has_more = start + limit < len(index)
+        except TypeError:
+            # Cursor anahtarı bu sıralamanın türüyle karşılaştırılamıyor
+            return {
+                'success': False,
+                'errors': ['Geçersiz cursor']
+            }
         
-        for member in self.members:
-            if member.status != 'active':
-                continue
-            
-            if (query in member.name.lower() or 
-                query in member.email.lower() or 
-                query in member.phone or
-                query in member.university.lower() or
-                query in member.department.lower()):
-                results.append(member.to_dict())
+        page = [self._by_id[member_id] for _, member_id in keys]
+        next_cursor = None
+        if has_more and keys:
+            next_cursor = encode_cursor(status, sort, order, *keys[-1])
+        
+        return {
+            'success': True,
+            'results': [self._serialize(m, as_json, fields) for m in page],
+            'next_cursor': next_cursor,
+            'total': len(index)
+        }
+    
+    def search_members(self, query: str, limit: int = None, offset: int = 0,
+                       as_json: bool = False, fields: Tuple[str, ...] = None) -> Dict[str, Any]:
+        """Üye ara (ad, email, telefon, üniversite, bölüm)
+        
+        Sonuçlar eşleşme kalitesine göre sıralanır (tam > başta > kelime başında > içinde);
+        yalnızca istenen sayfa serileştirilir.
+        """
+        member_ids = self._search.search(query)
+        end = offset + limit if limit is not None else None
+        page = [self._by_id[member_id] for member_id in member_ids[offset:end]]
         
-        return results
+        return {
+            'results': [self._serialize(m, as_json, fields) for m in page],
+            'total': len(member_ids)
+        }
     
     def update_member(self, member_id: int, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Üye bilgilerini güncelle"""
@@ -284,6 +487,10 @@ class MemberManager:
                 'errors': ['Üye bulunamadı']
             }
         
+        # Doğrulama veya kayıt başarısız olursa geri dönebilmek için önceki durum
+        previous = entity_state(member)
+        self._unindex(member)
+        
         # Güncellenebilir alanları güncelle
         updatable_fields = [
             'photo', 'name', 'phone', 'email', 'graduation_year', 
@@ -291,19 +498,35 @@ class MemberManager:
             'notes', 'updated_by'
         ]
         
-        for field in updatable_fields:
-            if field in update_data:
-                setattr(member, field, update_data[field])
-        
-        member.updated_at = datetime.now()
-        
-        validation = member.validate()
-        if not validation['is_valid']:
+        try:
+            for field in updatable_fields:
+                if field in update_data:
+                    setattr(member, field, update_data[field])
+            
+            member.updated_at = datetime.now()
+            
+            validation = member.validate()
+            errors = validation['errors'] or self._uniqueness_errors(member)
+            if not errors:
+                self.store.save(self.KIND, member)
+        except StorageConflictError as e:
+            errors = [str(e)]
+        except Exception:
+            # Beklenmeyen hata: üye önceki haliyle indekslere geri konur
+            vars(member).update(previous)
+            self._index(member)
+            raise
+        
+        if errors:
+            vars(member).update(previous)
+            self._index(member)
             return {
                 'success': False,
-                'errors': validation['errors']
+                'errors': errors
             }
         
+        self._index(member)
+        
         return {
             'success': True,
             'member': member.to_dict()
@@ -318,42 +541,32 @@ class MemberManager:
                 'errors': ['Üye bulunamadı']
             }
         
+        self._unindex(member)
         member.status = 'inactive'
         member.updated_at = datetime.now()
+        self._index(member)
+        self.store.save(self.KIND, member)
         
         return {
             'success': True,
             'message': 'Üye başarıyla silindi'
         }
     
+    def save_member(self, member: Member):
+        """Üye nesnesinde doğrudan yapılan değişiklikleri kaydet"""
+        self.data_version += 1
+        self.store.save(self.KIND, member)
+    
     def get_statistics(self) -> Dict[str, Any]:
-        """Üye istatistikleri"""
-        active_members = [m for m in self.members if m.status == 'active']
-        
-        # Mezuniyet yılı dağılımı
-        graduation_years = {}
-        for member in active_members:
-            year = member.graduation_year
-            graduation_years[year] = graduation_years.get(year, 0) + 1
-        
-        # Üniversite dağılımı
-        universities = {}
-        for member in active_members:
-            uni = member.university
-            universities[uni] = universities.get(uni, 0) + 1
+        """Üye istatistikleri (sayaçlardan; üye sayısından bağımsız)"""
+        recent = self._join_index[-self.RECENT_MEMBERS:][::-1]
         
         return {
-            'total_members': len(active_members),
-            'inactive_members': len([m for m in self.members if m.status == 'inactive']),
-            'graduation_year_distribution': graduation_years,
-            'university_distribution': universities,
-            'recent_members': [
-                m.to_dict() for m in sorted(
-                    active_members, 
-                    key=lambda x: x.join_date, 
-                    reverse=True
-                )[:5]
-            ]
+            'total_members': self._status_counts.get('active', 0),
+            'inactive_members': self._status_counts.get('inactive', 0),
+            'graduation_year_distribution': dict(self._graduation_years),
+            'university_distribution': dict(self._universities),
+            'recent_members': [self._by_id[member_id].to_dict() for _, member_id in recent]
         }
 
 
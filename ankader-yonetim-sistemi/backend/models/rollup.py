@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rollup Model - Aylık özet (rollup) tablosu
+"""
+
+import logging
+import threading
+from datetime import datetime, date
+from typing import Dict, Any, Optional, List
+from storage import MemoryStore, StorageConflictError
+
+logger = logging.getLogger(__name__)
+
+class MonthlyRollup:
+    """Bir ayın tek bir metriği için sayaç satırı"""
+    
+    def __init__(self, **kwargs):
+        self.id = kwargs.get('id')
+        self.month = kwargs.get('month')  # 'YYYY-MM'
+        self.metric = kwargs.get('metric')
+        self.value = kwargs.get('value', 0)
+        self.updated_at = kwargs.get('updated_at', datetime.now())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Satırı dictionary'ye çevir"""
+        return {
+            'id': self.id,
+            'month': self.month,
+            'metric': self.metric,
+            'value': self.value,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def __str__(self):
+        return f"MonthlyRollup(month='{self.month}', metric='{self.metric}', value={self.value})"
+    
+    def __repr__(self):
+        return self.__str__()
+
+
+def month_key(moment) -> Optional[str]:
+    """Tarihin ait olduğu ay anahtarı ('YYYY-MM')"""
+    if not isinstance(moment, (datetime, date)):
+        return None
+    return f'{moment.year:04d}-{moment.month:02d}'
+
+
+def month_range(start: str, end: str) -> List[str]:
+    """start..end (dahil) arasındaki ay anahtarları"""
+    year, month = map(int, start.split('-'))
+    last = tuple(map(int, end.split('-')))
+    months = []
+    while (year, month) <= last:
+        months.append(f'{year:04d}-{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class RollupManager:
+    """(ay, metrik) anahtarlı aylık özetler
+    
+    Sayaçlar kayıtlar yazılırken güncellenir ve depoda saklanır; raporlar ham
+    veriyi taramadan bu satırlardan okunur. Geçmiş aylar bir kez yazıldıktan
+    sonra yeniden hesaplanmaz (ham logların temizlenmesi de onları değiştirmez).
+    """
+    
+    KIND = 'monthly_rollups'
+    model = MonthlyRollup
+    
+    METRICS = ['new_members', 'new_events', 'login_count', 'attendance']
+    MAX_MONTHS = 120  # tek raporda en fazla ay
+    MAX_RETRIES = 3  # depo çakışmasında yeniden deneme sayısı
+    
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, MonthlyRollup]] = {}
+        self._by_id: Dict[int, MonthlyRollup] = {}
+        self._lock = threading.Lock()
+        self.store = MemoryStore()
+        # Veri sürümü: her değişiklikte artar (önbellek anahtarları için)
+        self.data_version = 0
+    
+    def _index(self, row: MonthlyRollup):
+        self.data_version += 1
+        self._by_id[row.id] = row
+        self._rows.setdefault(row.month, {})[row.metric] = row
+    
+    def _unindex(self, row: MonthlyRollup):
+        self.data_version += 1
+        self._by_id.pop(row.id, None)
+        metrics = self._rows.get(row.month, {})
+        if metrics.get(row.metric) is row:
+            del metrics[row.metric]
+            if not metrics:
+                del self._rows[row.month]
+    
+    def iter_entities(self) -> List[MonthlyRollup]:
+        """Depo için tüm satırlar"""
+        return list(self._by_id.values())
+    
+    def restore_entities(self, rows: List[MonthlyRollup]):
+        """Depodan okunan satırlarla belleği baştan doldur"""
+        with self._lock:
+            self._rows, self._by_id = {}, {}
+            for row in rows:
+                self._index(row)
+    
+    def load_entity(self, row: MonthlyRollup):
+        """Başka bir worker'ın yazdığı satırı belleğe al"""
+        with self._lock:
+            existing = self._by_id.get(row.id)
+            if existing is not None:
+                self._unindex(existing)
+            self._index(row)
+    
+    def unload_entity(self, row_id: int):
+        """Depoda silinen satırı bellekten çıkar"""
+        with self._lock:
+            existing = self._by_id.get(row_id)
+            if existing is not None:
+                self._unindex(existing)
+    
+    def record(self, metric: str, moment, delta: int = 1):
+        """Metriği tarihin ayında `delta` kadar değiştir"""
+        month = month_key(moment)
+        if month is None or not delta:
+            return
+        
+        for _ in range(self.MAX_RETRIES):
+            try:
+                with self._lock:
+                    self._apply(month, metric, delta)
+                return
+            except StorageConflictError as e:
+                # Satırı aynı anda başka bir worker oluşturdu; depodan okuyup artırarak yeniden dene
+                error = e
+        logger.error('Aylık özet güncellenemedi (%s, %s): %s', month, metric, error)
+    
+    def _apply(self, month: str, metric: str, delta: int):
+        """Sayacı depoda atomik olarak artır, satır yoksa oluştur (kilit çağıranda)"""
+        row = self._rows.get(month, {}).get(metric)
+        if row is None:
+            row = self.store.find(self.KIND, month=month, metric=metric)
+            if row is None:
+                row = MonthlyRollup(month=month, metric=metric, value=delta)
+                row.id = self.store.insert(self.KIND, row)
+                self._index(row)
+                return
+            self._index(row)
+        
+        try:
+            self.store.increment(self.KIND, row, 'value', delta, updated_at=datetime.now())
+        except StorageConflictError:
+            # Satır depoda yok; bir sonraki denemede yeniden oluşturulur
+            self._unindex(row)
+            raise
+        self.data_version += 1
+    
+    def backfill(self, member_manager, event_manager, enrollment_manager, activity_log_manager) -> int:
+        """Özet tablosu boşsa ham veriden bir kez oluştur, oluşturulan satır sayısını döndür
+        
+        Worker'lar aynı anda başlarsa yalnızca biri yazar; diğerleri çakışmada
+        yazılan satırları yükler.
+        """
+        if self._by_id:
+            return 0
+        
+        counts = self._count(self.METRICS, member_manager, event_manager,
+                             enrollment_manager, activity_log_manager)
+        
+        rows = [MonthlyRollup(month=month, metric=metric, value=value)
+                for (month, metric), value in sorted(counts.items())]
+        try:
+            with self._lock:
+                self.store.insert_many(self.KIND, rows)
+                for row in rows:
+                    self._index(row)
+        except StorageConflictError:
+            # Başka bir worker aynı anda doldurdu; onun satırlarını depodan al
+            self.store.sync()
+            return 0
+        return len(rows)
+    
+    @staticmethod
+    def _count(metrics: List[str], member_manager, event_manager, enrollment_manager,
+               activity_log_manager) -> Dict[tuple, int]:
+        """İstenen metrikleri ham veriden say: (ay, metrik) -> değer"""
+        counts: Dict[tuple, int] = {}
+        
+        def count(metric: str, moment):
+            month = month_key(moment)
+            if month is not None:
+                counts[(month, metric)] = counts.get((month, metric), 0) + 1
+        
+        if 'new_members' in metrics:
+            for member in member_manager.members:
+                count('new_members', member.join_date)
+        if 'new_events' in metrics:
+            for event in event_manager.events:
+                count('new_events', event.created_at)
+        if 'attendance' in metrics:
+            for enrollment in enrollment_manager.iter_entities():
+                if enrollment.status == 'attended':
+                    count('attendance', enrollment.status_date)
+        if 'login_count' in metrics:
+            for activity_log in activity_log_manager.logs:
+                if activity_log.action == 'login':
+                    count('login_count', activity_log.created_at)
+        return counts
+    
+    def rebuild(self, metrics: List[str], member_manager, event_manager, enrollment_manager,
+                activity_log_manager) -> int:
+        """Metrikleri ham veriden yeniden hesapla (ör. yedekten geri yüklemeden sonra)
+        
+        Ham veriyle tutmayan satırlar hesaplanan değere ayarlanır (veride karşılığı
+        kalmayanlar 0'a); değişen satır sayısı döndürülür.
+        """
+        counts = self._count(metrics, member_manager, event_manager,
+                             enrollment_manager, activity_log_manager)
+        changed = 0
+        with self._lock:
+            for month, rows in self._rows.items():
+                for metric in rows:
+                    if metric in metrics:
+                        counts.setdefault((month, metric), 0)
+            for (month, metric), value in sorted(counts.items()):
+                row = self._rows.get(month, {}).get(metric)
+                if row is None:
+                    if not value:
+                        continue
+                    row = MonthlyRollup(month=month, metric=metric, value=value)
+                    row.id = self.store.insert(self.KIND, row)
+                    self._index(row)
+                elif row.value != value:
+                    row.value = value
+                    row.updated_at = datetime.now()
+                    self.store.save(self.KIND, row)
+                    self.data_version += 1
+                else:
+                    continue
+                changed += 1
+        return changed
+    
+    def get_report(self, start: str, end: str, metrics: List[str] = None) -> List[Dict[str, Any]]:
+        """start..end ayları için istenen metrikler (ay başına bir satır)"""
+        metrics = metrics or self.METRICS
+        report = []
+        with self._lock:
+            for month in month_range(start, end):
+                rows = self._rows.get(month, {})
+                entry = {'month': month}
+                for metric in metrics:
+                    row = rows.get(metric)
+                    entry[metric] = row.value if row is not None else 0
+                report.append(entry)
+        return report
+
+
+# Global aylık özet yöneticisi
+rollup_manager = RollupManager()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serialization - Önceden kodlanmış (önbellekli) JSON yardımcıları
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from werkzeug.http import http_date
+
+def _encode_default(value: Any):
+    """Flask'ın jsonify'ı ile aynı: tarihler HTTP tarih biçiminde"""
+    if isinstance(value, date):
+        return http_date(value)
+    raise TypeError(f'{type(value).__name__} JSON ile kodlanamaz')
+
+
+def encode_json(value: Any) -> bytes:
+    """Değeri sıkıştırılmış UTF-8 JSON'a çevir"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'),
+                      default=_encode_default).encode('utf-8')
+
+
+def encode_cursor(*values: Any) -> str:
+    """Keyset sayfalama için opak cursor (URL güvenli base64 JSON; datetime korunur)"""
+    def default(value):
+        if isinstance(value, datetime):
+            return {'$dt': value.isoformat()}
+        raise TypeError(f'{type(value).__name__} cursor içinde kullanılamaz')
+    
+    raw = json.dumps(list(values), separators=(',', ':'), default=default)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[List[Any]]:
+    """encode_cursor ile üretilen değerleri geri çöz; geçersizse None"""
+    def object_hook(value):
+        if set(value) == {'$dt'}:
+            return datetime.fromisoformat(value['$dt'])
+        return value
+    
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw.decode('utf-8'), object_hook=object_hook)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+class CachedJSON:
+    """Nesnenin JSON biçimini önbellekte tutan mixin
+    
+    Alt çizgisiz (kalıcı) bir alana her atamada önbellek silinir. Nesne dışındaki
+    verilere (ör. kayıtlar, zaman) bağlı alanlar için `key` kullanılır: anahtar
+    değişirse JSON yeniden üretilir. Alanları yerinde değiştiren metotlar
+    (liste/sözlük) sonunda updated_at'i atadığı için önbelleği de temizler.
+    """
+    
+    def __setattr__(self, name: str, value: Any):
+        if not name.startswith('_'):
+            self.__dict__.pop('_json', None)
+        object.__setattr__(self, name, value)
+    
+    def _cached_json(self, key: Hashable, build: Callable[[], Any], slot: str = 'detail') -> bytes:
+        """Önbellekteki JSON'u döndür; yoksa veya anahtar değiştiyse yeniden üret
+        
+        slot: aynı nesnenin farklı projeksiyonları ayrı tutulur (ör. summary, detail)
+        """
+        slots = self.__dict__.get('_json')
+        if slots is None:
+            slots = self.__dict__['_json'] = {}
+        cached = slots.get(slot)
+        if cached is None or cached[0] != key:
+            cached = slots[slot] = (key, encode_json(build()))
+        return cached[1]
+
+
+class Projectable:
+    """Alan seçimi (sparse fieldset) ve adlandırılmış projeksiyonlar
+    
+    FIELD_GETTERS alan adından değer üreticisine eşlenir; to_dict yalnızca
+    istenen alanların üreticilerini çağırır. PROJECTIONS adlandırılmış alan
+    listeleridir ('detail' tüm alanlar).
+    """
+    
+    FIELD_GETTERS: Dict[str, Callable] = {}
+    PROJECTIONS: Dict[str, Tuple[str, ...]] = {}
+    
+    @classmethod
+    def resolve_fields(cls, spec: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """'summary', 'detail' veya 'a,b,c' -> alan demeti (boşsa None: tüm alanlar)
+        
+        Bilinmeyen alanda ValueError; id her zaman dahildir.
+        """
+        spec = (spec or '').strip()
+        if not spec:
+            return None
+        if spec in cls.PROJECTIONS:
+            return cls.PROJECTIONS[spec]
+        
+        fields = [field.strip() for field in spec.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in cls.FIELD_GETTERS]
+        if unknown:
+            raise ValueError(f'Bilinmeyen alan(lar): {", ".join(unknown)}. '
+                             f'Geçerli alanlar: {", ".join(cls.FIELD_GETTERS)}')
+        return tuple(dict.fromkeys(['id'] + fields))
+    
+    @classmethod
+    def projection_name(cls, fields: Optional[Tuple[str, ...]]) -> Optional[str]:
+        """Alan demeti adlandırılmış bir projeksiyonsa adı (önbellek yuvası için)"""
+        if fields is None:
+            return 'detail'
+        for name, projection in cls.PROJECTIONS.items():
+            if projection == fields:
+                return name
+        return None
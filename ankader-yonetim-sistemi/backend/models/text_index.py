@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Text Index - Arama için metin normalleştirme ve trigram (n-gram) indeksi
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from typing import Dict, List, Sequence, Set, Tuple
+
+_TURKISH_UPPER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_ASCII_FOLD = str.maketrans('ıçğöşüâîû', 'icgosuaiu')
+_WORD_SEPARATORS = re.compile(r'[\s@._\-/]+')
+_TOKEN = re.compile(r'\w+')
+
+
+def turkish_casefold(text: str) -> str:
+    """Türkçe kurallarına göre küçük harfe çevir (I → ı, İ → i)"""
+    return (text or '').translate(_TURKISH_UPPER).lower()
+
+
+def search_key(text: str) -> str:
+    """Arama anahtarı: Türkçe küçük harf + aksan/nokta farkı yok sayılır (Ayşe → ayse)"""
+    return turkish_casefold(text).translate(_ASCII_FOLD).strip()
+
+
+# Türk alfabesi sırası (q, w, x yabancı adlar için araya alındı)
+_TURKISH_ORDER = 'abcçdefgğhıijklmnoöpqrsştuüvwxyz'
+_TURKISH_COLLATE = str.maketrans({
+    **{char: chr(0xE000 + rank) for rank, char in enumerate(_TURKISH_ORDER)},
+    'â': chr(0xE000 + _TURKISH_ORDER.index('a')),
+    'î': chr(0xE000 + _TURKISH_ORDER.index('i')),
+    'û': chr(0xE000 + _TURKISH_ORDER.index('u'))
+})
+
+
+def turkish_sort_key(text: str) -> str:
+    """Türkçe alfabetik sıralama anahtarı (c < ç < d, ı < i, o < ö < p, büyük/küçük harf farksız)"""
+    return turkish_casefold(text).strip().translate(_TURKISH_COLLATE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Metni normalleştirilmiş kelimelere böl"""
+    return _TOKEN.findall(search_key(text))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Metnin 3 karakterlik parçaları"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Kayıt ID'leri için trigram ters indeksi
+    
+    Her kaydın alanları normalleştirilip trigramlara bölünür. Sorgu trigramlarının
+    posting listeleri kesiştirilir, yalnızca adaylar alt dize kontrolünden geçirilir.
+    """
+    
+    # Eşleşme kalitesi (küçük olan önce)
+    EXACT, PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+    
+    def __init__(self):
+        self._fields: Dict[int, Tuple[str, ...]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._fields)
+    
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._fields
+    
+    def add(self, doc_id: int, fields: Sequence[str]):
+        """Kaydı indeksle (varsa yenisiyle değiştir)"""
+        self.remove(doc_id)
+        normalized = tuple(search_key(field) for field in fields)
+        self._fields[doc_id] = normalized
+        for gram in set().union(*(trigrams(field) for field in normalized)):
+            self._postings.setdefault(gram, set()).add(doc_id)
+    
+    def remove(self, doc_id: int):
+        """Kaydı indeksten çıkar"""
+        normalized = self._fields.pop(doc_id, None)
+        if normalized is None:
+            return
+        for gram in set().union(*(trigrams(field) for field in normalized)):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+    
+    def clear(self):
+        """İndeksi boşalt"""
+        self._fields = {}
+        self._postings = {}
+    
+    def _candidates(self, query: str):
+        """Sorgunun tüm trigramlarını içeren kayıtlar"""
+        grams = trigrams(query)
+        if not grams:
+            # 3 karakterden kısa sorgu: tüm kayıtlar aday
+            return self._fields.keys()
+        
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+    
+    def _rank(self, fields: Tuple[str, ...], query: str):
+        """En iyi eşleşen alan için (kalite, alan sırası); eşleşme yoksa None"""
+        best = None
+        for position, field in enumerate(fields):
+            if query not in field:
+                continue
+            if field == query:
+                quality = self.EXACT
+            elif field.startswith(query):
+                quality = self.PREFIX
+            elif any(word.startswith(query) for word in _WORD_SEPARATORS.split(field)):
+                quality = self.WORD_PREFIX
+            else:
+                quality = self.SUBSTRING
+            if best is None or (quality, position) < best:
+                best = (quality, position)
+        return best
+    
+    def match(self, query: str) -> List[int]:
+        """Sorguyu herhangi bir alanında içeren kayıt ID'leri (sırasız)"""
+        query = search_key(query)
+        if not query:
+            return []
+        return [
+            doc_id for doc_id in self._candidates(query)
+            if any(query in field for field in self._fields[doc_id])
+        ]
+    
+    def search(self, query: str) -> List[int]:
+        """Sorguyu içeren kayıt ID'leri, en iyi eşleşme önce"""
+        query = search_key(query)
+        if not query:
+            return []
+        
+        ranked = []
+        for doc_id in self._candidates(query):
+            rank = self._rank(self._fields[doc_id], query)
+            if rank is not None:
+                ranked.append((rank, doc_id))
+        ranked.sort()
+        return [doc_id for _, doc_id in ranked]
+
+
+class BM25Index:
+    """Alan ağırlıklı BM25 sıralamalı kelime (token) ters indeksi
+    
+    Sorgudaki her kelime, indeksteki o kelimeyle başlayan terimlerle eşleşir
+    (yazarken arama: "ist" → "istanbul"); tüm kelimeler eşleşmelidir.
+    """
+    
+    K1 = 1.2
+    B = 0.75
+    MAX_EXPANSIONS = 50  # kelime başına en fazla terim
+    
+    def __init__(self, weights: Sequence[float]):
+        self.weights = tuple(weights)
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+    
+    def __len__(self) -> int:
+        return len(self._lengths)
+    
+    def add(self, doc_id: int, fields: Sequence[str]):
+        """Kaydı indeksle (varsa yenisiyle değiştir)"""
+        self.remove(doc_id)
+        frequencies: Dict[str, float] = {}
+        length = 0.0
+        for weight, field in zip(self.weights, fields):
+            tokens = tokenize(field)
+            length += weight * len(tokens)
+            for token in tokens:
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+        
+        for term, frequency in frequencies.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            posting[doc_id] = frequency
+        
+        self._doc_terms[doc_id] = tuple(frequencies)
+        self._lengths[doc_id] = length
+        self._total_length += length
+    
+    def remove(self, doc_id: int):
+        """Kaydı indeksten çıkar"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self._postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+        self._total_length -= self._lengths.pop(doc_id)
+    
+    def clear(self):
+        """İndeksi boşalt"""
+        self._postings = {}
+        self._vocabulary = []
+        self._doc_terms = {}
+        self._lengths = {}
+        self._total_length = 0.0
+    
+    def _expand(self, token: str) -> List[str]:
+        """Kelimeyle başlayan indeks terimleri"""
+        position = bisect_left(self._vocabulary, token)
+        terms = []
+        while (position < len(self._vocabulary) and len(terms) < self.MAX_EXPANSIONS
+               and self._vocabulary[position].startswith(token)):
+            terms.append(self._vocabulary[position])
+            position += 1
+        return terms
+    
+    def scores(self, query: str) -> Dict[int, float]:
+        """Sorgunun tüm kelimeleriyle eşleşen kayıtlar ve BM25 puanları"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self._lengths:
+            return {}
+        
+        count = len(self._lengths)
+        average_length = self._total_length / count or 1.0
+        scores = None
+        for token in tokens:
+            token_scores: Dict[int, float] = {}
+            for term in self._expand(token):
+                posting = self._postings[term]
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, frequency in posting.items():
+                    norm = self.K1 * (1 - self.B + self.B * self._lengths[doc_id] / average_length)
+                    score = idf * frequency * (self.K1 + 1) / (frequency + norm)
+                    if score > token_scores.get(doc_id, 0.0):
+                        token_scores[doc_id] = score
+            
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc_id: score + token_scores[doc_id]
+                          for doc_id, score in scores.items() if doc_id in token_scores}
+            if not scores:
+                return {}
+        return scores
+    
+    @staticmethod
+    def top(scores: Dict[int, float], limit: int = None, offset: int = 0) -> List[int]:
+        """En yüksek puanlı kayıt ID'leri (eşit puanda küçük ID önce)"""
+        ranked = ((-score, doc_id) for doc_id, score in scores.items())
+        if limit is None:
+            ordered = sorted(ranked)
+        else:
+            ordered = heapq.nsmallest(offset + limit, ranked)
+        return [doc_id for _, doc_id in ordered[offset:]]
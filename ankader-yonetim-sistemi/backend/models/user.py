@@ -6,7 +6,8 @@ User Model - Kullanıcı Modeli
 
 from datetime import datetime
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
+from storage import MemoryStore, StorageConflictError, entity_state
 
 class User:
     """Kullanıcı modeli"""
@@ -125,18 +126,77 @@ class User:
 class UserManager:
     """Kullanıcı yönetimi için yardımcı sınıf"""
     
+    KIND = 'users'
+    model = User
+    
     def __init__(self):
-        # Bellekte kullanıcı verilerini tut (gerçek uygulamada veritabanı kullanılmalı)
+        # Kullanıcılar bellekte tutulur, kalıcılık self.store üzerinden sağlanır.
+        # Varsayılan ACAR kullanıcısı depo yüklendikten sonra eklenir.
         self.users = []
-        self._next_id = 1
+        self.store = MemoryStore()
         
-        # Varsayılan ACAR kullanıcısını ekle
-        self.create_default_admin()
+        # İndeksler: ID, telefon ve giriş anahtarı (normalize ad, telefon)
+        self._by_id: Dict[int, User] = {}
+        self._by_phone: Dict[str, User] = {}
+        self._by_login: Dict[Tuple[str, str], User] = {}
+        # Veri sürümü: her değişiklikte artar (önbellek anahtarları için)
+        self.data_version = 0
+    
+    @staticmethod
+    def _login_key(name: str, phone: str) -> Tuple[str, str]:
+        return (name or '').strip().lower(), (phone or '').strip()
+    
+    def _index(self, user: User):
+        """Kullanıcıyı indekslere ekle"""
+        self.data_version += 1
+        self._by_id[user.id] = user
+        self._by_phone[user.phone] = user
+        self._by_login[self._login_key(user.name, user.phone)] = user
+    
+    def _unindex(self, user: User):
+        """Kullanıcıyı ad/telefon indekslerinden çıkar (ID indeksi korunur)"""
+        self.data_version += 1
+        if self._by_phone.get(user.phone) is user:
+            del self._by_phone[user.phone]
+        login_key = self._login_key(user.name, user.phone)
+        if self._by_login.get(login_key) is user:
+            del self._by_login[login_key]
+    
+    def iter_entities(self) -> List[User]:
+        """Depo için tüm kullanıcılar"""
+        return self.users
+    
+    def restore_entities(self, users: List[User]):
+        """Depodan okunan kullanıcılarla belleği baştan doldur"""
+        self.users = list(users)
+        self._by_id, self._by_phone, self._by_login = {}, {}, {}
+        self.data_version += 1
+        for user in self.users:
+            self._index(user)
+    
+    def load_entity(self, user: User):
+        """Depodan gelen kullanıcıyı belleğe al (varsa yerine koy)"""
+        existing = self._by_id.get(user.id)
+        if existing is not None:
+            self._unindex(existing)
+            self.users[self.users.index(existing)] = user
+        else:
+            self.users.append(user)
+        self._index(user)
+    
+    def unload_entity(self, user_id: int):
+        """Depoda silinen kullanıcıyı bellekten çıkar"""
+        existing = self._by_id.pop(user_id, None)
+        if existing is not None:
+            self._unindex(existing)
+            self.users.remove(existing)
     
     def create_default_admin(self):
-        """Varsayılan ACAR kullanıcısını oluştur"""
+        """Varsayılan ACAR kullanıcısını oluştur (hiç kullanıcı yoksa)"""
+        if self.users:
+            return
+        
         admin_user = User(
-            id=self._next_id,
             name='ACAR',
             phone='05000000000',
             password='acar2024!',
@@ -146,12 +206,18 @@ class UserManager:
         
         validation = admin_user.validate()
         if validation['is_valid']:
+            try:
+                admin_user.id = self.store.insert(self.KIND, admin_user)
+            except StorageConflictError:
+                # Başka bir worker aynı anda oluşturdu
+                self.store.sync()
+                return
             self.users.append(admin_user)
-            self._next_id += 1
+            self._index(admin_user)
     
     def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Yeni kullanıcı oluştur"""
-        user_data['id'] = self._next_id
+        user_data.pop('id', None)
         user = User(**user_data)
         
         validation = user.validate()
@@ -168,8 +234,16 @@ class UserManager:
                 'errors': ['Bu telefon numarası zaten kullanılıyor']
             }
         
+        try:
+            user.id = self.store.insert(self.KIND, user)
+        except StorageConflictError as e:
+            return {
+                'success': False,
+                'errors': [str(e)]
+            }
+        
         self.users.append(user)
-        self._next_id += 1
+        self._index(user)
         
         return {
             'success': True,
@@ -178,28 +252,22 @@ class UserManager:
     
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """ID'ye göre kullanıcı bul"""
-        for user in self.users:
-            if user.id == user_id:
-                return user
-        return None
+        return self._by_id.get(user_id)
     
     def get_user_by_phone(self, phone: str) -> Optional[User]:
         """Telefon numarasına göre kullanıcı bul"""
-        for user in self.users:
-            if user.phone == phone:
-                return user
-        return None
+        return self._by_phone.get(phone)
     
     def authenticate(self, name: str, phone: str, password: str) -> Optional[User]:
         """Kullanıcı kimlik doğrulaması"""
-        for user in self.users:
-            if (user.name.lower() == name.lower() and 
-                user.phone == phone and 
-                user.password == password and 
-                user.is_active):
-                user.update_last_login()
-                return user
-        return None
+        user = self._by_login.get(self._login_key(name, phone))
+        if user is None or user.password != password or not user.is_active:
+            return None
+        
+        user.update_last_login()
+        self.data_version += 1
+        self.store.save(self.KIND, user)
+        return user
     
     def get_all_users(self) -> list:
         """Tüm kullanıcıları getir"""
@@ -214,6 +282,10 @@ class UserManager:
                 'errors': ['Kullanıcı bulunamadı']
             }
         
+        # Doğrulama başarısız olursa geri dönebilmek için önceki durum
+        previous = entity_state(user)
+        self._unindex(user)
+        
         # Güncellenebilir alanları güncelle
         updatable_fields = ['name', 'phone', 'role', 'is_active', 'permissions']
         for field in updatable_fields:
@@ -223,12 +295,29 @@ class UserManager:
         user.updated_at = datetime.now()
         
         validation = user.validate()
-        if not validation['is_valid']:
+        errors = validation['errors']
+        if not errors and self._by_phone.get(user.phone) not in (None, user):
+            errors = ['Bu telefon numarası zaten kullanılıyor']
+        if errors:
+            vars(user).update(previous)
+            self._index(user)
             return {
                 'success': False,
-                'errors': validation['errors']
+                'errors': errors
+            }
+        
+        try:
+            self.store.save(self.KIND, user)
+        except StorageConflictError as e:
+            vars(user).update(previous)
+            self._index(user)
+            return {
+                'success': False,
+                'errors': [str(e)]
             }
         
+        self._index(user)
+        
         return {
             'success': True,
             'user': user.to_dict()
@@ -251,6 +340,7 @@ class UserManager:
         
         user.is_active = False
         user.updated_at = datetime.now()
+        self.store.save(self.KIND, user)
         
         return {
             'success': True,
@@ -5,38 +5,84 @@ Admin Routes - Yönetici route'ları
 """
 
 from flask import Blueprint, request, jsonify, g
-from models import user_manager, member_manager, event_manager, activity_log_manager
-from middleware import auth_required, admin_required, acar_required, log_activity
-from datetime import datetime, timedelta
+from models import (User, Member, Event, ActivityLog, user_manager, member_manager,
+                    event_manager, enrollment_manager, activity_log_manager, rollup_manager,
+                    field_diff)
+from models.rollup import month_key, month_range
+from models.activity_log import ActivityCounters
+from middleware import (auth_required, admin_required, acar_required, log_activity, audit,
+                        VersionedCache, cache_status)
+from datetime import datetime
+import re
+from .utils import etag, json_response
 
 admin_bp = Blueprint('admin', __name__)
 
+MONTH_PATTERN = re.compile(r'^\d{4}-(0[1-9]|1[0-2])$')
+
+# Geri yüklenen yedek bölümleri: anahtar, yönetici, model (sırasıyla)
+RESTORE_TARGETS = [
+    ('users', user_manager, User),
+    ('members', member_manager, Member),
+    ('events', event_manager, Event),
+    ('activity_logs', activity_log_manager, ActivityLog)
+]
+
+# Geri yüklenen bölümlerden türeyen aylık özet metrikleri (kayıtlar üye/etkinliklerle yeniden kurulur)
+RESTORE_METRICS = {
+    'members': ['new_members', 'attendance'],
+    'events': ['new_events', 'attendance'],
+    'activity_logs': ['login_count']
+}
+
+# Yedekte ISO metni olarak tutulan tarih alanları
+BACKUP_DATETIME_FIELDS = ('date', 'join_date', 'last_login', 'created_at', 'updated_at')
+
+# Dashboard verisi, ilgili yöneticilerin veri sürümleri değişene kadar önbellekten verilir
+dashboard_cache = VersionedCache('dashboard', ttl=30)
+
+def _dashboard_version():
+    return (member_manager.data_version, event_manager.data_version,
+            enrollment_manager.data_version, activity_log_manager.data_version)
+
+def _dashboard_etag():
+    """Dashboard ETag girdisi: veri sürümleri + zamana bağlı alanlar (dakika, geçmiş etkinlik sayısı)"""
+    kinds = (member_manager.KIND, event_manager.KIND, enrollment_manager.KIND,
+             activity_log_manager.KIND)
+    return member_manager.store.state_token(*kinds) + (ActivityCounters.minute(datetime.now()),
+                                                       event_manager.count_past_events())
+
+def _build_dashboard():
+    """Dashboard verisini yöneticilerden topla"""
+    # Genel istatistikler
+    member_stats = member_manager.get_statistics()
+    event_stats = event_manager.get_statistics()
+    activity_stats = activity_log_manager.get_statistics()
+    
+    # Son aktiviteler
+    recent_activities = activity_log_manager.get_recent_logs(limit=20)
+    
+    return {
+        'overview': {
+            'total_members': member_stats['total_members'],
+            'total_events': event_stats['total_events'],
+            'upcoming_events': event_stats['upcoming_events'],
+            'total_activities': activity_stats['total_logs']
+        },
+        'member_statistics': member_stats,
+        'event_statistics': event_stats,
+        'activity_statistics': activity_stats,
+        'recent_activities': recent_activities
+    }
+
 @admin_bp.route('/dashboard', methods=['GET'])
 @auth_required
 @admin_required
+@etag(_dashboard_etag)
 def get_dashboard():
     """Admin dashboard verilerini getir"""
     try:
-        # Genel istatistikler
-        member_stats = member_manager.get_statistics()
-        event_stats = event_manager.get_statistics()
-        activity_stats = activity_log_manager.get_statistics()
-        
-        # Son aktiviteler
-        recent_activities = activity_log_manager.get_recent_logs(limit=20)
-        
-        dashboard_data = {
-            'overview': {
-                'total_members': member_stats['total_members'],
-                'total_events': event_stats['total_events'],
-                'upcoming_events': event_stats['upcoming_events'],
-                'total_activities': activity_stats['total_logs']
-            },
-            'member_statistics': member_stats,
-            'event_statistics': event_stats,
-            'activity_statistics': activity_stats,
-            'recent_activities': recent_activities
-        }
+        dashboard_data = dashboard_cache.get('dashboard', _dashboard_version(), _build_dashboard)
         
         return jsonify({
             'success': True,
@@ -92,6 +138,9 @@ def create_user():
         if not result['success']:
             return jsonify(result), 400
         
+        audit(target_id=result['user']['id'], target_type='User',
+              description=f"Yeni kullanıcı oluşturuldu: {result['user']['name']}")
+        
         return jsonify(result), 201
         
     except Exception as e:
@@ -115,11 +164,17 @@ def update_user(user_id):
                 'message': 'Geçersiz JSON'
             }), 400
         
+        user = user_manager.get_user_by_id(user_id)
+        before = user.to_dict() if user else {}
+        
         result = user_manager.update_user(user_id, data)
         
         if not result['success']:
             return jsonify(result), 400
         
+        audit(target_id=user_id, target_type='User',
+              changes=field_diff(before, result['user']))
+        
         return jsonify(result), 200
         
     except Exception as e:
@@ -137,6 +192,9 @@ def delete_user(user_id):
     try:
         result = user_manager.delete_user(user_id)
         
+        if result['success']:
+            audit(target_id=user_id, target_type='User')
+        
         return jsonify(result), 200
         
     except Exception as e:
@@ -149,29 +207,69 @@ def delete_user(user_id):
 @auth_required
 @admin_required
 def get_activity_logs():
-    """Aktivite loglarını getir"""
+    """Aktivite loglarını getir
+    
+    user_id, action, target_type + target_id, start_date ve end_date birlikte
+    kullanılabilir; sonuçlar yeniden eskiye, cursor ile sayfalanır.
+    """
     try:
-        limit = int(request.args.get('limit', 50))
-        user_id = request.args.get('user_id')
-        action = request.args.get('action')
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
-        
-        if user_id:
-            logs = activity_log_manager.get_logs_by_user(int(user_id), limit)
-        elif action:
-            logs = activity_log_manager.get_logs_by_action(action, limit)
-        elif start_date and end_date:
-            start_dt = datetime.fromisoformat(start_date)
-            end_dt = datetime.fromisoformat(end_date)
-            logs = activity_log_manager.get_logs_in_date_range(start_dt, end_dt)
-        else:
-            logs = activity_log_manager.get_recent_logs(limit)
+        # Kuyrukta bekleyen loglar da görünsün
+        activity_log_manager.flush(activity_log_manager.AUDIT_FLUSH_TIMEOUT)
+        
+        try:
+            limit = int(request.args.get('limit', 50))
+            user_id = request.args.get('user_id')
+            user_id = int(user_id) if user_id else None
+            target_id = request.args.get('target_id')
+            target_id = int(target_id) if target_id else None
+            start_date = request.args.get('start_date')
+            end_date = request.args.get('end_date')
+            start_dt = datetime.fromisoformat(start_date) if start_date else None
+            end_dt = datetime.fromisoformat(end_date) if end_date else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'Geçersiz parametre: limit, user_id ve target_id tam sayı, tarihler ISO formatında olmalıdır'
+            }), 400
+        
+        if not 1 <= limit <= activity_log_manager.MAX_QUERY_LIMIT:
+            return jsonify({
+                'success': False,
+                'message': f'limit 1 ile {activity_log_manager.MAX_QUERY_LIMIT} arasında olmalıdır'
+            }), 400
+        
+        target_type = request.args.get('target_type')
+        if (target_type is None) != (target_id is None):
+            return jsonify({
+                'success': False,
+                'message': 'target_type ve target_id birlikte verilmelidir'
+            }), 400
+        
+        if end_date and len(end_date) == 10:
+            # Yalnızca gün verildiyse günün sonuna kadar dahil
+            end_dt = datetime.combine(end_dt.date(), datetime.max.time())
+        
+        result = activity_log_manager.query_logs(
+            user_id=user_id,
+            action=request.args.get('action') or None,
+            target=(target_type, target_id) if target_type else None,
+            start=start_dt,
+            end=end_dt,
+            limit=limit,
+            cursor=request.args.get('cursor')
+        )
+        if not result['success']:
+            return jsonify({
+                'success': False,
+                'message': result['errors'][0]
+            }), 400
         
         return jsonify({
             'success': True,
-            'logs': logs,
-            'total': len(logs)
+            'logs': result['logs'],
+            'total': len(result['logs']),
+            'next_cursor': result['next_cursor'],
+            'scanned': result['scanned']
         }), 200
         
     except Exception as e:
@@ -186,8 +284,17 @@ def get_activity_logs():
 def search_activity_logs():
     """Aktivite loglarında ara"""
     try:
+        # Kuyrukta bekleyen loglar da görünsün
+        activity_log_manager.flush(activity_log_manager.AUDIT_FLUSH_TIMEOUT)
+        
         query = request.args.get('q', '').strip()
-        limit = int(request.args.get('limit', 50))
+        try:
+            limit = int(request.args.get('limit', 50))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'Geçersiz parametre: limit tam sayı olmalıdır'
+            }), 400
         
         if not query:
             return jsonify({
@@ -195,6 +302,12 @@ def search_activity_logs():
                 'message': 'Arama terimi gerekli'
             }), 400
         
+        if not 1 <= limit <= activity_log_manager.MAX_QUERY_LIMIT:
+            return jsonify({
+                'success': False,
+                'message': f'limit 1 ile {activity_log_manager.MAX_QUERY_LIMIT} arasında olmalıdır'
+            }), 400
+        
         logs = activity_log_manager.search_logs(query, limit)
         
         return jsonify({
@@ -225,11 +338,9 @@ def cleanup_activity_logs():
                 'message': 'En az 30 günlük log tutulmalıdır'
             }), 400
         
-        old_count = len(activity_log_manager.logs)
-        activity_log_manager.cleanup_logs_older_than(days)
-        new_count = len(activity_log_manager.logs)
-        
-        deleted_count = old_count - new_count
+        deleted_count = activity_log_manager.cleanup_logs_older_than(days)
+        new_count = activity_log_manager.count_logs()
+        audit(details={'days': days, 'deleted_count': deleted_count})
         
         return jsonify({
             'success': True,
@@ -262,7 +373,9 @@ def get_system_info():
             'server_time': datetime.now().isoformat(),
             'uptime': 'N/A',  # Basit backend için
             'memory_usage': 'N/A',  # Basit backend için
-            'database': 'In-Memory (Bellekte)',
+            'database': member_manager.store.name,
+            'audit_log': activity_log_manager.audit_status(),
+            'cache': cache_status(),
             'framework': 'Python Flask',
             'version': '1.0.0'
         }
@@ -274,7 +387,7 @@ def get_system_info():
             'total_members': len(member_manager.members),
             'active_members': len([m for m in member_manager.members if m.status == 'active']),
             'total_events': len(event_manager.events),
-            'total_logs': len(activity_log_manager.logs)
+            'total_logs': activity_log_manager.count_logs()
         }
         
         return jsonify({
@@ -296,28 +409,33 @@ def get_system_info():
 def create_backup():
     """Sistem yedeği oluştur (sadece ACAR)"""
     try:
-        import json
-        from datetime import datetime
+        # Kuyrukta bekleyen loglar da görünsün
+        activity_log_manager.flush(activity_log_manager.AUDIT_FLUSH_TIMEOUT)
+        
+        # Nesne listeleri (referans kopyaları); kayıtlar yanıt gönderilirken tek tek serileştirilir
+        users = list(user_manager.users)
+        members = list(member_manager.members)
+        events = list(event_manager.events)
+        logs = activity_log_manager.logs
         
-        # Tüm veriyi topla
         backup_data = {
             'backup_date': datetime.now().isoformat(),
             'version': '1.0.0',
-            'users': [user.to_dict(include_password=True) for user in user_manager.users],
-            'members': [member.to_dict() for member in member_manager.members],
-            'events': [event.to_dict() for event in event_manager.events],
-            'activity_logs': [log.to_dict() for log in activity_log_manager.logs]
+            'users': (user.to_dict(include_password=True) for user in users),
+            'members': (member.to_dict() for member in members),
+            'events': (event.to_dict() for event in events),
+            'activity_logs': (log.to_dict() for log in logs)
         }
         
-        # JSON formatında döndür (gerçek uygulamada dosyaya kaydedilir)
-        return jsonify({
+        # JSON akışı olarak döndür (gerçek uygulamada dosyaya kaydedilir)
+        return json_response({
             'success': True,
             'message': 'Yedek başarıyla oluşturuldu',
             'backup_data': backup_data,
-            'total_users': len(backup_data['users']),
-            'total_members': len(backup_data['members']),
-            'total_events': len(backup_data['events']),
-            'total_logs': len(backup_data['activity_logs'])
+            'total_users': len(users),
+            'total_members': len(members),
+            'total_events': len(events),
+            'total_logs': len(logs)
         }), 200
         
     except Exception as e:
@@ -326,6 +444,19 @@ def create_backup():
             'message': f'Sunucu hatası: {str(e)}'
         }), 500
 
+def _from_backup(model, records):
+    """Yedek kayıtlarından model nesneleri oluştur (ID'ler korunur)"""
+    entities = []
+    for record in records:
+        record = dict(record)
+        if not isinstance(record.get('id'), int):
+            raise ValueError('Kayıt ID\'si eksik')
+        for field in BACKUP_DATETIME_FIELDS:
+            if isinstance(record.get(field), str):
+                record[field] = datetime.fromisoformat(record[field])
+        entities.append(model(**record))
+    return entities
+
 @admin_bp.route('/restore', methods=['POST'])
 @auth_required
 @acar_required
@@ -343,39 +474,38 @@ def restore_backup():
         
         backup_data = data['backup_data']
         
-        # Mevcut verileri temizle
-        user_manager.users = []
-        member_manager.members = []
-        event_manager.events = []
-        activity_log_manager.logs = []
-        
-        # Kullanıcıları geri yükle
-        if 'users' in backup_data:
-            for user_data in backup_data['users']:
-                user = user_manager.User(**user_data)
-                user_manager.users.append(user)
-            user_manager._next_id = max([u.id for u in user_manager.users], default=0) + 1
-        
-        # Üyeleri geri yükle
-        if 'members' in backup_data:
-            for member_data in backup_data['members']:
-                member = member_manager.Member(**member_data)
-                member_manager.members.append(member)
-            member_manager._next_id = max([m.id for m in member_manager.members], default=0) + 1
-        
-        # Etkinlikleri geri yükle
-        if 'events' in backup_data:
-            for event_data in backup_data['events']:
-                event = event_manager.Event(**event_data)
-                event_manager.events.append(event)
-            event_manager._next_id = max([e.id for e in event_manager.events], default=0) + 1
-        
-        # Logları geri yükle
-        if 'activity_logs' in backup_data:
-            for log_data in backup_data['activity_logs']:
-                log = activity_log_manager.ActivityLog(**log_data)
-                activity_log_manager.logs.append(log)
-            activity_log_manager._next_id = max([l.id for l in activity_log_manager.logs], default=0) + 1
+        # Önce tüm kayıtları çözümle; hatalı yedekte mevcut veriye dokunulmaz
+        try:
+            restored = [
+                (manager, _from_backup(model, backup_data[key]))
+                for key, manager, model in RESTORE_TARGETS
+                if key in backup_data
+            ]
+        except (TypeError, ValueError) as e:
+            return jsonify({
+                'success': False,
+                'message': f'Geçersiz yedek verisi: {str(e)}'
+            }), 400
+        
+        # Kayıtlar yedekteki katılım listelerinden yeniden kurulur; sonradan eklenen,
+        # değişen ya da yedekte olmayan üye/etkinliklere ait kayıtlar kalmaz
+        if 'members' in backup_data or 'events' in backup_data:
+            restored.append((enrollment_manager, []))
+        
+        # Depo ve bellek indeksleri birlikte değiştirilir
+        for manager, entities in restored:
+            manager.store.replace(manager.KIND, entities)
+            manager.restore_entities(entities)
+        
+        # Yedekteki katılım listeleri kayıt deposuna alınır
+        restored_enrollments = enrollment_manager.migrate_legacy(member_manager, event_manager)
+        
+        # Aylık özetler geri yüklenen veriyle uyumlu olsun
+        metrics = sorted({metric for key, keys in RESTORE_METRICS.items() if key in backup_data
+                          for metric in keys})
+        if metrics:
+            rollup_manager.rebuild(metrics, member_manager, event_manager, enrollment_manager,
+                                   activity_log_manager)
         
         return jsonify({
             'success': True,
@@ -383,7 +513,8 @@ def restore_backup():
             'restored_users': len(user_manager.users),
             'restored_members': len(member_manager.members),
             'restored_events': len(event_manager.events),
-            'restored_logs': len(activity_log_manager.logs)
+            'restored_logs': activity_log_manager.count_logs(),
+            'restored_enrollments': restored_enrollments
         }), 200
         
     except Exception as e:
@@ -396,52 +527,51 @@ def restore_backup():
 @auth_required
 @admin_required
 def get_monthly_report():
-    """Aylık rapor"""
+    """Aylık rapor (aylık özet tablosundan)
+    
+    Parametreler: from, to (YYYY-MM, varsayılan son 12 ay), metrics (virgülle ayrılmış)
+    """
     try:
-        from collections import defaultdict
+        # Kuyrukta bekleyen giriş logları da sayılsın
+        activity_log_manager.flush(activity_log_manager.AUDIT_FLUSH_TIMEOUT)
         
-        # Son 12 ayın verisini al
         now = datetime.now()
-        monthly_data = defaultdict(lambda: {
-            'new_members': 0,
-            'new_events': 0,
-            'login_count': 0
-        })
-        
-        # Üye istatistikleri
-        for member in member_manager.members:
-            if member.join_date:
-                month_key = member.join_date.strftime('%Y-%m')
-                monthly_data[month_key]['new_members'] += 1
-        
-        # Etkinlik istatistikleri
-        for event in event_manager.events:
-            if event.created_at:
-                month_key = event.created_at.strftime('%Y-%m')
-                monthly_data[month_key]['new_events'] += 1
-        
-        # Giriş istatistikleri
-        for log in activity_log_manager.logs:
-            if log.action == 'login' and log.created_at:
-                month_key = log.created_at.strftime('%Y-%m')
-                monthly_data[month_key]['login_count'] += 1
-        
-        # Son 12 ayı formatla
-        months = []
-        for i in range(12):
-            date = now.replace(day=1) - timedelta(days=32*i)
-            month_key = date.strftime('%Y-%m')
-            months.append({
-                'month': month_key,
-                'month_name': date.strftime('%B %Y'),
-                **monthly_data[month_key]
-            })
-        
-        months.reverse()
+        end = request.args.get('to') or month_key(now)
+        start = request.args.get('from')
+        if not start:
+            year, month = divmod(now.year * 12 + now.month - 1 - 11, 12)
+            start = f'{year:04d}-{month + 1:02d}'
+        
+        for value in (start, end):
+            if not MONTH_PATTERN.match(value):
+                return jsonify({
+                    'success': False,
+                    'message': 'Geçersiz ay formatı (YYYY-AA)'
+                }), 400
+        
+        months = month_range(start, end)
+        if not months or len(months) > rollup_manager.MAX_MONTHS:
+            return jsonify({
+                'success': False,
+                'message': f'Ay aralığı 1-{rollup_manager.MAX_MONTHS} ay olmalıdır'
+            }), 400
+        
+        metrics = [m.strip() for m in request.args.get('metrics', '').split(',') if m.strip()]
+        invalid = [m for m in metrics if m not in rollup_manager.METRICS]
+        if invalid:
+            return jsonify({
+                'success': False,
+                'message': f'Geçersiz metrik. Geçerli metrikler: {", ".join(rollup_manager.METRICS)}'
+            }), 400
+        
+        report = rollup_manager.get_report(start, end, metrics)
+        for entry in report:
+            year, month = map(int, entry['month'].split('-'))
+            entry['month_name'] = datetime(year, month, 1).strftime('%B %Y')
         
         return jsonify({
             'success': True,
-            'monthly_report': months
+            'monthly_report': report
         }), 200
         
     except Exception as e:
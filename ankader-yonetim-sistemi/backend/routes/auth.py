@@ -5,8 +5,8 @@ Auth Routes - Kimlik doğrulama route'ları
 """
 
 from flask import Blueprint, request, jsonify, g
-from models import user_manager, activity_log_manager
-from middleware import auth_required, log_activity
+from models import user_manager, activity_log_manager, field_diff
+from middleware import auth_required, log_activity, audit
 import base64
 import time
 import re
@@ -60,13 +60,11 @@ def login():
         user = user_manager.authenticate(name, phone, password)
         if not user:
             # Başarısız giriş logla
-            activity_log_manager.log_activity(
+            audit(
                 user_id=0,  # Bilinmeyen kullanıcı
                 action='login_failed',
                 description=f'Başarısız giriş denemesi: {name} - {phone}',
                 details={
-                    'ip': request.remote_addr,
-                    'user_agent': request.headers.get('User-Agent', ''),
                     'name': name,
                     'phone': phone
                 }
@@ -82,11 +80,7 @@ def login():
         token = base64.b64encode(token_data.encode()).decode()
         
         # Başarılı giriş logla
-        activity_log_manager.log_login(
-            user_id=user.id,
-            ip=request.remote_addr,
-            user_agent=request.headers.get('User-Agent', '')
-        )
+        audit(user_id=user.id, action='login', description='Kullanıcı sisteme giriş yaptı')
         
         return jsonify({
             'success': True,
@@ -176,6 +170,8 @@ def change_password():
         if not update_result['success']:
             return jsonify(update_result), 400
         
+        audit(target_id=user.id, target_type='User')
+        
         return jsonify({
             'success': True,
             'message': 'Şifre başarıyla değiştirildi'
@@ -261,11 +257,6 @@ def verify_token():
 def logout():
     """Çıkış yap"""
     try:
-        user = g.user
-        
-        # Çıkış logla
-        activity_log_manager.log_logout(user.id)
-        
         return jsonify({
             'success': True,
             'message': 'Başarıyla çıkış yapıldı'
@@ -359,11 +350,15 @@ def update_profile():
             }), 400
         
         # Kullanıcıyı güncelle
+        before = user.to_dict()
         result = user_manager.update_user(user.id, update_data)
         
         if not result['success']:
             return jsonify(result), 400
         
+        audit(target_id=user.id, target_type='User',
+              changes=field_diff(before, result['user']))
+        
         return jsonify({
             'success': True,
             'message': 'Profil başarıyla güncellendi',
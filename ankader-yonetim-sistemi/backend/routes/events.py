@@ -5,41 +5,94 @@ Events Routes - Etkinlik yönetimi route'ları
 """
 
 from flask import Blueprint, request, jsonify, g
-from models import event_manager, activity_log_manager
-from middleware import auth_required, permission_required, log_activity
+from models import Event, event_manager, member_manager, enrollment_manager, field_diff
+from middleware import auth_required, permission_required, log_activity, audit
+from .utils import get_pagination_args, get_fields_arg, json_response, etag
 from datetime import datetime
 
 events_bp = Blueprint('events', __name__)
 
+def _events_version():
+    """Etkinlik listeleri ve istatistikleri için ETag girdisi
+
+    Geçmiş etkinlik sayısı, bir etkinlik başladığında is_upcoming değişimini yakalar.
+    """
+    return event_manager.store.state_token(event_manager.KIND, enrollment_manager.KIND) + (
+        event_manager.count_past_events(),)
+
+def _event_version(event_id):
+    """Tek etkinlik için ETag girdisi (etkinlik yoksa None)"""
+    event = event_manager.get_event_by_id(event_id)
+    if event is None:
+        return None
+    store = event_manager.store
+    return store.state_token() + (event.updated_at, store.entity_seq(event),
+                                  enrollment_manager.event_token(event_id), event.is_upcoming)
+
+def _parse_date_arg(name, end_of_day=False):
+    """ISO tarih parametresini yerel (timezone'suz) datetime'a çevir; yoksa None"""
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    if end_of_day and len(value) == 10:
+        # Yalnızca gün verildiyse günün sonuna kadar dahil
+        parsed = datetime.combine(parsed.date(), datetime.max.time())
+    return parsed
+
 @events_bp.route('', methods=['GET'])
 @auth_required
 @permission_required('events', 'read')
+@etag(_events_version)
 def get_events():
-    """Tüm etkinlikleri getir"""
+    """Etkinlikleri getir: status, type, from, to, upcoming/past ve search birlikte kullanılabilir"""
     try:
-        status = request.args.get('status')
-        event_type = request.args.get('type')
         upcoming = request.args.get('upcoming') == 'true'
         past = request.args.get('past') == 'true'
-        search = request.args.get('search', '').strip()
+        if upcoming and past:
+            return jsonify({
+                'success': False,
+                'message': 'upcoming ve past birlikte kullanılamaz'
+            }), 400
         
-        if search:
-            events = event_manager.search_events(search)
-        elif upcoming:
-            events = event_manager.get_upcoming_events()
-        elif past:
-            events = event_manager.get_past_events()
-        else:
-            events = event_manager.get_all_events(status)
+        try:
+            start = _parse_date_arg('from')
+            end = _parse_date_arg('to', end_of_day=True)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'from ve to ISO formatında tarih olmalıdır (ör. 2025-01-31)'
+            }), 400
         
-        # Tip filtresi
-        if event_type:
-            events = [e for e in events if e.get('type') == event_type]
+        limit, offset, error = get_pagination_args()
+        if error:
+            return error
+        
+        fields, error = get_fields_arg(Event)
+        if error:
+            return error
+        
+        found = event_manager.query_events(
+            status=request.args.get('status'),
+            event_type=request.args.get('type'),
+            start=start,
+            end=end,
+            when='upcoming' if upcoming else 'past' if past else None,
+            search=request.args.get('search', '').strip(),
+            limit=limit,
+            offset=offset,
+            as_json=True,
+            fields=fields
+        )
         
-        return jsonify({
+        return json_response({
             'success': True,
-            'events': events,
-            'total': len(events)
+            'events': found['results'],
+            'total': found['total'],
+            'limit': limit,
+            'offset': offset
         }), 200
         
     except Exception as e:
@@ -51,6 +104,7 @@ def get_events():
 @events_bp.route('/<int:event_id>', methods=['GET'])
 @auth_required
 @permission_required('events', 'read')
+@etag(_event_version)
 def get_event(event_id):
     """Belirli bir etkinliği getir"""
     try:
@@ -107,13 +161,9 @@ def create_event():
         if not result['success']:
             return jsonify(result), 400
         
-        # Aktivite logla
         event = result['event']
-        activity_log_manager.log_event_create(
-            user_id=g.user.id,
-            event_id=event['id'],
-            event_title=event['title']
-        )
+        audit(target_id=event['id'], target_type='Event',
+              description=f"Yeni etkinlik oluşturuldu: {event['title']}")
         
         return jsonify(result), 201
         
@@ -151,11 +201,17 @@ def update_event(event_id):
         # Güncelleyen kullanıcı bilgisini ekle
         data['updated_by'] = g.user.id
         
+        event = event_manager.get_event_by_id(event_id)
+        before = event.to_dict() if event else {}
+        
         result = event_manager.update_event(event_id, data)
         
         if not result['success']:
             return jsonify(result), 400
         
+        audit(target_id=event_id, target_type='Event',
+              changes=field_diff(before, result['event']))
+        
         return jsonify(result), 200
         
     except Exception as e:
@@ -180,6 +236,9 @@ def delete_event(event_id):
         
         result = event_manager.delete_event(event_id)
         
+        audit(target_id=event_id, target_type='Event',
+              description=f'Etkinlik silindi: {event.title}')
+        
         return jsonify(result), 200
         
     except Exception as e:
@@ -191,6 +250,7 @@ def delete_event(event_id):
 @events_bp.route('/statistics', methods=['GET'])
 @auth_required
 @permission_required('events', 'read')
+@etag(_events_version)
 def get_event_statistics():
     """Etkinlik istatistikleri"""
     try:
@@ -210,15 +270,26 @@ def get_event_statistics():
 @events_bp.route('/upcoming', methods=['GET'])
 @auth_required
 @permission_required('events', 'read')
+@etag(_events_version)
 def get_upcoming_events():
     """Gelecek etkinlikleri getir"""
     try:
-        events = event_manager.get_upcoming_events()
+        limit, offset, error = get_pagination_args()
+        if error:
+            return error
         
-        return jsonify({
+        fields, error = get_fields_arg(Event)
+        if error:
+            return error
+        
+        events = event_manager.get_upcoming_events(limit, offset, as_json=True, fields=fields)
+        
+        return json_response({
             'success': True,
             'events': events,
-            'total': len(events)
+            'total': event_manager.count_upcoming_events(),
+            'limit': limit,
+            'offset': offset
         }), 200
         
     except Exception as e:
@@ -230,15 +301,26 @@ def get_upcoming_events():
 @events_bp.route('/past', methods=['GET'])
 @auth_required
 @permission_required('events', 'read')
+@etag(_events_version)
 def get_past_events():
     """Geçmiş etkinlikleri getir"""
     try:
-        events = event_manager.get_past_events()
+        limit, offset, error = get_pagination_args()
+        if error:
+            return error
         
-        return jsonify({
+        fields, error = get_fields_arg(Event)
+        if error:
+            return error
+        
+        events = event_manager.get_past_events(limit, offset, as_json=True, fields=fields)
+        
+        return json_response({
             'success': True,
             'events': events,
-            'total': len(events)
+            'total': event_manager.count_past_events(),
+            'limit': limit,
+            'offset': offset
         }), 200
         
     except Exception as e:
@@ -250,6 +332,7 @@ def get_past_events():
 @events_bp.route('/<int:event_id>/participants', methods=['GET'])
 @auth_required
 @permission_required('events', 'read')
+@etag(_event_version)
 def get_event_participants(event_id):
     """Etkinlik katılımcılarını getir"""
     try:
@@ -264,9 +347,10 @@ def get_event_participants(event_id):
         return jsonify({
             'success': True,
             'event_id': event_id,
-            'participants': event.participants,
+            'participants': event.participant_list(),
             'participant_count': event.participant_count,
-            'attended_count': event.attended_count
+            'attended_count': event.attended_count,
+            'status_counts': event.count_by_status()
         }), 200
         
     except Exception as e:
@@ -289,15 +373,22 @@ def add_participant_to_event(event_id, member_id):
                 'message': 'Etkinlik bulunamadı'
             }), 404
         
+        if not member_manager.get_member_by_id(member_id):
+            return jsonify({
+                'success': False,
+                'message': 'Üye bulunamadı'
+            }), 404
+        
         data = request.get_json() or {}
         notes = data.get('notes', '')
         
-        success = event.add_participant(member_id, notes)
+        result = enrollment_manager.enroll(member_id, event_id, notes=notes,
+                                           capacity=event.max_participants)
         
-        if not success:
+        if not result['success']:
             return jsonify({
                 'success': False,
-                'message': 'Katılımcı eklenemedi (zaten kayıtlı veya kontenjan dolu)'
+                'message': result['errors'][0]
             }), 400
         
         return jsonify({
@@ -332,13 +423,12 @@ def update_participant_status(event_id, member_id):
                 'message': 'Durum bilgisi gerekli'
             }), 400
         
-        status = data['status']
-        success = event.update_participant_status(member_id, status)
+        result = enrollment_manager.update_status(member_id, event_id, data['status'])
         
-        if not success:
+        if not result['success']:
             return jsonify({
                 'success': False,
-                'message': 'Katılımcı durumu güncellenemedi'
+                'message': result['errors'][0]
             }), 400
         
         return jsonify({
@@ -366,12 +456,12 @@ def remove_participant_from_event(event_id, member_id):
                 'message': 'Etkinlik bulunamadı'
             }), 404
         
-        success = event.remove_participant(member_id)
+        result = enrollment_manager.withdraw(member_id, event_id)
         
-        if not success:
+        if not result['success']:
             return jsonify({
                 'success': False,
-                'message': 'Katılımcı bu etkinliğe kayıtlı değil'
+                'message': result['errors'][0]
             }), 400
         
         return jsonify({
@@ -424,6 +514,8 @@ def add_event_feedback(event_id):
                 'message': 'Geri bildirim eklenemedi'
             }), 400
         
+        event_manager.save_event(event)
+        
         return jsonify({
             'success': True,
             'message': 'Geri bildirim başarıyla eklendi'
@@ -438,6 +530,7 @@ def add_event_feedback(event_id):
 @events_bp.route('/<int:event_id>/feedback', methods=['GET'])
 @auth_required
 @permission_required('events', 'read')
+@etag(_event_version)
 def get_event_feedback(event_id):
     """Etkinlik geri bildirimlerini getir"""
     try:
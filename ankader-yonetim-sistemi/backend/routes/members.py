@@ -5,28 +5,60 @@ Members Routes - Üye yönetimi route'ları
 """
 
 from flask import Blueprint, request, jsonify, g
-from models import member_manager, activity_log_manager
-from middleware import auth_required, permission_required, log_activity
+from models import Member, member_manager, event_manager, enrollment_manager, field_diff
+from middleware import auth_required, permission_required, log_activity, audit
+from .utils import get_pagination_args, get_fields_arg, json_response, etag
 
 members_bp = Blueprint('members', __name__)
 
+def _members_version():
+    """Üye listeleri ve istatistikleri için ETag girdisi"""
+    return member_manager.store.state_token(member_manager.KIND, enrollment_manager.KIND)
+
+def _member_version(member_id):
+    """Tek üye için ETag girdisi (üye yoksa None)"""
+    member = member_manager.get_member_by_id(member_id)
+    if member is None:
+        return None
+    store = member_manager.store
+    return store.state_token() + (member.updated_at, store.entity_seq(member),
+                                  enrollment_manager.member_token(member_id))
+
 @members_bp.route('', methods=['GET'])
 @auth_required
 @permission_required('members', 'read')
+@etag(_members_version)
 def get_members():
     """Tüm üyeleri getir"""
     try:
         status = request.args.get('status', 'active')
         search = request.args.get('search', '').strip()
+        fields, error = get_fields_arg(Member)
+        if error:
+            return error
         
         if search:
-            members = member_manager.search_members(search)
-        else:
-            members = member_manager.get_all_members(status)
-        
-        return jsonify({
+            limit, offset, error = get_pagination_args()
+            if error:
+                return error
+            found = member_manager.search_members(search, limit, offset, as_json=True, fields=fields)
+            return json_response({
+                'success': True,
+                'members': found['results'],
+                'total': found['total'],
+                'limit': limit,
+                'offset': offset
+            }), 200
+        
+        if any(arg in request.args for arg in ('sort', 'limit', 'cursor')):
+            return _get_members_page(status, fields)
+        
+        # Üyeler yanıt gönderilirken tek tek serileştirilir
+        members = member_manager.get_members_by_status(status)
+        
+        return json_response({
             'success': True,
-            'members': members,
+            'members': (member.to_json(fields) for member in members),
             'total': len(members)
         }), 200
         
@@ -36,9 +68,55 @@ def get_members():
             'message': f'Sunucu hatası: {str(e)}'
         }), 500
 
+def _get_members_page(status, fields):
+    """Sıralı, cursor ile sayfalanmış üye listesi (sort, order, limit, cursor, include_total)"""
+    sort = request.args.get('sort', 'name')
+    order = request.args.get('order', 'asc')
+    if sort not in member_manager.SORT_FIELDS:
+        return jsonify({
+            'success': False,
+            'message': f'Geçersiz sıralama. Geçerli değerler: {", ".join(member_manager.SORT_FIELDS)}'
+        }), 400
+    if order not in ('asc', 'desc'):
+        return jsonify({
+            'success': False,
+            'message': 'order asc veya desc olmalıdır'
+        }), 400
+    
+    try:
+        limit = int(request.args.get('limit') or 50)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= member_manager.MAX_PAGE_SIZE:
+        return jsonify({
+            'success': False,
+            'message': f'limit 1 ile {member_manager.MAX_PAGE_SIZE} arasında olmalıdır'
+        }), 400
+    
+    page = member_manager.get_members_page(status, sort, order, limit,
+                                           request.args.get('cursor'), as_json=True, fields=fields)
+    if not page['success']:
+        return jsonify({
+            'success': False,
+            'message': page['errors'][0]
+        }), 400
+    
+    payload = {
+        'success': True,
+        'members': page['results'],
+        'next_cursor': page['next_cursor'],
+        'sort': sort,
+        'order': order,
+        'limit': limit
+    }
+    if request.args.get('include_total', '').lower() in ('1', 'true'):
+        payload['total'] = page['total']
+    return json_response(payload), 200
+
 @members_bp.route('/<int:member_id>', methods=['GET'])
 @auth_required
 @permission_required('members', 'read')
+@etag(_member_version)
 def get_member(member_id):
     """Belirli bir üyeyi getir"""
     try:
@@ -84,13 +162,9 @@ def create_member():
         if not result['success']:
             return jsonify(result), 400
         
-        # Aktivite logla
         member = result['member']
-        activity_log_manager.log_member_create(
-            user_id=g.user.id,
-            member_id=member['id'],
-            member_name=member['name']
-        )
+        audit(target_id=member['id'], target_type='Member',
+              description=f"Yeni üye oluşturuldu: {member['name']}")
         
         return jsonify(result), 201
         
@@ -118,11 +192,17 @@ def update_member(member_id):
         # Güncelleyen kullanıcı bilgisini ekle
         data['updated_by'] = g.user.id
         
+        member = member_manager.get_member_by_id(member_id)
+        before = member.to_dict() if member else {}
+        
         result = member_manager.update_member(member_id, data)
         
         if not result['success']:
             return jsonify(result), 400
         
+        audit(target_id=member_id, target_type='Member',
+              changes=field_diff(before, result['member']))
+        
         return jsonify(result), 200
         
     except Exception as e:
@@ -147,6 +227,9 @@ def delete_member(member_id):
         
         result = member_manager.delete_member(member_id)
         
+        audit(target_id=member_id, target_type='Member',
+              description=f'Üye silindi: {member.name}')
+        
         return jsonify(result), 200
         
     except Exception as e:
@@ -158,6 +241,7 @@ def delete_member(member_id):
 @members_bp.route('/statistics', methods=['GET'])
 @auth_required
 @permission_required('members', 'read')
+@etag(_members_version)
 def get_member_statistics():
     """Üye istatistikleri"""
     try:
@@ -177,6 +261,7 @@ def get_member_statistics():
 @members_bp.route('/search', methods=['GET'])
 @auth_required
 @permission_required('members', 'read')
+@etag(_members_version)
 def search_members():
     """Üye ara"""
     try:
@@ -188,12 +273,22 @@ def search_members():
                 'message': 'Arama terimi gerekli'
             }), 400
         
-        results = member_manager.search_members(query)
+        limit, offset, error = get_pagination_args()
+        if error:
+            return error
         
-        return jsonify({
+        fields, error = get_fields_arg(Member)
+        if error:
+            return error
+        
+        found = member_manager.search_members(query, limit, offset, as_json=True, fields=fields)
+        
+        return json_response({
             'success': True,
-            'results': results,
-            'total': len(results)
+            'results': found['results'],
+            'total': found['total'],
+            'limit': limit,
+            'offset': offset
         }), 200
         
     except Exception as e:
@@ -205,6 +300,7 @@ def search_members():
 @members_bp.route('/<int:member_id>/events', methods=['GET'])
 @auth_required
 @permission_required('members', 'read')
+@etag(_member_version)
 def get_member_events(member_id):
     """Üyenin etkinliklerini getir"""
     try:
@@ -219,7 +315,7 @@ def get_member_events(member_id):
         return jsonify({
             'success': True,
             'member_id': member_id,
-            'events': member.events,
+            'events': member.event_list(),
             'event_count': member.event_count,
             'attended_count': member.attended_event_count
         }), 200
@@ -244,15 +340,23 @@ def add_member_to_event(member_id, event_id):
                 'message': 'Üye bulunamadı'
             }), 404
         
+        event = event_manager.get_event_by_id(event_id)
+        if not event:
+            return jsonify({
+                'success': False,
+                'message': 'Etkinlik bulunamadı'
+            }), 404
+        
         data = request.get_json() or {}
         status = data.get('status', 'registered')
         
-        success = member.add_event(event_id, status)
+        result = enrollment_manager.enroll(member_id, event_id, status=status,
+                                           capacity=event.max_participants)
         
-        if not success:
+        if not result['success']:
             return jsonify({
                 'success': False,
-                'message': 'Üye zaten bu etkinliğe kayıtlı'
+                'message': result['errors'][0]
             }), 400
         
         return jsonify({
@@ -287,13 +391,12 @@ def update_member_event_status(member_id, event_id):
                 'message': 'Durum bilgisi gerekli'
             }), 400
         
-        status = data['status']
-        success = member.update_event_status(event_id, status)
+        result = enrollment_manager.update_status(member_id, event_id, data['status'])
         
-        if not success:
+        if not result['success']:
             return jsonify({
                 'success': False,
-                'message': 'Etkinlik durumu güncellenemedi'
+                'message': result['errors'][0]
             }), 400
         
         return jsonify({
@@ -321,12 +424,12 @@ def remove_member_from_event(member_id, event_id):
                 'message': 'Üye bulunamadı'
             }), 404
         
-        success = member.remove_event(event_id)
+        result = enrollment_manager.withdraw(member_id, event_id)
         
-        if not success:
+        if not result['success']:
             return jsonify({
                 'success': False,
-                'message': 'Üye bu etkinliğe kayıtlı değil'
+                'message': result['errors'][0]
             }), 400
         
         return jsonify({
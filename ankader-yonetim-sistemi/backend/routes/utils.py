@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Route Utils - Route'lar için ortak yardımcılar
+"""
+
+import hashlib
+import logging
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from flask import current_app, make_response, request, jsonify
+from models.serialization import encode_json
+
+logger = logging.getLogger(__name__)
+
+def get_pagination_args():
+    """limit/offset parametrelerini oku: (limit, offset, hata_yanıtı)"""
+    try:
+        limit = request.args.get('limit')
+        limit = int(limit) if limit not in (None, '') else None
+        offset = int(request.args.get('offset', 0) or 0)
+    except ValueError:
+        limit, offset = -1, -1
+    
+    if (limit is not None and limit < 0) or offset < 0:
+        return None, None, (jsonify({
+            'success': False,
+            'message': 'limit ve offset negatif olmayan tam sayı olmalıdır'
+        }), 400)
+    
+    return limit, offset, None
+
+def get_fields_arg(model):
+    """fields parametresini (summary, detail veya alan listesi) oku: (alanlar, hata_yanıtı)"""
+    try:
+        return model.resolve_fields(request.args.get('fields')), None
+    except ValueError as e:
+        return None, (jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400)
+
+# Akış yanıtlarında bir seferde gönderilen yaklaşık parça boyutu
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def _encode_stream(value: Any) -> Iterator[bytes]:
+    """Değeri JSON parçaları olarak üret: sözlükler alan alan, listeler/generator'lar öğe öğe
+    
+    Önceden kodlanmış (bytes) öğeler olduğu gibi eklenir; diğer öğeler tek tek kodlanır.
+    """
+    if isinstance(value, dict):
+        yield b'{'
+        for position, (key, item) in enumerate(value.items()):
+            yield (b',' if position else b'') + encode_json(key) + b':'
+            yield from _encode_stream(item)
+        yield b'}'
+    elif isinstance(value, (list, tuple, Iterator)):
+        yield b'['
+        for position, item in enumerate(value):
+            encoded = item if isinstance(item, bytes) else encode_json(item)
+            yield b',' + encoded if position else encoded
+        yield b']'
+    else:
+        yield encode_json(value)
+
+def _chunks(parts: Iterator[bytes]) -> Iterator[bytes]:
+    """Küçük parçaları yaklaşık STREAM_CHUNK_SIZE boyutunda birleştir"""
+    chunk, size = [], 0
+    for part in parts:
+        chunk.append(part)
+        size += len(part)
+        if size >= STREAM_CHUNK_SIZE:
+            yield b''.join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield b''.join(chunk)
+
+def json_response(payload: Dict[str, Any]):
+    """JSON yanıtını akış olarak oluştur: zarf, ardından liste öğeleri tek tek
+    
+    Liste endpoint'leri nesnelerin önbellekli JSON'unu (to_json) verir, böylece
+    değişmeyen nesneler her istekte yeniden serileştirilmez. Liste yerine
+    generator verilirse öğeler gönderilirken üretilir; yanıtın tamamı hiçbir
+    zaman bellekte birleştirilmez (bellek kullanımı sonuç boyutundan bağımsızdır).
+    Üretim istek bağlamı dışında sürer, öğeler request/g kullanmamalıdır.
+    
+    Hatalar: ilk parça burada üretilir, bu sırada oluşan hata route'un
+    try/except'ine düşer ve normal 500 yanıtı döner (çoğu yanıt tek parçadır).
+    Sonraki parçalarda oluşan hata, durum kodu gönderildiği için 500'e
+    çevrilemez; loglanıp yeniden fırlatılır ve sunucu bağlantıyı keser.
+    İstemci yarım kalmış gövdeyi geçerli bir 200 yanıtı olarak almaz.
+    """
+    chunks = _chunks(_encode_stream(payload))
+    first = next(chunks, b'')
+    
+    def generate():
+        yield first
+        try:
+            yield from chunks
+        except Exception:
+            logger.exception('JSON akışı yarıda kesildi')
+            raise
+    
+    return current_app.response_class(generate(), mimetype='application/json')
+
+
+def make_etag(*parts) -> str:
+    """Sürüm bilgilerinden güçlü ETag değeri üret (gövde serileştirilmeden)"""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def etag(version: Callable[..., Optional[Tuple]]):
+    """Koşullu GET: ETag, yanıtı belirleyen sürüm bilgilerinden hesaplanır
+    
+    `version` route'un argümanlarıyla çağrılır ve yanıtı belirleyen değerleri
+    (yönetici/nesne sürümleri, zamana bağlı konumlar) döndürür; None dönerse
+    (ör. kayıt yok) route olduğu gibi çalışır. If-None-Match eşleşirse route
+    çalıştırılmadan 304 döner.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            parts = version(*args, **kwargs)
+            if parts is None:
+                return f(*args, **kwargs)
+            
+            tag = make_etag(request.path, request.query_string, *parts)
+            if request.if_none_match.contains(tag):
+                response = current_app.response_class(status=304)
+                response.set_etag(tag)
+                return response
+            
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(tag)
+            return response
+        
+        return decorated_function
+    return decorator
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Storage Package - Kalıcı depolama katmanı
+"""
+
+import os
+
+from .base import MemoryStore, StorageConflictError, entity_state
+from .sqlite_store import SQLiteStore
+from .journal_store import JournalStore
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, 'ankader.db')
+DEFAULT_JOURNAL_DIR = os.path.join(DATA_DIR, 'journal')
+
+
+def create_store():
+    """Ortam değişkenlerine göre depo oluştur
+
+    ANKADER_STORAGE: memory (varsayılan), sqlite veya journal
+    ANKADER_DB_PATH: SQLite dosya yolu
+    ANKADER_JOURNAL_DIR: günlük ve anlık görüntü dizini
+    ANKADER_SNAPSHOT_INTERVAL: anlık görüntü aralığı (saniye)
+    ANKADER_JOURNAL_FSYNC: 1 ise her kayıttan sonra fsync
+    """
+    backend = os.environ.get('ANKADER_STORAGE', 'memory').lower()
+
+    if backend == 'sqlite':
+        return SQLiteStore(os.environ.get('ANKADER_DB_PATH', DEFAULT_DB_PATH))
+    if backend == 'journal':
+        return JournalStore(
+            os.environ.get('ANKADER_JOURNAL_DIR', DEFAULT_JOURNAL_DIR),
+            snapshot_interval=int(os.environ.get('ANKADER_SNAPSHOT_INTERVAL', 300)),
+            fsync=os.environ.get('ANKADER_JOURNAL_FSYNC') == '1'
+        )
+    if backend == 'memory':
+        return MemoryStore()
+
+    raise ValueError(f'Bilinmeyen depolama türü: {backend}')
+
+
+__all__ = [
+    'MemoryStore', 'SQLiteStore', 'JournalStore', 'StorageConflictError',
+    'entity_state', 'create_store'
+]
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Storage Base - Depolama arayüzü ve kayıt kodlayıcı
+"""
+
+import json
+import os
+from datetime import datetime, date
+from typing import Dict, Any, Iterable
+
+
+class StorageConflictError(Exception):
+    """Depo benzersizlik kısıtı ihlal edildi"""
+
+
+def entity_state(entity) -> Dict[str, Any]:
+    """Nesnenin kalıcı alanlarını döndür (alt çizgili alanlar hariç)"""
+    return {key: value for key, value in vars(entity).items() if not key.startswith('_')}
+
+
+def _encode_default(value):
+    """JSON'un tanımadığı tarih tiplerini etiketle"""
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'$d': value.isoformat()}
+    raise TypeError(f'{type(value).__name__} JSON ile kodlanamaz')
+
+
+def _decode_hook(obj: Dict[str, Any]):
+    """Etiketli tarih değerlerini geri çevir"""
+    if len(obj) == 1:
+        if '$dt' in obj:
+            return datetime.fromisoformat(obj['$dt'])
+        if '$d' in obj:
+            return date.fromisoformat(obj['$d'])
+    return obj
+
+
+def encode_entity(entity) -> str:
+    """Nesneyi kompakt JSON kaydına çevir"""
+    return json.dumps(
+        entity_state(entity),
+        default=_encode_default,
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+
+
+def encode_value(value) -> str:
+    """Tek bir alan değerini JSON'a çevir (kayıt içindeki kodlamayla aynı)"""
+    return json.dumps(value, default=_encode_default, ensure_ascii=False)
+
+
+def decode_entity(model, data: str, entity_id: int = None):
+    """JSON kaydından nesneyi yeniden oluştur"""
+    state = json.loads(data, object_hook=_decode_hook)
+    if entity_id is not None:
+        state['id'] = entity_id
+    return model(**state)
+
+
+class MemoryStore:
+    """Bellek içi depo - kalıcılık yok, yalnızca ID üretir"""
+
+    name = 'memory'
+
+    def __init__(self):
+        self.managers = {}
+        self._next_ids = {}
+        self._seqs = {}
+        # Süreç başına rastgele değer: yeniden başlatmada sayaçlar sıfırlansa da ETag'ler çakışmaz
+        self.boot_id = os.urandom(8).hex()
+        self.recovery = {
+            'duration_ms': 0.0,
+            'records': 0
+        }
+
+    def attach(self, *managers) -> None:
+        """Yöneticileri depoya bağla"""
+        for manager in managers:
+            manager.store = self
+            self.managers[manager.KIND] = manager
+
+    def recover(self) -> None:
+        """Kalıcı durumu belleğe yükle (bellek deposunda yapılacak bir şey yok)"""
+        for kind, manager in self.managers.items():
+            self._next_ids[kind] = max((e.id for e in manager.iter_entities()), default=0) + 1
+
+    def _stamp(self, kind: str, entity) -> None:
+        """Kayda türün bir sonraki seq değerini işle (bellekte; kalıcı alan değildir)"""
+        seq = self._seqs.get(kind, 0) + 1
+        self._seqs[kind] = seq
+        entity._seq = seq
+
+    def entity_seq(self, entity) -> int:
+        """Kaydın son yazıldığı seq (ETag girdisi; yüklendiğinden beri yazılmadıysa 0)
+
+        Bellek ve günlük depolarında seq süreç başınadır; state_token() ile birlikte kullanılır.
+        """
+        return getattr(entity, '_seq', 0)
+
+    def insert(self, kind: str, entity) -> int:
+        """Yeni kaydı ekle ve atanan ID'yi döndür"""
+        entity_id = self._next_ids.get(kind, 1)
+        self._next_ids[kind] = entity_id + 1
+        self._stamp(kind, entity)
+        return entity_id
+
+    def insert_many(self, kind: str, entities: Iterable) -> None:
+        """Birden fazla kaydı tek seferde ekle (ID'ler nesnelere yazılır)"""
+        for entity in entities:
+            entity.id = self.insert(kind, entity)
+
+    def save(self, kind: str, entity) -> None:
+        """Var olan kaydı güncelle"""
+        self._stamp(kind, entity)
+
+    def replace(self, kind: str, entities: Iterable) -> None:
+        """Türün tüm kayıtlarını verilenlerle değiştir (ID'ler korunur; yedekten geri yükleme)"""
+        last_id = 0
+        for entity in entities:
+            last_id = max(last_id, entity.id)
+            self._stamp(kind, entity)
+        self._next_ids[kind] = max(self._next_ids.get(kind, 1), last_id + 1)
+
+    def increment(self, kind: str, entity, field: str, delta, **changes):
+        """Sayısal alanı delta kadar artır ve yeni değeri döndür
+
+        changes: artışla birlikte yazılacak diğer alanlar
+        """
+        for key, value in changes.items():
+            setattr(entity, key, value)
+        setattr(entity, field, getattr(entity, field) + delta)
+        self.save(kind, entity)
+        return getattr(entity, field)
+
+    def find(self, kind: str, **match):
+        """Depoda alan = değer eşleşen kaydı döndür (bellek deposunda bellek esastır)"""
+        return None
+
+    def delete(self, kind: str, entity_id: int) -> None:
+        """Kaydı sil"""
+
+    def purge_before(self, kind: str, cutoff: datetime, **match) -> None:
+        """Belirtilen tarihten eski kayıtları sil (match: alan = değer filtresi)"""
+
+    def sync(self) -> None:
+        """Diğer worker'ların yaptığı değişiklikleri belleğe al"""
+
+    def state_token(self, *kinds: str) -> tuple:
+        """Verilen türlerin mevcut durumunu temsil eden değerler (ETag girdisi)"""
+        return (self.boot_id,) + tuple(self.managers[kind].data_version for kind in kinds)
+
+    def close(self) -> None:
+        """Depoyu kapat"""
+
+    def status(self) -> Dict[str, Any]:
+        """Depo durum bilgisi"""
+        return {
+            'backend': self.name,
+            'recovery': self.recovery
+        }
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal Store - Bellek içi yöneticiler için değişiklik günlüğü ve anlık görüntü
+
+Her create/update/delete işlemi, nesnenin tam durumunu içeren bir kayıt olarak
+günlüğe (journal) eklenir. Arka plandaki iş parçacığı belirli aralıklarla
+sıkıştırılmış bir anlık görüntü (snapshot) alır ve eski günlükleri siler.
+Açılışta en son anlık görüntü yüklenir, ardından günlüğün kalanı oynatılır.
+
+Günlük dosyası tek bir süreç tarafından yazılmalıdır (gunicorn -w 1 --threads N);
+dizin açılışta kilitlenir ve ikinci bir süreç başlatılmaz.
+"""
+
+import logging
+import os
+import pickle
+import re
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Tuple
+
+from .base import MemoryStore, entity_state
+
+try:
+    import fcntl
+except ImportError:  # Windows: dizin kilidi yok
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FRAME_HEADER = struct.Struct('<II')  # uzunluk, crc32
+SNAPSHOT_MAGIC = b'ANKSNAP1'
+FILE_PATTERN = re.compile(r'^(journal|snapshot)-(\d{8})\.(log|bin)$')
+LOCK_FILE = '.lock'
+
+
+class JournalStore(MemoryStore):
+    """Günlük + anlık görüntü tabanlı kalıcı depo"""
+
+    name = 'journal'
+
+    def __init__(self, directory: str, snapshot_interval: int = 300,
+                 snapshot_threshold: int = 50000, fsync: bool = False):
+        super().__init__()
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_threshold = snapshot_threshold
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._file = None
+        self._lock_file = None
+        self._pid = None
+        self._generation = 0
+        self._records_since_snapshot = 0
+        self._last_snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Dosya yardımcıları
+
+    def _path(self, prefix: str, generation: int) -> str:
+        extension = 'log' if prefix == 'journal' else 'bin'
+        return os.path.join(self.directory, f'{prefix}-{generation:08d}.{extension}')
+
+    def _list_generations(self, prefix: str) -> List[int]:
+        """Dizindeki günlük veya anlık görüntü nesillerini sıralı döndür"""
+        generations = []
+        for filename in os.listdir(self.directory):
+            match = FILE_PATTERN.match(filename)
+            if match and match.group(1) == prefix:
+                generations.append(int(match.group(2)))
+        return sorted(generations)
+
+    @staticmethod
+    def _read_frames(path: str) -> Iterable[Tuple]:
+        """Günlük kayıtlarını oku; yarım kalmış son kayıtta dur"""
+        with open(path, 'rb') as f:
+            while True:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    return
+                length, checksum = FRAME_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                yield pickle.loads(payload)
+
+    def _acquire_directory(self) -> None:
+        """Dizini bu süreç için kilitle; başka bir süreç tutuyorsa başlatmayı reddet"""
+        self._lock_file = open(os.path.join(self.directory, LOCK_FILE), 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock_file.close()
+                self._lock_file = None
+                raise RuntimeError(
+                    f'Günlük dizini başka bir süreç tarafından kullanılıyor: {self.directory}. '
+                    'Günlük deposu tek yazıcı ister (gunicorn -w 1 --threads N) '
+                    'veya çok worker için ANKADER_STORAGE=sqlite kullanın.')
+        self._pid = os.getpid()
+
+    def _open_journal(self, generation: int):
+        """Yeni nesil günlük dosyasını aç"""
+        if self._file is not None:
+            self._file.close()
+        self._generation = generation
+        self._file = open(self._path('journal', generation), 'ab', buffering=0)
+
+    def _append(self, record: Tuple) -> None:
+        """Günlüğe tek kayıt ekle"""
+        self._append_many([record])
+    
+    def _append_many(self, records: List[Tuple]) -> None:
+        """Kayıtları tek yazma ve tek fsync ile ekle (group commit)"""
+        frames = []
+        for record in records:
+            payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+            frames.append(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        with self._lock:
+            if self._pid != os.getpid():
+                # Kilit fork ile devralınır (ör. gunicorn --preload); yalnızca açan süreç yazar
+                raise RuntimeError('Günlük deposu yalnızca açıldığı süreçten yazılabilir')
+            self._file.write(b''.join(frames))
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._records_since_snapshot += len(records)
+
+    # Depo arayüzü
+
+    def insert(self, kind: str, entity) -> int:
+        """Yeni kaydı günlüğe ekle"""
+        with self._lock:
+            entity_id = super().insert(kind, entity)
+            state = entity_state(entity)
+            state['id'] = entity_id
+            self._append(('put', kind, state))
+        return entity_id
+
+    def insert_many(self, kind: str, entities: Iterable) -> None:
+        """Birden fazla kaydı tek günlük yazmasıyla ekle"""
+        records = []
+        with self._lock:
+            for entity in entities:
+                entity.id = super().insert(kind, entity)
+                records.append(('put', kind, entity_state(entity)))
+            if records:
+                self._append_many(records)
+    
+    def save(self, kind: str, entity) -> None:
+        """Güncel durumu günlüğe ekle"""
+        with self._lock:
+            self._stamp(kind, entity)
+            self._append(('put', kind, entity_state(entity)))
+
+    def replace(self, kind: str, entities: Iterable) -> None:
+        """Temizlemeyi ve yeni kayıtları tek günlük yazmasıyla ekle"""
+        entities = list(entities)
+        with self._lock:
+            super().replace(kind, entities)
+            self._append_many([('clear', kind)] + [('put', kind, entity_state(e)) for e in entities])
+
+    def delete(self, kind: str, entity_id: int) -> None:
+        """Silmeyi günlüğe ekle"""
+        self._append(('del', kind, entity_id))
+
+    def purge_before(self, kind: str, cutoff: datetime, **match) -> None:
+        """Toplu silmeyi günlüğe ekle"""
+        self._append(('purge', kind, cutoff, match))
+
+    def recover(self) -> None:
+        """Son anlık görüntüyü yükle ve günlüğün kalanını oynat"""
+        started = time.perf_counter()
+        os.makedirs(self.directory, exist_ok=True)
+        self._acquire_directory()
+
+        states = {kind: {} for kind in self.managers}
+        next_ids = {}
+        snapshot_generation = 0
+        snapshots = self._list_generations('snapshot')
+        if snapshots:
+            snapshot_generation = snapshots[-1]
+            with open(self._path('snapshot', snapshot_generation), 'rb') as f:
+                if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                    raise ValueError('Geçersiz anlık görüntü dosyası')
+                snapshot = pickle.loads(zlib.decompress(f.read()))
+            for kind, kind_states in snapshot['kinds'].items():
+                if kind in states:
+                    states[kind] = {state['id']: state for state in kind_states}
+            next_ids.update(snapshot['next_ids'])
+            self._last_snapshot = snapshot['created_at']
+
+        # Anlık görüntü, bir önceki neslin günlüğü kapanırken alınır;
+        # o nesilden itibaren tüm günlükler üzerine oynatılır (kayıtlar idempotent).
+        replayed = 0
+        journals = [g for g in self._list_generations('journal') if g >= snapshot_generation - 1]
+        for generation in journals:
+            for record in self._read_frames(self._path('journal', generation)):
+                self._apply(states, record)
+                replayed += 1
+                if record[0] == 'put':
+                    next_ids[record[1]] = max(next_ids.get(record[1], 1), record[2]['id'] + 1)
+
+        records = 0
+        for kind, manager in self.managers.items():
+            kind_states = states[kind]
+            manager.restore_entities([manager.model(**kind_states[i]) for i in sorted(kind_states)])
+            records += len(kind_states)
+
+        # Silinen kayıtların ID'leri yeniden kullanılmasın
+        super().recover()
+        for kind, next_id in next_ids.items():
+            self._next_ids[kind] = max(self._next_ids.get(kind, 1), next_id)
+
+        existing = journals + snapshots
+        self._open_journal(max(existing, default=0) + 1)
+        self._records_since_snapshot = replayed
+
+        self.recovery = {
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            'records': records,
+            'snapshot_generation': snapshot_generation,
+            'replayed_journal_records': replayed
+        }
+        self._start_snapshotter()
+
+    @staticmethod
+    def _apply(states: Dict[str, Dict[int, Dict[str, Any]]], record: Tuple) -> None:
+        """Günlük kaydını durum sözlüğüne uygula"""
+        op, kind = record[0], record[1]
+        if kind not in states:
+            return
+        if op == 'put':
+            states[kind][record[2]['id']] = record[2]
+        elif op == 'del':
+            states[kind].pop(record[2], None)
+        elif op == 'clear':
+            states[kind] = {}
+        elif op == 'purge':
+            cutoff = record[2]
+            match = record[3] if len(record) > 3 else {}
+            states[kind] = {
+                i: s for i, s in states[kind].items()
+                if not s.get('created_at') or s['created_at'] >= cutoff
+                or any(s.get(key) != value for key, value in match.items())
+            }
+
+    # Anlık görüntü
+
+    def snapshot(self) -> None:
+        """Anlık görüntü al ve eski dosyaları sil"""
+        with self._lock:
+            generation = self._generation + 1
+            self._open_journal(generation)
+            self._records_since_snapshot = 0
+            kinds = {
+                kind: [entity_state(entity) for entity in list(manager.iter_entities())]
+                for kind, manager in self.managers.items()
+            }
+            next_ids = dict(self._next_ids)
+
+        created_at = datetime.now()
+        data = pickle.dumps({'created_at': created_at, 'next_ids': next_ids, 'kinds': kinds},
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._path('snapshot', generation)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(zlib.compress(data, 1))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        self._last_snapshot = created_at
+
+        # Yeni anlık görüntü bir önceki günlükle birlikte yeterli
+        for old in self._list_generations('snapshot'):
+            if old < generation:
+                os.remove(self._path('snapshot', old))
+        for old in self._list_generations('journal'):
+            if old < generation - 1:
+                os.remove(self._path('journal', old))
+
+    def _snapshot_loop(self) -> None:
+        """Arka planda periyodik anlık görüntü al"""
+        last_run = time.monotonic()
+        while not self._stop.wait(min(5, self.snapshot_interval)):
+            pending = self._records_since_snapshot
+            due = time.monotonic() - last_run >= self.snapshot_interval
+            if pending >= self.snapshot_threshold or (pending and due):
+                try:
+                    self.snapshot()
+                except Exception:
+                    logger.exception('Anlık görüntü alınamadı')
+                last_run = time.monotonic()
+
+    def _start_snapshotter(self) -> None:
+        if self._thread is None and self.snapshot_interval > 0:
+            self._thread = threading.Thread(
+                target=self._snapshot_loop, name='journal-snapshot', daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Arka plan iş parçacığını durdur ve günlüğü kapat"""
+        self._stop.set()
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def status(self) -> Dict[str, Any]:
+        """Depo durum bilgisi"""
+        info = super().status()
+        info.update({
+            'directory': self.directory,
+            'generation': self._generation,
+            'journal_records_since_snapshot': self._records_since_snapshot,
+            'last_snapshot': self._last_snapshot.isoformat() if self._last_snapshot else None
+        })
+        return info
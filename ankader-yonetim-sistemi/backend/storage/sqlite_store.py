@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite Store - WAL modunda kalıcı depo
+
+Her gunicorn worker'ı kendi bağlantısını açar ve verinin tamamını bellekte
+tutar. Yazma işlemleri aynı anda SQLite'a işlenir; diğer worker'ların
+değişiklikleri her istek başında `sync()` ile belleğe alınır.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Iterable
+
+from .base import MemoryStore, StorageConflictError, encode_entity, encode_value, decode_entity
+
+
+class SQLiteStore(MemoryStore):
+    """SQLite (WAL) tabanlı kalıcı depo"""
+
+    name = 'sqlite'
+
+    # Tablo başına sorgulanabilir (indeksli) kolonlar
+    TABLES = {
+        'users': ('phone', 'is_active'),
+        'members': ('email', 'phone', 'status', 'join_date'),
+        'events': ('date', 'status', 'type'),
+        'activity_logs': ('user_id', 'action', 'target_type', 'target_id', 'created_at'),
+        'enrollments': ('member_id', 'event_id', 'status'),
+        'monthly_rollups': ('month', 'metric')
+    }
+
+    INDEXES = [
+        'CREATE UNIQUE INDEX IF NOT EXISTS ux_users_phone ON users(phone) WHERE deleted = 0',
+        'CREATE UNIQUE INDEX IF NOT EXISTS ux_members_email ON members(email) '
+        "WHERE deleted = 0 AND status = 'active'",
+        'CREATE UNIQUE INDEX IF NOT EXISTS ux_members_phone ON members(phone) '
+        "WHERE deleted = 0 AND status = 'active'",
+        'CREATE INDEX IF NOT EXISTS ix_members_status ON members(status)',
+        'CREATE INDEX IF NOT EXISTS ix_members_join_date ON members(join_date)',
+        'CREATE INDEX IF NOT EXISTS ix_events_date ON events(date)',
+        'CREATE INDEX IF NOT EXISTS ix_events_status ON events(status)',
+        'CREATE INDEX IF NOT EXISTS ix_activity_logs_user ON activity_logs(user_id, created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_activity_logs_action ON activity_logs(action, created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_activity_logs_target '
+        'ON activity_logs(target_type, target_id)',
+        'CREATE INDEX IF NOT EXISTS ix_activity_logs_created ON activity_logs(created_at)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS ux_enrollments_pair '
+        'ON enrollments(member_id, event_id) WHERE deleted = 0',
+        'CREATE INDEX IF NOT EXISTS ix_enrollments_event ON enrollments(event_id, status)',
+        'CREATE UNIQUE INDEX IF NOT EXISTS ux_monthly_rollups_key '
+        'ON monthly_rollups(month, metric) WHERE deleted = 0'
+    ]
+
+    # Veritabanı dosyasına özgü kimlik (dosya yeniden oluşturulursa seq'ler sıfırdan başlar),
+    # tür başına artan seq sayacı ve kalıcı silmelerin (purge) izleri
+    META = [
+        'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)',
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('instance_id', lower(hex(randomblob(8))))",
+        'CREATE TABLE IF NOT EXISTS seqs ('
+        'kind TEXT PRIMARY KEY, value INTEGER NOT NULL, pruned INTEGER NOT NULL DEFAULT 0)',
+        'CREATE TABLE IF NOT EXISTS tombstones ('
+        'kind TEXT NOT NULL, seq INTEGER NOT NULL, id INTEGER NOT NULL, created_at TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS ix_tombstones_kind_seq ON tombstones(kind, seq)'
+    ]
+
+    # Purge izleri bu süreden sonra silinir; daha eski bir seq'te kalmış worker türü baştan yükler
+    TOMBSTONE_TTL = timedelta(days=7)
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._data_version = None
+        self.instance_id = None
+        self._last_seq = {kind: 0 for kind in self.TABLES}
+        self._own_seqs = {kind: set() for kind in self.TABLES}
+        self._sql = {kind: self._build_sql(kind, columns) for kind, columns in self.TABLES.items()}
+
+    @staticmethod
+    def _build_sql(kind: str, columns: tuple) -> Dict[str, str]:
+        """Tablo için sabit (önbelleğe alınan) SQL cümlelerini hazırla"""
+        column_list = ', '.join(columns)
+        placeholders = ', '.join('?' for _ in columns)
+        assignments = ', '.join(f'{c} = excluded.{c}' for c in columns)
+        return {
+            'create': (
+                f'CREATE TABLE IF NOT EXISTS {kind} ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'seq INTEGER NOT NULL, '
+                'deleted INTEGER NOT NULL DEFAULT 0, '
+                + ''.join(f'{c}, ' for c in columns) +
+                'data TEXT NOT NULL)'
+            ),
+            'seq_index': f'CREATE INDEX IF NOT EXISTS ix_{kind}_seq ON {kind}(seq)',
+            'init_seq': (
+                f"INSERT OR IGNORE INTO seqs (kind, value) "
+                f"SELECT '{kind}', COALESCE(MAX(seq), 0) FROM {kind}"
+            ),
+            # Satır silinse de geri gitmeyen sayaç (MAX(seq) purge sonrası küçülebilir)
+            'next_seq': f"UPDATE seqs SET value = value + ? WHERE kind = '{kind}' RETURNING value",
+            'max_seq': f"SELECT value, pruned FROM seqs WHERE kind = '{kind}'",
+            'insert': (
+                f'INSERT INTO {kind} (seq, {column_list}, data) '
+                f'VALUES (?, {placeholders}, ?)'
+            ),
+            'upsert': (
+                f'INSERT INTO {kind} (id, seq, {column_list}, data) '
+                f'VALUES (?, ?, {placeholders}, ?) '
+                f'ON CONFLICT(id) DO UPDATE SET seq = excluded.seq, deleted = 0, '
+                f'{assignments}, data = excluded.data'
+            ),
+            'delete': f'UPDATE {kind} SET seq = ?, deleted = 1 WHERE id = ?',
+            'clear': f'UPDATE {kind} SET seq = ?, deleted = 1 WHERE deleted = 0',
+            'purge': f'DELETE FROM {kind} WHERE created_at < ?',
+            'tombstone': (
+                f"INSERT INTO tombstones (kind, seq, id, created_at) "
+                f"SELECT '{kind}', ?, id, ? FROM {kind} WHERE created_at < ?"
+            ),
+            'prune': (
+                f"UPDATE seqs SET pruned = MAX(pruned, (SELECT COALESCE(MAX(seq), 0) FROM tombstones "
+                f"WHERE kind = '{kind}' AND created_at < ?)) WHERE kind = '{kind}'"
+            ),
+            'prune_delete': f"DELETE FROM tombstones WHERE kind = '{kind}' AND created_at < ?",
+            'load': f'SELECT id, seq, data FROM {kind} WHERE deleted = 0 ORDER BY id',
+            # Satır değişiklikleri ve purge izleri seq sırasıyla
+            'changes': (
+                f'SELECT id, seq, deleted, data FROM {kind} WHERE seq > ? '
+                f"UNION ALL SELECT id, seq, 1, NULL FROM tombstones WHERE kind = '{kind}' AND seq > ? "
+                'ORDER BY seq'
+            )
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        """Worker (process) başına tek bağlantı"""
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            # WAL modunda NORMAL, süreç çökmelerinde veri kaybı yaşatmaz
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=5000')
+
+            for sql in self._sql.values():
+                conn.execute(sql['create'])
+                conn.execute(sql['seq_index'])
+            for statement in self.INDEXES + self.META:
+                conn.execute(statement)
+            for sql in self._sql.values():
+                conn.execute(sql['init_seq'])
+            self.instance_id = conn.execute(
+                "SELECT value FROM meta WHERE key = 'instance_id'").fetchone()[0]
+
+            self._conn = conn
+            self._pid = os.getpid()
+            self._data_version = None
+        return self._conn
+
+    @staticmethod
+    def _column_value(value):
+        """Kolon değerini SQLite tipine çevir"""
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    def _row(self, kind: str, entity) -> list:
+        """Nesneden indeksli kolonları ve veri alanını çıkar"""
+        values = [self._column_value(getattr(entity, c, None)) for c in self.TABLES[kind]]
+        values.append(encode_entity(entity))
+        return values
+
+    def _write(self, kind: str, statements: list, entities: list = None) -> list:
+        """Yazma işlemlerini tek transaction içinde çalıştır
+
+        statements: (sql_key, params_fn) ikilileri; params_fn seq alır.
+        entities: cümlelerle aynı sırada yazılan nesneler (yoksa None); commit sonrası
+        her birine cümlesinin seq'i işlenir.
+        RETURNING içeren cümleler için ilk satır, diğerleri için satır ID'si döner.
+        """
+        sql = self._sql[kind]
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                last = conn.execute(sql['next_seq'], (len(statements),)).fetchone()[0]
+                first_seq = seq = last - len(statements) + 1
+                row_ids = []
+                for key, params in statements:
+                    cursor = conn.execute(sql[key], params(seq))
+                    row_ids.append(cursor.fetchone() if cursor.description else cursor.lastrowid)
+                    seq += 1
+                conn.execute('COMMIT')
+            except sqlite3.IntegrityError as e:
+                conn.execute('ROLLBACK')
+                raise StorageConflictError(f'Kayıt benzersizlik kısıtını ihlal ediyor: {e}')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            self._own_seqs[kind].update(range(first_seq, seq))
+            for offset, entity in enumerate(entities or ()):
+                if entity is not None:
+                    entity._seq = first_seq + offset
+        return row_ids
+
+    def insert(self, kind: str, entity) -> int:
+        """Yeni kaydı ekle, SQLite'ın atadığı ID'yi döndür"""
+        row = self._row(kind, entity)
+        return self._write(kind, [('insert', lambda seq: [seq] + row)], [entity])[0]
+
+    def insert_many(self, kind: str, entities: Iterable) -> None:
+        """Birden fazla kaydı tek transaction ile ekle"""
+        entities = list(entities)
+        if not entities:
+            return
+        rows = [self._row(kind, entity) for entity in entities]
+        statements = [('insert', lambda seq, row=row: [seq] + row) for row in rows]
+        for entity, row_id in zip(entities, self._write(kind, statements, entities)):
+            entity.id = row_id
+
+    def save(self, kind: str, entity) -> None:
+        """Var olan kaydı güncelle"""
+        row = self._row(kind, entity)
+        self._write(kind, [('upsert', lambda seq: [entity.id, seq] + row)], [entity])
+
+    def replace(self, kind: str, entities: Iterable) -> None:
+        """Tüm kayıtları silindi işaretle ve verilenleri ID'leriyle tek transaction'da yaz"""
+        entities = list(entities)
+        rows = [(entity.id, self._row(kind, entity)) for entity in entities]
+        statements = [('clear', lambda seq: [seq])]
+        statements += [('upsert', lambda seq, entity_id=entity_id, row=row: [entity_id, seq] + row)
+                       for entity_id, row in rows]
+        self._write(kind, statements, [None] + entities)
+
+    def increment(self, kind: str, entity, field: str, delta, **changes):
+        """Alanı tek UPDATE ile artır ve depodaki yeni değeri döndür
+
+        Okuma-değiştirme-yazma yapılmadığı için diğer worker'ların aynı satıra
+        yaptığı artışlar kaybolmaz. İndeksli kolonlar bu yolla artırılamaz.
+        """
+        if field in self.TABLES[kind] or set(changes) & set(self.TABLES[kind]):
+            raise ValueError('İndeksli kolonlar increment ile güncellenemez')
+        key = f'increment:{len(changes)}'
+        sql = self._sql[kind]
+        if key not in sql:
+            sql[key] = (
+                f'UPDATE {kind} SET seq = ?, data = json_set(data, '
+                "?, COALESCE(json_extract(data, ?), 0) + ?"
+                + ''.join(', ?, json(?)' for _ in changes) +
+                ') WHERE id = ? AND deleted = 0 RETURNING json_extract(data, ?)'
+            )
+        path = f'$.{field}'
+        params = [path, path, delta]
+        for name, value in changes.items():
+            params += [f'$.{name}', encode_value(value)]
+        row = self._write(kind, [(key, lambda seq: [seq] + params + [entity.id, path])], [entity])[0]
+        if row is None:
+            raise StorageConflictError(f'Artırılacak kayıt bulunamadı: {kind}#{entity.id}')
+
+        for name, value in changes.items():
+            setattr(entity, name, value)
+        setattr(entity, field, row[0])
+        return row[0]
+
+    def find(self, kind: str, **match):
+        """İndeksli kolonlarla eşleşen (silinmemiş) ilk kaydı depodan oku"""
+        unknown = set(match) - set(self.TABLES[kind])
+        if unknown:
+            raise ValueError(f'İndekslenmemiş kolon ile arama yapılamaz: {", ".join(sorted(unknown))}')
+        sql = (f'SELECT id, seq, data FROM {kind} WHERE deleted = 0'
+               + ''.join(f' AND {column} = ?' for column in match) + ' ORDER BY id LIMIT 1')
+        with self._lock:
+            row = self._connection().execute(
+                sql, [self._column_value(v) for v in match.values()]).fetchone()
+        if row is None:
+            return None
+        entity = decode_entity(self.managers[kind].model, row[2], row[0])
+        entity._seq = row[1]
+        return entity
+
+    def delete(self, kind: str, entity_id: int) -> None:
+        """Kaydı sil (diğer worker'lar görebilsin diye iz bırakılır)"""
+        self._write(kind, [('delete', lambda seq: [seq, entity_id])])
+
+    def purge_before(self, kind: str, cutoff: datetime, **match) -> None:
+        """Belirtilen tarihten eski kayıtları kalıcı olarak sil
+
+        Silinen ID'ler aynı transaction'da bir seq ile izlenir; diğer worker'lar
+        sync() sırasında bu izlerden kayıtları bellekten çıkarır. Süresi dolan izler
+        de burada temizlenir.
+        """
+        unknown = set(match) - set(self.TABLES[kind])
+        if unknown:
+            raise ValueError(f'İndekslenmemiş kolon ile silme yapılamaz: {", ".join(sorted(unknown))}')
+        sql = self._sql[kind]
+        condition = ''.join(f' AND {column} = ?' for column in match)
+        key = f'purge:{",".join(match)}'
+        if key not in sql:
+            sql[key] = sql['purge'] + condition
+            sql['tombstone:' + key] = sql['tombstone'] + condition
+
+        now = datetime.now()
+        params = [cutoff.isoformat()] + [self._column_value(v) for v in match.values()]
+        expired = [(now - self.TOMBSTONE_TTL).isoformat()]
+        self._write(kind, [
+            ('tombstone:' + key, lambda seq: [seq, now.isoformat()] + params),
+            (key, lambda seq: params),
+            ('prune', lambda seq: expired),
+            ('prune_delete', lambda seq: expired)
+        ])
+
+    def _load_kind(self, conn: sqlite3.Connection, kind: str, manager) -> int:
+        """Türün tüm kayıtlarını belleğe yükle (transaction çağıranda)"""
+        sql = self._sql[kind]
+        entities = []
+        for entity_id, seq, data in conn.execute(sql['load']):
+            entity = decode_entity(manager.model, data, entity_id)
+            entity._seq = seq
+            entities.append(entity)
+        manager.restore_entities(entities)
+        self._last_seq[kind] = conn.execute(sql['max_seq']).fetchone()[0]
+        self._own_seqs[kind].clear()
+        return len(entities)
+
+    def recover(self) -> None:
+        """Tüm tabloları belleğe yükle"""
+        started = time.perf_counter()
+        records = 0
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN')
+            try:
+                for kind, manager in self.managers.items():
+                    records += self._load_kind(conn, kind, manager)
+            finally:
+                conn.execute('COMMIT')
+            self._data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+
+        self.recovery = {
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            'records': records
+        }
+
+    def sync(self) -> None:
+        """Diğer worker'ların değişikliklerini belleğe uygula"""
+        with self._lock:
+            conn = self._connection()
+            version = conn.execute('PRAGMA data_version').fetchone()[0]
+
+            if version == self._data_version:
+                # Son kontrolden beri yalnızca bu worker yazdı
+                for kind, seqs in self._own_seqs.items():
+                    if seqs:
+                        self._last_seq[kind] = max(self._last_seq[kind], max(seqs))
+                        seqs.clear()
+                return
+
+            self._data_version = version
+            conn.execute('BEGIN')
+            try:
+                for kind, manager in self.managers.items():
+                    self._sync_kind(conn, kind, manager)
+            finally:
+                conn.execute('COMMIT')
+
+    def _sync_kind(self, conn: sqlite3.Connection, kind: str, manager) -> None:
+        """Türün son seq'ten sonraki değişikliklerini uygula"""
+        sql = self._sql[kind]
+        own = self._own_seqs[kind]
+        last_seq = self._last_seq[kind]
+        if last_seq < conn.execute(sql['max_seq']).fetchone()[1]:
+            # Görülmemiş purge izleri temizlenmiş; fark uygulanamaz
+            self._load_kind(conn, kind, manager)
+            return
+
+        for entity_id, seq, deleted, data in conn.execute(sql['changes'], (last_seq, last_seq)):
+            last_seq = seq
+            if seq in own:
+                continue
+            if deleted:
+                manager.unload_entity(entity_id)
+            else:
+                entity = decode_entity(manager.model, data, entity_id)
+                entity._seq = seq
+                manager.load_entity(entity)
+        self._last_seq[kind] = max(last_seq, max(own, default=0))
+        own.clear()
+
+    def state_token(self, *kinds: str) -> tuple:
+        """Türlerin son seq değerleri: kalıcıdır ve aynı durumu gören worker'larda aynıdır"""
+        with self._lock:
+            if self.instance_id is None:
+                self._connection()
+            return (self.instance_id,) + tuple(
+                max(self._last_seq[kind], max(self._own_seqs[kind], default=0)) for kind in kinds)
+
+    def close(self) -> None:
+        """Bağlantıyı kapat"""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def status(self) -> Dict[str, Any]:
+        """Depo durum bilgisi"""
+        info = super().status()
+        info.update({
+            'path': self.path,
+            'journal_mode': 'wal'
+        })
+        return info
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Activity Log Tests - Asenkron yazıcı ve log sorguları
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta
+from unittest import mock
+
+from app import app
+from models import activity_log_manager
+from models.activity_log import ActivityLog, ActivityLogManager, LogIndex
+from storage import SQLiteStore
+from tests.test_etag import auth_headers
+
+
+class AsyncWriterTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.manager = ActivityLogManager()
+        self.manager.start_writer()
+    
+    def tearDown(self):
+        self.manager.stop_writer()
+    
+    def test_failed_batch_falls_back_to_single_writes(self):
+        insert_many = self.manager.store.insert_many
+        calls = []
+        
+        def flaky(kind, entities):
+            entities = list(entities)
+            calls.append(len(entities))
+            if len(calls) == 1:
+                raise RuntimeError('disk dolu')
+            insert_many(kind, entities)
+        
+        with mock.patch.object(self.manager.store, 'insert_many', side_effect=flaky), \
+                self.assertLogs('models.activity_log', 'WARNING') as logs:
+            for index in range(3):
+                self.manager.log_activity(1, 'member_update', f'log {index}')
+            self.assertTrue(self.manager.flush(timeout=5))
+        self.assertIn('disk dolu', logs.output[0])
+        
+        self.assertEqual(self.manager.count_logs(), 3)
+        self.assertEqual(self.manager.audit_stats['failed'], 0)
+    
+    def test_flush_timeout_does_not_block(self):
+        release = threading.Event()
+        write_batch = self.manager._write_batch
+        
+        def slow(batch):
+            release.wait(5)
+            return write_batch(batch)
+        
+        with mock.patch.object(self.manager, '_write_batch', side_effect=slow):
+            self.manager.log_activity(1, 'member_update', 'yavaş')
+            self.assertFalse(self.manager.flush(timeout=0.05))
+            release.set()
+            self.assertTrue(self.manager.flush(timeout=5))
+        self.assertEqual(self.manager.count_logs(), 1)
+    
+    def test_invalid_log_rejected_before_enqueue(self):
+        self.assertFalse(self.manager.log_activity(1, 'bilinmeyen_aksiyon'))
+        self.assertTrue(self.manager.flush(timeout=5))
+        status = self.manager.audit_status()
+        self.assertEqual((status['invalid'], status['enqueued']), (1, 0))
+        self.assertEqual(self.manager.count_logs(), 0)
+    
+    def test_stats_consistent_under_concurrent_logging(self):
+        def log_many():
+            for index in range(200):
+                self.manager.log_activity(1, 'member_update', f'log {index}')
+        
+        threads = [threading.Thread(target=log_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(self.manager.flush(timeout=5))
+        
+        status = self.manager.audit_status()
+        self.assertEqual(status['enqueued'], 800)
+        self.assertEqual(status['written'], 800)
+        self.assertEqual(self.manager.count_logs(), 800)
+
+
+
+class LogQueryCursorTest(unittest.TestCase):
+    """Filtreli log sorgusunun sayfaları kaba kuvvet sonucuyla aynı olmalı"""
+    
+    ACTIONS = ['login', 'member_update', 'event_create']
+    
+    def setUp(self):
+        self.manager = ActivityLogManager()
+        base = datetime(2026, 3, 1, 12, 0)
+        for index in range(90):
+            # Aynı zaman damgalı loglar (eşitlik) ve birden fazla gün
+            created_at = base + timedelta(hours=(index // 3) * 5)
+            self.assertTrue(self.manager.create_log({
+                'user_id': index % 4,
+                'action': self.ACTIONS[index % 3],
+                'target_type': 'Member',
+                'target_id': index % 5,
+                'created_at': created_at
+            })['success'])
+    
+    def expected(self, user_id=None, action=None, target=None, start=None, end=None):
+        logs = [log for log in self.manager.logs
+                if (user_id is None or log.user_id == user_id)
+                and (action is None or log.action == action)
+                and (target is None or (log.target_type, log.target_id) == target)
+                and (start is None or log.created_at >= start)
+                and (end is None or log.created_at <= end)]
+        return [log.id for log in sorted(logs, key=lambda l: (l.created_at, l.id), reverse=True)]
+    
+    def walk(self, limit: int, max_scan: int = None, **filters) -> list:
+        ids, cursor = [], None
+        for _ in range(1000):
+            page = self.manager.query_logs(limit=limit, cursor=cursor, max_scan=max_scan, **filters)
+            self.assertTrue(page['success'])
+            ids += [log['id'] for log in page['logs']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                return ids
+        self.fail('Sayfalama bitmedi')
+    
+    def test_pages_match_brute_force(self):
+        start, end = datetime(2026, 3, 2), datetime(2026, 3, 5, 18, 0)
+        cases = [
+            {},
+            {'user_id': 1},
+            {'action': 'login'},
+            {'user_id': 2, 'action': 'member_update'},
+            {'target': ('Member', 3)},
+            {'start': start, 'end': end},
+            {'user_id': 3, 'start': start, 'end': end},
+            {'start': start},
+            {'end': end},
+            {'action': 'event_create', 'target': ('Member', 2)},
+            {'user_id': 1, 'action': 'login', 'target': ('Member', 4), 'start': start, 'end': end},
+            {'user_id': 9}
+        ]
+        for filters in cases:
+            for limit, max_scan in ((1, None), (4, None), (7, 5), (100, None)):
+                with self.subTest(filters=filters, limit=limit, max_scan=max_scan):
+                    self.assertEqual(self.walk(limit, max_scan, **filters), self.expected(**filters))
+    
+    def test_scan_bound(self):
+        # Seyrek filtre: sayfa dolmadan tarama sınırında durulur, cursor devam eder
+        page = self.manager.query_logs(user_id=1, action='login', limit=50, max_scan=4)
+        self.assertEqual(page['scanned'], 4)
+        self.assertIsNotNone(page['next_cursor'])
+    
+    def test_invalid_cursor(self):
+        self.assertFalse(self.manager.query_logs(cursor='bozuk!')['success'])
+
+
+class LogQueryRouteTest(unittest.TestCase):
+    """GET /api/admin/activity-logs filtreleri birlikte uygular"""
+    
+    def setUp(self):
+        self.client = app.test_client()
+        # Diğer testlerin loglarından ayırmak için benzersiz hedef
+        self.target_id = 10 ** 6 + len(activity_log_manager.logs)
+        base = datetime(2025, 6, 10, 9, 0)
+        for index in range(6):
+            self.assertTrue(activity_log_manager.create_log({
+                'user_id': 1 + index % 2, 'action': 'event_update', 'target_type': 'Event',
+                'target_id': self.target_id, 'created_at': base + timedelta(days=index // 2)
+            })['success'])
+    
+    def get(self, **args):
+        return self.client.get('/api/admin/activity-logs', headers=auth_headers(),
+                               query_string={'target_type': 'Event', 'target_id': self.target_id,
+                                             'action': 'event_update', **args})
+    
+    def test_combined_filters_and_paging(self):
+        response = self.get(user_id=1, start_date='2025-06-10', end_date='2025-06-11', limit=1)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        logs = data['logs']
+        # Yalnızca gün verilen bitiş tarihi günün sonunu kapsar
+        self.assertEqual([log['created_at'][:10] for log in logs], ['2025-06-11'])
+        logs += self.get(user_id=1, start_date='2025-06-10', end_date='2025-06-11',
+                         cursor=data['next_cursor']).get_json()['logs']
+        self.assertEqual([(log['user_id'], log['created_at'][:10]) for log in logs],
+                         [(1, '2025-06-11'), (1, '2025-06-10')])
+    
+    def test_invalid_arguments(self):
+        for args in ({'limit': 0}, {'user_id': 'x'}, {'start_date': '10.06.2025'},
+                     {'target_id': ''}, {'cursor': 'bozuk!'}):
+            with self.subTest(args=args):
+                self.assertEqual(self.get(**args).status_code, 400)
+
+
+class LogSearchTest(unittest.TestCase):
+    """Segment araması kaba kuvvetle aynı sırayı vermeli ve `limit`te durmalı"""
+    
+    def setUp(self):
+        base = datetime(2026, 3, 1, 8, 0)
+        descriptions = ['Üye güncellendi', 'Etkinlik oluşturuldu', 'Şifre değişti']
+        self.logs = [
+            ActivityLog(id=index + 1, user_id=1, action='member_update',
+                        description=descriptions[index % 3], target_type='member',
+                        target_id=index % 4, created_at=base + timedelta(minutes=index // 2))
+            for index in range(60)
+        ]
+        self.index = LogIndex(self.logs)
+    
+    def expected(self, query: str, limit: int = None) -> list:
+        logs = [log for log in self.index.logs
+                if query.lower() in f'{log.action} {log.description}'.lower()]
+        ids = [log.id for log in sorted(logs, key=lambda l: (l.created_at, l.id), reverse=True)]
+        return ids[:limit] if limit else ids
+    
+    def search(self, query: str, limit: int = None) -> list:
+        return [log.id for log in self.index.search(query, limit)]
+    
+    def test_matches_brute_force(self):
+        for query in ('güncel', 'oluştur', 'member', 'yok'):
+            for limit in (None, 1, 5, 100):
+                with self.subTest(query=query, limit=limit):
+                    self.assertEqual(self.search(query, limit), self.expected(query, limit))
+    
+    def test_removed_logs_leave_results(self):
+        self.search('güncel')
+        self.index.remove_before(self.logs[10].created_at)
+        self.index.remove(self.logs[20].id)
+        self.index.remove_logs([log for log in self.index.logs if log.description == 'Şifre değişti'])
+        
+        for query in ('güncel', 'oluştur', 'şifre'):
+            with self.subTest(query=query):
+                self.assertEqual(self.search(query, 7), self.expected(query, 7))
+        self.assertEqual(self.search('şifre'), [])
+        
+        self.index.add(ActivityLog(id=100, user_id=1, action='member_update',
+                                   description='Şifre değişti', created_at=datetime(2026, 3, 2)))
+        self.assertEqual(self.search('şifre'), [100])
+    
+    def test_manager_search_spans_days(self):
+        manager = ActivityLogManager()
+        base = datetime(2026, 3, 1, 9, 0)
+        for index in range(30):
+            manager.create_log({'user_id': 1, 'action': 'member_update',
+                                'description': f'ŞAHİN kaydı {index % 2}',
+                                'created_at': base + timedelta(hours=index * 7)})
+        everything = manager.search_logs('sahin', limit=0)
+        self.assertEqual([log['id'] for log in everything], list(range(30, 0, -1)))
+        self.assertEqual([log['id'] for log in manager.search_logs('şahin', limit=12)],
+                         [log['id'] for log in everything[:12]])
+        self.assertEqual([log['id'] for log in manager.search_logs('kaydı 1', limit=4)],
+                         [30, 28, 26, 24])
+        self.assertEqual(manager.search_logs('bulunmaz', limit=5), [])
+
+
+class ActivityCountersTest(unittest.TestCase):
+    """Artımlı sayaçlar ve kayan pencereler tüm logları taramakla aynı sonucu vermeli"""
+    
+    AGES = [timedelta(minutes=10), timedelta(hours=5), timedelta(hours=23), timedelta(hours=25),
+            timedelta(days=3), timedelta(days=6, hours=12), timedelta(days=8), timedelta(days=30)]
+    ACTIONS = ['login', 'member_update', 'event_create']
+    
+    def setUp(self):
+        self.manager = ActivityLogManager()
+        self.now = datetime.now().replace(second=30, microsecond=0)
+        index = 0
+        # Kullanıcı k, k log yazar: en aktif kullanıcı sırası belirli
+        for user_id in range(1, 8):
+            for _ in range(user_id):
+                self.manager.create_log({
+                    'user_id': user_id, 'action': self.ACTIONS[index % 3],
+                    'created_at': self.now - self.AGES[index % len(self.AGES)]
+                })
+                index += 1
+    
+    def expected(self) -> dict:
+        logs = self.manager.logs
+        users = Counter(log.user_id for log in logs)
+        return {
+            'total_logs': len(logs),
+            'last_24_hours': sum(log.created_at > self.now - timedelta(days=1) for log in logs),
+            'last_7_days': sum(log.created_at > self.now - timedelta(days=7) for log in logs),
+            'action_distribution': dict(Counter(log.action for log in logs)),
+            'user_activity': dict(users),
+            'top_counts': sorted(users.values(), reverse=True)[:5]
+        }
+    
+    def assertStatistics(self):
+        with mock.patch('models.activity_log.datetime') as clock:
+            clock.now.return_value = self.now
+            statistics = self.manager.get_statistics()
+        # Eşit sayılı kullanıcıların sırası belirsiz; sayılar ve çiftler doğrulanır
+        top = statistics.pop('most_active_users')
+        statistics['top_counts'] = [count for _, count in top]
+        self.assertEqual(statistics, self.expected())
+        for user_id, count in top:
+            self.assertEqual(statistics['user_activity'][user_id], count)
+    
+    def test_counters_match_brute_force(self):
+        self.assertStatistics()
+        self.assertEqual(self.manager.get_statistics()['most_active_users'][0], (7, 7))
+    
+    def test_removals_update_counters(self):
+        self.manager.set_retention({'default': 20})
+        self.assertGreater(self.manager.sweep_expired_logs(now=self.now), 0)
+        self.assertStatistics()
+        
+        for log in self.manager.get_logs_by_user(7, limit=4):
+            self.manager.unload_entity(log['id'])
+        self.manager.load_entity(ActivityLog(id=9999, user_id=1, action='login',
+                                             created_at=self.now - timedelta(minutes=1)))
+        self.assertStatistics()
+    
+    def test_restore_rebuilds_counters(self):
+        logs = self.manager.logs
+        self.manager.restore_entities(logs[::2])
+        self.assertStatistics()
+
+
+class LogRetentionTest(unittest.TestCase):
+    """Süresi dolan loglar yazma yolunda değil, temizleyicide silinir"""
+    
+    AGES = [(0, 'login'), (5, 'login'), (45, 'login'), (45, 'member_update'),
+            (100, 'member_update'), (100, 'login'), (200, 'member_update'), (400, 'login')]
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'ankader.db')
+        self.now = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        self.manager, self.store = self.open()
+        for days, action in self.AGES:
+            for hours in (-3, 0, 3):
+                self.manager.create_log({
+                    'user_id': days % 3, 'action': action,
+                    'created_at': self.now - timedelta(days=days, hours=hours)
+                })
+    
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+    
+    def open(self):
+        manager, store = ActivityLogManager(), SQLiteStore(self.path)
+        store.attach(manager)
+        store.recover()
+        return manager, store
+    
+    def expected(self, retention: dict) -> list:
+        return sorted(log.id for log in self.manager.logs if log.created_at >= self.now - timedelta(
+            days=retention.get(log.action, retention['default'])))
+    
+    def assertRemaining(self, manager, ids: list):
+        self.assertEqual(sorted(log.id for log in manager.logs), ids)
+        statistics = manager.get_statistics()
+        self.assertEqual(statistics['total_logs'], len(ids))
+        self.assertEqual(sum(statistics['action_distribution'].values()), len(ids))
+    
+    def test_create_log_does_not_sweep(self):
+        self.assertEqual(self.manager.count_logs(), len(self.AGES) * 3)
+        self.assertIsNone(self.manager.last_sweep)
+    
+    def test_action_retention_sweep(self):
+        retention = {'default': 180, 'login': 30}
+        self.manager.set_retention(retention)
+        expected = self.expected(retention)
+        removed = self.manager.sweep_expired_logs(self.now)
+        self.assertEqual(removed, len(self.AGES) * 3 - len(expected))
+        self.assertRemaining(self.manager, expected)
+        self.assertEqual(self.manager.sweep_expired_logs(self.now), 0)
+        
+        # Silinenler depodan da kalkar
+        self.store.close()
+        self.manager, self.store = self.open()
+        self.assertRemaining(self.manager, expected)
+    
+    def test_cleanup_older_than(self):
+        # 150 gün sınırına yakın log yok; sonuç saate bağlı değil
+        expected = self.expected({'default': 150})
+        self.manager.cleanup_logs_older_than(150)
+        self.assertRemaining(self.manager, expected)
+    
+    def test_sweeper_logs_failures_and_keeps_running(self):
+        calls = []
+        
+        def sweep():
+            calls.append(1)
+            if len(calls) > 1:
+                raise RuntimeError('veritabanı kilitli')
+            return 0
+        
+        with mock.patch.object(self.manager, 'sweep_expired_logs', side_effect=sweep), \
+                self.assertLogs('models.activity_log', 'ERROR') as logs:
+            self.manager.start_sweeper(interval=0.01)
+            deadline = time.monotonic() + 5
+            while len(logs.output) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.manager.stop_sweeper()
+        self.assertGreaterEqual(len(logs.output), 2)
+        self.assertIn('veritabanı kilitli', logs.output[0])
+
+
+class SearchRouteTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.client = app.test_client()
+    
+    def search(self, limit: str):
+        return self.client.get(f'/api/admin/activity-logs/search?q=login&limit={limit}',
+                               headers=auth_headers())
+    
+    def test_limit_bounds(self):
+        self.assertEqual(self.search('1').status_code, 200)
+        self.assertEqual(self.search(str(ActivityLogManager.MAX_QUERY_LIMIT)).status_code, 200)
+        for limit in ('0', '-5', str(ActivityLogManager.MAX_QUERY_LIMIT + 1), 'abc'):
+            with self.subTest(limit=limit):
+                response = self.search(limit)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.get_json()['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
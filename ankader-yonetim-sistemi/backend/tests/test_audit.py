@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Audit Tests - Her değişiklik için tek aktivite kaydı ve alan farkı
+"""
+
+import unittest
+
+from app import app
+from models import activity_log_manager, field_diff
+from tests.test_etag import auth_headers
+from tests.test_members import member_data
+
+
+class FieldDiffTest(unittest.TestCase):
+    
+    def test_changed_added_and_removed_fields(self):
+        before = {'name': 'Ali', 'phone': '1', 'notes': 'eski', 'updated_at': 1, 'password': 'a'}
+        after = {'name': 'Ali', 'phone': '2', 'city': 'Ankara', 'updated_at': 2, 'password': 'b'}
+        self.assertEqual(field_diff(before, after), {
+            'phone': ['1', '2'],
+            'notes': ['eski', None],
+            'city': [None, 'Ankara']
+        })
+        self.assertEqual(field_diff(before, dict(before)), {})
+
+
+class AuditRecordTest(unittest.TestCase):
+    """İstek başına yalnızca log_activity decorator'ı kayıt yazar"""
+    
+    def setUp(self):
+        self.client = app.test_client()
+        self.mark = self.last_id()
+    
+    @staticmethod
+    def last_id() -> int:
+        activity_log_manager.flush(5)
+        return max((log.id for log in activity_log_manager.logs), default=0)
+    
+    def new_logs(self) -> list:
+        activity_log_manager.flush(5)
+        return sorted((log for log in activity_log_manager.logs if log.id > self.mark),
+                      key=lambda log: log.id)
+    
+    def test_create_and_update_member(self):
+        response = self.client.post('/api/members', headers=auth_headers(),
+                                    json=member_data(801, phone='05358000801'))
+        self.assertEqual(response.status_code, 201)
+        member_id = response.get_json()['member']['id']
+        logs = self.new_logs()
+        self.assertEqual([(log.action, log.target_id) for log in logs],
+                         [('member_create', member_id)])
+        self.assertEqual(logs[0].details['status'], 201)
+        
+        self.mark = self.last_id()
+        response = self.client.put(f'/api/members/{member_id}', headers=auth_headers(),
+                                   json={'notes': 'güncellendi', 'department': 'Kimya'})
+        self.assertEqual(response.status_code, 200)
+        logs = self.new_logs()
+        self.assertEqual([log.action for log in logs], ['member_update'])
+        self.assertEqual(logs[0].details['changes'], {
+            'notes': ['', 'güncellendi'],
+            'department': ['Fizik', 'Kimya']
+        })
+    
+    def test_failed_request_without_audit_is_not_logged(self):
+        response = self.client.post('/api/members', headers=auth_headers(),
+                                    json={'name': 'Eksik'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.new_logs(), [])
+    
+    def test_login_outcomes(self):
+        response = self.client.post('/api/auth/login', json={
+            'name': 'ACAR', 'phone': '05000000000', 'password': 'yanlış-şifre'})
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post('/api/auth/login', json={
+            'name': 'ACAR', 'phone': '05000000000', 'password': 'acar2024!'})
+        self.assertEqual(response.status_code, 200)
+        
+        logs = self.new_logs()
+        self.assertEqual([(log.action, log.user_id) for log in logs],
+                         [('login_failed', 0), ('login', 1)])
+        self.assertEqual(logs[0].details['phone'], '05000000000')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache Tests - Sürüm anahtarlı önbellek ve tek uçuşlu yeniden hesaplama
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app import app
+from middleware.cache import VersionedCache
+from models import member_manager
+from tests.test_etag import auth_headers
+from tests.test_members import member_data
+
+
+class VersionedCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.cache = VersionedCache('test', ttl=30)
+        self.calls = 0
+    
+    def compute(self):
+        self.calls += 1
+        return self.calls
+    
+    def test_version_and_ttl(self):
+        self.assertEqual(self.cache.get('k', (1, 1), self.compute), 1)
+        self.assertEqual(self.cache.get('k', (1, 1), self.compute), 1)
+        self.assertEqual(self.cache.get('k', (1, 2), self.compute), 2)
+        
+        with mock.patch('middleware.cache.time.monotonic', return_value=10 ** 9):
+            self.assertEqual(self.cache.get('k', (1, 2), self.compute), 3)
+        self.assertEqual(self.cache.status()['hit_rate'], 0.25)
+    
+    def test_concurrent_misses_compute_once(self):
+        started, release = threading.Event(), threading.Event()
+        results = []
+        
+        def slow():
+            started.set()
+            release.wait(5)
+            return self.compute()
+        
+        def read():
+            results.append(self.cache.get('k', 1, slow))
+        
+        threads = [threading.Thread(target=read) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # Takipçiler uçuşa katılana kadar bekle
+        while self.cache.status()['coalesced'] < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual((self.calls, results), (1, [1] * 5))
+        self.assertEqual(self.cache.status()['misses'], 1)
+    
+    def test_error_is_not_cached(self):
+        with self.assertRaises(ValueError):
+            self.cache.get('k', 1, mock.Mock(side_effect=ValueError('hata')))
+        self.assertEqual(self.cache.get('k', 1, self.compute), 1)
+        self.assertEqual(self.cache.status()['errors'], 1)
+
+
+class DashboardCacheTest(unittest.TestCase):
+    """Yönetici verisi değişince dashboard yeniden hesaplanır"""
+    
+    def test_member_change_refreshes_dashboard(self):
+        client = app.test_client()
+        
+        def total_members():
+            response = client.get('/api/admin/dashboard', headers=auth_headers())
+            self.assertEqual(response.status_code, 200)
+            return response.get_json()['dashboard']['overview']['total_members']
+        
+        before = total_members()
+        self.assertEqual(total_members(), before)
+        member_manager.create_member(member_data(901, phone='05379000901', email='pano@example.com'))
+        self.assertEqual(total_members(), before + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enrollment Tests - Kayıt indeksleri, sayaçlar ve aylık özetler
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+from models.enrollment import Enrollment, EnrollmentManager
+from models.rollup import rollup_manager, month_key
+from storage import SQLiteStore
+
+
+def attendance() -> int:
+    month = month_key(datetime.now())
+    return rollup_manager.get_report(month, month, ['attendance'])[0]['attendance']
+
+
+class EnrollmentIndexTest(unittest.TestCase):
+    """Üye ve etkinlik tarafındaki indeksler ile sayaçlar hep aynı kayıtları göstermeli"""
+    
+    def setUp(self):
+        self.manager = EnrollmentManager()
+    
+    def assertConsistent(self):
+        enrollments = self.manager.iter_entities()
+        for enrollment in enrollments:
+            self.assertIs(self.manager.get_enrollment(enrollment.member_id, enrollment.event_id),
+                          enrollment)
+            self.assertIn(enrollment, self.manager.get_member_enrollments(enrollment.member_id))
+            self.assertIn(enrollment, self.manager.get_event_enrollments(enrollment.event_id))
+        for event_id in {e.event_id for e in enrollments}:
+            expected = {}
+            for enrollment in self.manager.get_event_enrollments(event_id):
+                expected[enrollment.status] = expected.get(enrollment.status, 0) + 1
+            self.assertEqual(self.manager.status_counts_for_event(event_id), expected)
+        for member_id in {e.member_id for e in enrollments}:
+            for status in ('registered', 'attended'):
+                self.assertEqual(
+                    self.manager.count_for_member(member_id, status),
+                    sum(e.status == status for e in self.manager.get_member_enrollments(member_id)))
+        self.assertEqual(self.manager.get_statistics()['total_enrollments'], len(enrollments))
+    
+    def test_enroll_status_and_withdraw(self):
+        for member_id in (1, 2, 3):
+            self.assertTrue(self.manager.enroll(member_id, 10)['success'])
+        self.assertTrue(self.manager.enroll(1, 11)['success'])
+        self.assertFalse(self.manager.enroll(1, 10)['success'])
+        self.assertEqual(self.manager.count_for_event(10), 3)
+        self.assertEqual(self.manager.count_for_member(1), 2)
+        
+        self.manager.update_status(2, 10, 'attended')
+        self.assertEqual(self.manager.count_for_event(10, 'attended'), 1)
+        self.assertConsistent()
+        
+        self.manager.withdraw(1, 10)
+        self.assertIsNone(self.manager.get_enrollment(1, 10))
+        self.assertEqual(self.manager.count_for_member(1), 1)
+        self.assertEqual([e.member_id for e in self.manager.get_event_enrollments(10)], [2, 3])
+        self.assertConsistent()
+    
+    def test_capacity(self):
+        self.assertTrue(self.manager.enroll(1, 10, capacity=1)['success'])
+        self.assertFalse(self.manager.enroll(2, 10, capacity=1)['success'])
+        self.assertEqual(self.manager.count_for_event(10), 1)
+    
+    def test_load_and_unload_from_other_workers(self):
+        self.manager.enroll(1, 10)
+        changed = Enrollment(**vars(self.manager.get_enrollment(1, 10)))
+        changed.status = 'attended'
+        self.manager.load_entity(changed)
+        self.assertEqual(self.manager.status_counts_for_event(10), {'attended': 1})
+        self.assertEqual(len(self.manager.iter_entities()), 1)
+        self.assertConsistent()
+        
+        self.manager.unload_entity(changed.id)
+        self.assertEqual(self.manager.count_for_event(10), 0)
+        self.assertEqual(self.manager.count_for_member(1), 0)
+        self.assertConsistent()
+
+
+class EnrollmentRollupTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.manager = EnrollmentManager()
+        self.before = attendance()
+    
+    def test_remove_event_reverts_attendance(self):
+        self.manager.enroll(1, 10, status='attended')
+        self.manager.enroll(2, 10, status='attended')
+        self.manager.enroll(3, 10)
+        self.assertEqual(attendance(), self.before + 2)
+        
+        self.assertEqual(self.manager.remove_event(10), 3)
+        self.assertEqual(attendance(), self.before)
+    
+    def test_withdraw_and_status_change_revert_attendance(self):
+        self.manager.enroll(1, 10)
+        self.manager.update_status(1, 10, 'attended')
+        self.assertEqual(attendance(), self.before + 1)
+        self.manager.update_status(1, 10, 'absent')
+        self.assertEqual(attendance(), self.before)
+        self.manager.update_status(1, 10, 'attended')
+        self.manager.withdraw(1, 10)
+        self.assertEqual(attendance(), self.before)
+    
+    def test_failed_save_leaves_status_and_counts(self):
+        self.manager.enroll(1, 10)
+        
+        def fail(kind, entity):
+            raise OSError('disk full')
+        self.manager.store.save = fail
+        with self.assertRaises(OSError):
+            self.manager.update_status(1, 10, 'attended')
+        
+        self.assertEqual(self.manager.get_enrollment(1, 10).status, 'registered')
+        self.assertEqual(self.manager.status_counts_for_event(10), {'registered': 1})
+        self.assertEqual(self.manager.count_for_member(1, 'attended'), 0)
+        self.assertEqual(attendance(), self.before)
+
+
+
+class LegacyMigrationTest(unittest.TestCase):
+    """İki worker aynı anda başlayıp eski kayıtları taşır"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'ankader.db')
+        self.managers, self.stores = [], []
+        for _ in range(2):
+            manager, store = EnrollmentManager(), SQLiteStore(path)
+            store.attach(manager)
+            store.recover()
+            self.managers.append(manager)
+            self.stores.append(store)
+    
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+    
+    @staticmethod
+    def legacy_managers():
+        participants = [{'member_id': 1, 'attendance_status': 'attended'}, {'member_id': 2}]
+        event = SimpleNamespace(id=10, pop_legacy_participants=lambda: list(participants))
+        events = SimpleNamespace(events=[event], save_event=lambda e: None)
+        members = SimpleNamespace(members=[])
+        return members, events
+    
+    def test_concurrent_migration_skips_existing_pairs(self):
+        first, second = self.managers
+        self.assertEqual(first.migrate_legacy(*self.legacy_managers()), 2)
+        # İkinci worker ilk worker'ın kayıtlarını henüz görmedi; çakışma atlanmalı
+        self.assertEqual(second.migrate_legacy(*self.legacy_managers()), 0)
+        self.assertEqual(second.count_for_event(10), 2)
+        self.assertEqual(second.status_counts_for_event(10), {'attended': 1, 'registered': 1})
+        
+        self.stores[1].sync()
+        self.assertEqual(second.count_for_event(10), 2)
+        self.assertEqual(len(second.iter_entities()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ETag Tests - Koşullu GET (304) ve ETag'lerin kalıcı duruma bağlılığı
+"""
+
+import base64
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from app import app
+from models import member_manager
+from models.enrollment import EnrollmentManager
+from models.member import MemberManager
+from storage import SQLiteStore
+
+
+def auth_headers():
+    token = base64.b64encode(f'1:{int(time.time())}'.encode()).decode()
+    return {'Authorization': f'Bearer {token}'}
+
+
+class ConditionalGetTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.client = app.test_client()
+        self.headers = auth_headers()
+    
+    def get(self, path, tag=None):
+        headers = dict(self.headers)
+        if tag:
+            headers['If-None-Match'] = f'"{tag}"'
+        return self.client.get(path, headers=headers)
+    
+    def test_unchanged_list_returns_304(self):
+        first = self.get('/api/members')
+        self.assertEqual(first.status_code, 200)
+        tag = first.headers['ETag'].strip('"')
+        
+        second = self.get('/api/members', tag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.get_data(), b'')
+    
+    def test_write_changes_list_tag(self):
+        tag = self.get('/api/members').headers['ETag'].strip('"')
+        response = self.client.post('/api/members', headers=self.headers, json={
+            'name': 'Etag Test', 'phone': '05329990001', 'email': 'etag@example.com',
+            'graduation_year': 2012, 'university': 'ODTÜ', 'department': 'Fizik'
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.get('/api/members', tag).status_code, 200)
+    
+    def test_member_detail_tag_follows_updates(self):
+        created = self.client.post('/api/members', headers=self.headers, json={
+            'name': 'Detay Test', 'phone': '05329990003', 'email': 'detay@example.com',
+            'graduation_year': 2012, 'university': 'ODTÜ', 'department': 'Fizik'
+        }).get_json()['member']
+        path = f"/api/members/{created['id']}"
+        tag = self.get(path).headers['ETag'].strip('"')
+        self.assertEqual(self.get(path, tag).status_code, 304)
+        
+        self.client.put(path, headers=self.headers, json={'notes': 'değişti'})
+        response = self.get(path, tag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['member']['notes'], 'değişti')
+    
+    def test_events_list_and_query_string(self):
+        tag = self.get('/api/events').headers['ETag'].strip('"')
+        self.assertEqual(self.get('/api/events', tag).status_code, 304)
+        # Sorgu parametreleri farklı yanıt üretir; aynı ETag eşleşmemeli
+        self.assertEqual(self.get('/api/events?status=planning', tag).status_code, 200)
+    
+    def test_restart_does_not_reuse_tags(self):
+        if member_manager.store.name == 'sqlite':
+            self.skipTest("SQLite ETag'leri kalıcı seq değerlerinden gelir")
+        tag = self.get('/api/members').headers['ETag'].strip('"')
+        # Yeniden başlayan süreç aynı sayaçlarla başlasa da farklı boot_id alır
+        with mock.patch.object(member_manager.store, 'boot_id', 'yeni-surec'):
+            self.assertEqual(self.get('/api/members', tag).status_code, 200)
+
+
+class SQLiteStateTokenTest(unittest.TestCase):
+    """SQLite deposunda ETag girdisi seq'lerden gelir ve worker'lar arasında aynıdır"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'ankader.db')
+        self.managers, self.stores = [], []
+        for _ in range(2):
+            manager, enrollments, store = MemberManager(), EnrollmentManager(), SQLiteStore(path)
+            store.attach(manager, enrollments)
+            store.recover()
+            self.managers.append((manager, enrollments))
+            self.stores.append(store)
+    
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+    
+    def test_workers_share_tokens(self):
+        first, second = self.stores
+        self.assertEqual(first.state_token('members'), second.state_token('members'))
+        
+        result = self.managers[0][0].create_member({
+            'name': 'Seq Test', 'phone': '05329990002', 'email': 'seq@example.com',
+            'graduation_year': 2012, 'university': 'ODTÜ', 'department': 'Fizik'
+        })
+        self.assertTrue(result['success'])
+        self.assertNotEqual(first.state_token('members'), second.state_token('members'))
+        
+        second.sync()
+        self.assertEqual(first.state_token('members'), second.state_token('members'))
+    
+    def detail_token(self, worker: int, member_id: int) -> tuple:
+        # routes/members.py _member_version ile aynı girdiler
+        members, enrollments = self.managers[worker]
+        store = self.stores[worker]
+        member = members.get_member_by_id(member_id)
+        return store.state_token() + (member.updated_at, store.entity_seq(member),
+                                      enrollments.member_token(member_id))
+    
+    def test_workers_share_detail_tokens(self):
+        (members, enrollments), (_, other_enrollments) = self.managers
+        member_id = members.create_member({
+            'name': 'Detay Test', 'phone': '05329990003', 'email': 'detay@example.com',
+            'graduation_year': 2014, 'university': 'ODTÜ', 'department': 'Kimya'
+        })['member']['id']
+        enrollments.enroll(member_id, 10)
+        self.stores[1].sync()
+        token = self.detail_token(0, member_id)
+        self.assertEqual(token, self.detail_token(1, member_id))
+        
+        # Diğer worker'daki değişiklik, senkronizasyondan sonra iki tarafta da aynı yeni ETag'i verir
+        other_enrollments.update_status(member_id, 10, 'attended')
+        self.stores[0].sync()
+        self.assertNotEqual(self.detail_token(0, member_id), token)
+        self.assertEqual(self.detail_token(0, member_id), self.detail_token(1, member_id))
+        
+        token = self.detail_token(0, member_id)
+        enrollments.withdraw(member_id, 10)
+        self.stores[1].sync()
+        self.assertNotEqual(self.detail_token(1, member_id), token)
+        self.assertEqual(self.detail_token(0, member_id), self.detail_token(1, member_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
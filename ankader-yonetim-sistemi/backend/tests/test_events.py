@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Event Tests - Etkinlik listesi ve indeksleri
+"""
+
+import itertools
+import unittest
+from datetime import datetime, timedelta
+
+from app import app
+from models import event_manager, member_manager
+from models.event import Event, EventManager
+from models.text_index import BM25Index
+from tests.test_etag import auth_headers
+from tests.test_members import member_data
+
+
+def event_data(index: int, **overrides) -> dict:
+    data = {
+        'title': f'Etkinlik {index}',
+        'description': 'Test etkinliği',
+        'date': datetime(2026, 5, 1) + timedelta(days=index),
+        'start_time': '19:00',
+        'location': 'Ankara',
+        'type': 'meeting'
+    }
+    data.update(overrides)
+    return data
+
+
+class EventPositionTest(unittest.TestCase):
+    """Liste konumları yükleme, silme ve senkronizasyondan sonra da doğru kalmalı"""
+    
+    def setUp(self):
+        self.manager = EventManager()
+        self.ids = [self.manager.create_event(event_data(index))['event']['id']
+                    for index in range(6)]
+    
+    def assertPositions(self):
+        self.assertEqual(len(self.manager._positions), len(self.manager.events))
+        for position, event in enumerate(self.manager.events):
+            self.assertEqual(self.manager._positions[event.id], position)
+    
+    def test_delete_and_unload_keep_creation_order(self):
+        self.manager.delete_event(self.ids[1])
+        self.manager.unload_entity(self.ids[4])
+        self.assertEqual([event.id for event in self.manager.events],
+                         [self.ids[0], self.ids[2], self.ids[3], self.ids[5]])
+        self.assertPositions()
+    
+    def test_load_replaces_in_place(self):
+        updated = Event(id=self.ids[2], **event_data(2, title='Güncel'))
+        self.manager.load_entity(updated)
+        self.manager.load_entity(Event(id=99, **event_data(99)))
+        
+        self.assertIs(self.manager.events[2], updated)
+        self.assertEqual(self.manager.events[-1].id, 99)
+        self.assertEqual(len(self.manager.events), 7)
+        self.assertPositions()
+
+
+class EventDateIndexTest(unittest.TestCase):
+    """Gelecek/geçmiş sorguları tarih indeksinden okunur; kaba kuvvetle aynı olmalı"""
+    
+    TYPES = ['meeting', 'social', 'educational']
+    
+    def setUp(self):
+        self.manager = EventManager()
+        now = datetime.now()
+        for index in range(20):
+            # Aynı başlangıç zamanlı etkinlikler ve tarih (saat) olarak verilen etkinlikler
+            offset = timedelta(days=(index % 10) - 5, hours=index // 10)
+            moment = now + offset if index % 4 else (now + offset).date()
+            self.manager.create_event(event_data(index, date=moment, type=self.TYPES[index % 3]))
+    
+    def expected(self, upcoming: bool, event_type: str = None) -> list:
+        now = datetime.now()
+        events = [event for event in self.manager.events
+                  if event.is_upcoming_at(now) == upcoming
+                  and (event_type is None or event.type == event_type)]
+        events.sort(key=lambda e: (e.start_datetime, e.id), reverse=not upcoming)
+        return [event.id for event in events]
+    
+    def assertMatches(self):
+        for event_type in (None, 'social'):
+            for limit, offset in ((None, 0), (3, 0), (3, 2), (50, 5)):
+                with self.subTest(type=event_type, limit=limit, offset=offset):
+                    end = offset + limit if limit else None
+                    upcoming = self.manager.get_upcoming_events(limit, offset, event_type)
+                    past = self.manager.get_past_events(limit, offset, event_type)
+                    self.assertEqual([e['id'] for e in upcoming],
+                                     self.expected(True, event_type)[offset:end])
+                    self.assertEqual([e['id'] for e in past],
+                                     self.expected(False, event_type)[offset:end])
+        self.assertEqual(self.manager.count_upcoming_events(), len(self.expected(True)))
+        self.assertEqual(self.manager.count_past_events(), len(self.expected(False)))
+    
+    def test_queries_match_brute_force(self):
+        self.assertMatches()
+    
+    def test_date_change_and_delete_move_index(self):
+        past_id = self.expected(False)[0]
+        upcoming_id = self.expected(True)[0]
+        self.assertTrue(self.manager.update_event(
+            past_id, {'date': datetime.now() + timedelta(days=30)})['success'])
+        self.manager.delete_event(upcoming_id)
+        # Geçersiz güncelleme indeksi değiştirmez
+        self.assertFalse(self.manager.update_event(self.expected(False)[0], {'date': None})['success'])
+        
+        self.assertEqual(self.expected(True)[-1], past_id)
+        self.assertNotIn(upcoming_id, self.expected(True))
+        self.assertMatches()
+
+
+class EventSearchTest(unittest.TestCase):
+    """Türkçe katlamalı, ön ek eşleşmeli BM25 araması"""
+    
+    EVENTS = [
+        ('İstanbul Buluşması', 'Kadıköy', 'Mezunlar yemeği', 'social'),
+        ('Kariyer Günü', 'ISTANBUL Kongre Merkezi', 'Şirket sunumları', 'educational'),
+        ('Yönetim Toplantısı', 'Ankara', 'Bütçe ve İstanbul gezisi planı', 'meeting'),
+        ('Çanakkale Gezisi', 'Çanakkale', 'Şehitlik ziyareti', 'social'),
+        ('Bahar Şenliği', 'Ankara', 'Açık hava konseri', 'social')
+    ]
+    
+    def setUp(self):
+        self.manager = EventManager()
+        for index, (title, location, description, event_type) in enumerate(self.EVENTS):
+            self.manager.create_event(event_data(index, title=title, location=location,
+                                                 description=description, type=event_type))
+    
+    def ids(self, query: str, **options) -> list:
+        return [e['id'] for e in self.manager.search_events(query, **options)['results']]
+    
+    def test_turkish_folding_and_prefix(self):
+        for query in ('istanbul', 'İSTANBUL', 'ıstanbul', 'ist'):
+            with self.subTest(query=query):
+                self.assertEqual(sorted(self.ids(query)), [1, 2, 3])
+        self.assertEqual(self.ids('canak'), [4])
+        self.assertEqual(self.ids('SENLIG'), [5])
+        self.assertEqual(self.ids('sehit'), [4])
+    
+    def test_all_words_must_match(self):
+        self.assertEqual(self.ids('ankara gezi'), [3])
+        self.assertEqual(self.ids('ankara kadıköy'), [])
+        self.assertEqual(self.ids(''), [])
+    
+    def test_field_weights_rank_title_first(self):
+        # Başlık (3) > yer (2) > açıklama (1)
+        self.assertEqual(self.ids('istanbul'), [1, 2, 3])
+    
+    def test_paging_type_filter_and_reindex(self):
+        found = self.manager.search_events('istanbul', limit=1, offset=1)
+        self.assertEqual((found['total'], [e['id'] for e in found['results']]), (3, [2]))
+        self.assertEqual(self.ids('istanbul', event_type='social'), [1])
+        
+        self.manager.update_event(1, {'title': 'İzmir Buluşması'})
+        self.manager.delete_event(2)
+        self.assertEqual(self.ids('istanbul'), [3])
+        self.assertEqual(self.ids('izmir'), [1])
+    
+    def test_removal_matches_fresh_index(self):
+        index, fresh = BM25Index((3.0, 1.0)), BM25Index((3.0, 1.0))
+        index.add(1, ['ankara', 'toplantı'])
+        index.add(2, ['ankara ankara', 'gezi'])
+        index.add(3, ['izmir', 'ankara gezisi'])
+        index.remove(2)
+        fresh.add(1, ['ankara', 'toplantı'])
+        fresh.add(3, ['izmir', 'ankara gezisi'])
+        self.assertEqual(index.scores('ankara'), fresh.scores('ankara'))
+        # Eşit puanda küçük ID önce
+        tie = BM25Index((1.0,))
+        for doc_id in (5, 2, 9):
+            tie.add(doc_id, ['aynı metin'])
+        self.assertEqual(BM25Index.top(tie.scores('aynı')), [2, 5, 9])
+        self.assertEqual(BM25Index.top(tie.scores('aynı'), limit=1, offset=1), [5])
+
+
+class EventQueryTest(unittest.TestCase):
+    """Birleşik sorgu, hangi indeks sürücü olursa olsun kaba kuvvetle aynı sayfaları vermeli"""
+    
+    TYPES = ['meeting', 'social', 'educational']
+    STATUSES = ['planning', 'confirmed', 'completed', 'cancelled']
+    
+    def setUp(self):
+        self.manager = EventManager()
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        for index in range(40):
+            title = 'Bahar Gezisi' if index % 5 == 0 else f'Etkinlik {index}'
+            self.manager.create_event(event_data(
+                index, title=title, date=today + timedelta(days=(index * 7) % 40 - 20),
+                type=self.TYPES[index % 3], status=self.STATUSES[index % 4]))
+        starts = sorted(event.start_datetime for event in self.manager.events)
+        self.start, self.end = starts[8], starts[30]
+    
+    def expected(self, status=None, event_type=None, start=None, end=None, when=None, search=None):
+        now = datetime.now()
+        scores = self.manager._search.scores(search) if search else None
+        events = [e for e in self.manager.events
+                  if (status is None or e.status == status)
+                  and (event_type is None or e.type == event_type)
+                  and (start is None or e.start_datetime >= start)
+                  and (end is None or e.start_datetime <= end)
+                  and (when is None or e.is_upcoming_at(now) == (when == 'upcoming'))
+                  and (scores is None or e.id in scores)]
+        if scores is not None:
+            events.sort(key=lambda e: (-scores[e.id], e.id))
+        elif start or end or when:
+            events.sort(key=lambda e: (e.start_datetime, e.id), reverse=when == 'past')
+        else:
+            events.sort(key=lambda e: e.id)
+        return [e.id for e in events]
+    
+    def test_matches_brute_force(self):
+        combinations = itertools.product(
+            (None, 'confirmed'), (None, 'social'), ((None, None), (self.start, None),
+                                                    (None, self.end), (self.start, self.end)),
+            (None, 'upcoming', 'past'), (None, 'gezi'))
+        for status, event_type, (start, end), when, search in combinations:
+            filters = dict(status=status, event_type=event_type, start=start, end=end,
+                           when=when, search=search)
+            expected = self.expected(**filters)
+            for limit, offset in ((None, 0), (2, 0), (3, 2)):
+                with self.subTest(limit=limit, offset=offset, **filters):
+                    found = self.manager.query_events(limit=limit, offset=offset, **filters)
+                    end_index = offset + limit if limit else None
+                    self.assertEqual([e['id'] for e in found['results']], expected[offset:end_index])
+                    self.assertEqual(found['total'], len(expected))
+    
+    def test_empty_filters(self):
+        self.assertEqual(self.manager.query_events(status='ongoing')['total'], 0)
+        self.assertEqual(self.manager.query_events(start=self.end, end=self.start)['results'], [])
+        self.assertEqual(self.manager.query_events(search='bulunmaz', when='past')['total'], 0)
+    
+    def test_route_rejects_invalid_arguments(self):
+        client = app.test_client()
+        for args in ({'upcoming': 'true', 'past': 'true'}, {'from': '31.01.2025'}, {'to': 'yarın'}):
+            with self.subTest(args=args):
+                response = client.get('/api/events', query_string=args, headers=auth_headers())
+                self.assertEqual(response.status_code, 400)
+        response = client.get('/api/events', headers=auth_headers(),
+                              query_string={'from': '2026-05-01', 'to': '2026-05-03', 'type': 'meeting'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all('2026-05-01' <= e['date'][:10] <= '2026-05-03'
+                            for e in response.get_json()['events']))
+
+
+class ParticipantRouteTest(unittest.TestCase):
+    """Katılımcılar etkinlik başına üye haritasında ve durum sayaçlarında tutulur"""
+    
+    def setUp(self):
+        self.client = app.test_client()
+        self.event_id = event_manager.create_event(
+            event_data(1, max_participants=2))['event']['id']
+        self.member_ids = [
+            member_manager.create_member(member_data(index, phone=f'0536{index:07d}',
+                                                     email=f'katilimci{index}@example.com'))['member']['id']
+            for index in range(self.event_id * 10, self.event_id * 10 + 3)
+        ]
+    
+    def url(self, member_id: int = None) -> str:
+        path = f'/api/events/{self.event_id}/participants'
+        return f'{path}/{member_id}' if member_id else path
+    
+    def participants(self) -> dict:
+        response = self.client.get(self.url(), headers=auth_headers())
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+    
+    def test_enroll_status_and_withdraw(self):
+        first, second, third = self.member_ids
+        for member_id in (second, first):
+            self.assertEqual(self.client.post(self.url(member_id), headers=auth_headers(),
+                                              json={'notes': 'not'}).status_code, 200)
+        # Tekrar kayıt ve dolu kontenjan reddedilir
+        self.assertEqual(self.client.post(self.url(first), headers=auth_headers(), json={}).status_code, 400)
+        response = self.client.post(self.url(third), headers=auth_headers(), json={})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('kontenjan', response.get_json()['message'])
+        
+        response = self.client.put(self.url(first), headers=auth_headers(), json={'status': 'attended'})
+        self.assertEqual(response.status_code, 200)
+        data = self.participants()
+        self.assertEqual([p['member_id'] for p in data['participants']], [second, first])
+        self.assertEqual((data['participant_count'], data['attended_count']), (2, 1))
+        self.assertEqual(data['status_counts'], {'registered': 1, 'attended': 1})
+        
+        self.assertEqual(self.client.delete(self.url(second), headers=auth_headers()).status_code, 200)
+        self.assertEqual(self.client.delete(self.url(second), headers=auth_headers()).status_code, 400)
+        data = self.participants()
+        self.assertEqual([p['member_id'] for p in data['participants']], [first])
+        self.assertEqual(data['status_counts'], {'attended': 1})
+    
+    def test_legacy_participants_shapes(self):
+        listed = Event(**event_data(1, participants=[{'member_id': 3, 'status': 'registered'}]))
+        mapped = Event(**event_data(1, participants={'3': {'member_id': 3, 'status': 'attended'}}))
+        self.assertEqual(listed.pop_legacy_participants()[0]['member_id'], 3)
+        self.assertEqual(mapped.pop_legacy_participants()[0]['status'], 'attended')
+        self.assertEqual(mapped.pop_legacy_participants(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON Response Tests - Akış yanıtlarında hata davranışı
+"""
+
+import json
+import unittest
+
+from app import app
+from routes.utils import json_response, STREAM_CHUNK_SIZE
+
+
+def items(count: int, fail_at: int = None):
+    for index in range(count):
+        if index == fail_at:
+            raise RuntimeError('serileştirme hatası')
+        yield {'id': index, 'payload': 'x' * 1000}
+
+
+class JsonResponseTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.context = app.app_context()
+        self.context.push()
+    
+    def tearDown(self):
+        self.context.pop()
+    
+    def test_streams_valid_json(self):
+        count = 3 * STREAM_CHUNK_SIZE // 1000
+        response = json_response({'success': True, 'results': items(count)})
+        body = json.loads(response.get_data())
+        self.assertEqual(len(body['results']), count)
+    
+    def test_error_in_first_chunk_reaches_route(self):
+        # İlk parçadaki hata json_response çağrısında fırlar; route 500 döndürebilir
+        with self.assertRaises(RuntimeError):
+            json_response({'success': True, 'results': items(10, fail_at=5)})
+    
+    def test_error_after_first_chunk_aborts_stream(self):
+        response = json_response({'success': True, 'results': items(500, fail_at=200)})
+        self.assertEqual(response.status_code, 200)
+        # Yarım gövde tamamlanmış gibi verilmez; akış hata ile kesilir
+        with self.assertRaises(RuntimeError), self.assertLogs('routes.utils', 'ERROR'):
+            response.get_data()
+
+
+if __name__ == '__main__':
+    unittest.main()
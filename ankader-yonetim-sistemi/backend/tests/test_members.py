@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Member Tests - Üye yöneticisi indeks değişmezleri
+"""
+
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta
+from unittest import mock
+
+from app import app
+from models import member_manager
+from models.member import Member, MemberManager
+from models.serialization import decode_cursor, encode_cursor
+from models.text_index import search_key, turkish_sort_key
+from tests.test_etag import auth_headers
+
+
+def member_data(index: int, **overrides):
+    data = {
+        'name': f'Üye {index}',
+        'phone': f'0532{index:07d}',
+        'email': f'uye{index}@example.com',
+        'graduation_year': 2010,
+        'university': 'ODTÜ',
+        'department': 'Fizik'
+    }
+    data.update(overrides)
+    return data
+
+
+class MemberIndexTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.manager = MemberManager()
+        for index in range(1, 4):
+            self.assertTrue(self.manager.create_member(member_data(index))['success'])
+    
+    def assertIndexed(self, member_id: int):
+        """Üye arama, istatistik, benzersizlik ve sıralı indekslerde görünmeli"""
+        member = self.manager.get_member_by_id(member_id)
+        self.assertIn(member_id, [m['id'] for m in self.manager.search_members(member.name)['results']])
+        self.assertIs(self.manager.get_member_by_email(member.email), member)
+        self.assertIs(self.manager.get_member_by_phone(member.phone), member)
+        self.assertEqual(self.manager.get_statistics()['total_members'], 3)
+        page = self.manager.get_members_page(sort='graduation_year', limit=10)
+        self.assertIn(member_id, [m['id'] for m in page['results']])
+    
+    def test_invalid_graduation_year_is_rejected_and_member_stays_indexed(self):
+        result = self.manager.update_member(1, {'graduation_year': 'abc'})
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(self.manager.get_member_by_id(1).graduation_year, 2010)
+        self.assertIndexed(1)
+    
+    def test_unexpected_error_restores_member(self):
+        with mock.patch.object(self.manager.store, 'save', side_effect=RuntimeError('disk')):
+            with self.assertRaises(RuntimeError):
+                self.manager.update_member(1, {'name': 'Yeni Ad', 'graduation_year': 2012})
+        
+        member = self.manager.get_member_by_id(1)
+        self.assertEqual((member.name, member.graduation_year), ('Üye 1', 2010))
+        self.assertIndexed(1)
+    
+    def test_uniqueness_conflict_keeps_both_members(self):
+        result = self.manager.update_member(1, {'email': 'uye2@example.com'})
+        
+        self.assertFalse(result['success'])
+        self.assertIndexed(1)
+        self.assertIndexed(2)
+    
+    def test_load_and_unload_keep_positions(self):
+        replacement = Member(id=2, **member_data(2, name='Değişen'))
+        self.manager.load_entity(replacement)
+        self.assertIs(self.manager.members[1], replacement)
+        
+        self.manager.unload_entity(1)
+        self.manager.load_entity(Member(id=9, **member_data(9)))
+        self.assertEqual([m.id for m in self.manager.members], [2, 3, 9])
+        
+        self.manager.load_entity(Member(id=9, **member_data(9, name='Son')))
+        self.assertEqual([m.name for m in self.manager.members], ['Değişen', 'Üye 3', 'Son'])
+
+
+class MemberSearchTest(unittest.TestCase):
+    """n-gram indeksi, tüm alanları tarayan alt dize aramasıyla aynı üyeleri bulmalı"""
+    
+    MEMBERS = [
+        ('Ayşe Şahin', 'ayse.sahin@example.com', 'Hacettepe', 'Kimya'),
+        ('IŞIK Doğan', 'isik@example.com', 'ODTÜ', 'Fizik'),
+        ('Sahin Kaya', 'kaya@example.com', 'Ankara Üniversitesi', 'Tarih'),
+        ('Ali Veli', 'ali@example.com', 'Gazi', 'Matematik Mühendisliği'),
+        ('Veli Ali', 'veli.ali@example.com', 'Bilkent', 'Fizik')
+    ]
+    
+    def setUp(self):
+        self.manager = MemberManager()
+        for index, (name, email, university, department) in enumerate(self.MEMBERS, 1):
+            self.manager.create_member(member_data(index, name=name, email=email,
+                                                   university=university, department=department))
+    
+    def ids(self, query: str, **paging) -> list:
+        return [m['id'] for m in self.manager.search_members(query, **paging)['results']]
+    
+    def brute_force(self, query: str) -> set:
+        query = search_key(query)
+        return {m.id for m in self.manager.members
+                if query and any(query in search_key(getattr(m, field) or '')
+                                 for field in MemberManager.SEARCH_FIELDS)}
+    
+    def test_matches_brute_force(self):
+        for query in ('şahin', 'SAHIN', 'ışık', 'isik', 'ali', 'li', 'a', 'fizik', 'veli.ali',
+                      '0532', '@example', 'mühendis', 'yok', ''):
+            with self.subTest(query=query):
+                self.assertEqual(set(self.ids(query)), self.brute_force(query))
+    
+    def test_ranking_and_paging(self):
+        # Tam eşleşme > başta > kelime başında > içinde
+        self.assertEqual(self.ids('ali veli'), [4])
+        self.assertEqual(self.ids('ali')[:2], [4, 5])
+        self.assertEqual(self.ids('sahin'), [3, 1])
+        
+        found = self.manager.search_members('example', limit=2, offset=1)
+        self.assertEqual(found['total'], 5)
+        self.assertEqual([m['id'] for m in found['results']], self.ids('example')[1:3])
+    
+    def test_update_reindexes(self):
+        self.manager.update_member(2, {'name': 'Işıl Yıldız'})
+        self.assertEqual(self.ids('doğan'), [])
+        self.assertEqual(self.ids('yildiz'), [2])
+
+
+class MemberCursorTest(unittest.TestCase):
+    """Keyset sayfaları birleştirildiğinde tam sıralamayı vermeli"""
+    
+    NAMES = ['Çağrı Er', 'Cem Ak', 'Ilgın Su', 'İsmail Ok', 'Ömer Ay', 'Oya Tan',
+             'cem ak', 'Şule Ün', 'Selin Ak', 'Ümit Ar', 'Ulaş Er', 'Ayşe Öz']
+    
+    def setUp(self):
+        self.manager = MemberManager()
+        for index, name in enumerate(self.NAMES, 1):
+            self.manager.create_member(member_data(index, name=name, graduation_year=2000 + index % 3))
+    
+    def walk(self, sort: str, order: str, limit: int) -> list:
+        ids, cursor = [], None
+        while True:
+            page = self.manager.get_members_page(sort=sort, order=order, limit=limit, cursor=cursor)
+            self.assertTrue(page['success'])
+            self.assertLessEqual(len(page['results']), limit)
+            ids += [m['id'] for m in page['results']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                return ids
+    
+    def expected(self, sort: str, order: str) -> list:
+        members = self.manager.get_members_by_status('active')
+        key = {
+            'name': lambda m: turkish_sort_key(m.name),
+            'join_date': lambda m: m.join_date,
+            'graduation_year': lambda m: m.graduation_year
+        }[sort]
+        return [m.id for m in sorted(members, key=lambda m: (key(m), m.id), reverse=order == 'desc')]
+    
+    def test_pages_follow_full_order(self):
+        for sort in MemberManager.SORT_FIELDS:
+            for order in ('asc', 'desc'):
+                for limit in (1, 5, 12, 50):
+                    with self.subTest(sort=sort, order=order, limit=limit):
+                        self.assertEqual(self.walk(sort, order, limit), self.expected(sort, order))
+    
+    def test_turkish_alphabet(self):
+        names = [self.manager._by_id[i].name for i in self.walk('name', 'asc', 4)]
+        self.assertLess(names.index('Cem Ak'), names.index('Çağrı Er'))
+        self.assertLess(names.index('Ilgın Su'), names.index('İsmail Ok'))
+        self.assertLess(names.index('Oya Tan'), names.index('Ömer Ay'))
+    
+    def test_inserts_do_not_shift_pages(self):
+        first = self.manager.get_members_page(sort='graduation_year', limit=4)
+        seen = [m['id'] for m in first['results']]
+        # İlk sayfanın önüne düşen yeni üye sonraki sayfaları kaydırmamalı
+        self.manager.create_member(member_data(99, graduation_year=1990))
+        rest = self.manager.get_members_page(sort='graduation_year', limit=50,
+                                             cursor=first['next_cursor'])
+        ids = seen + [m['id'] for m in rest['results']]
+        self.assertEqual(sorted(ids), list(range(1, len(self.NAMES) + 1)))
+    
+    def test_cursor_bound_to_sort(self):
+        page = self.manager.get_members_page(sort='name', limit=2)
+        other = self.manager.get_members_page(sort='join_date', limit=2, cursor=page['next_cursor'])
+        self.assertFalse(other['success'])
+        self.assertFalse(self.manager.get_members_page(cursor='bozuk!')['success'])
+
+
+class MembersPageRouteTest(unittest.TestCase):
+    """GET /api/members?sort=&limit=&cursor= sayfaları tüm aktif üyeleri bir kez verir"""
+    
+    def setUp(self):
+        self.client, self.manager, self.headers = app.test_client(), member_manager, auth_headers()
+        for index in range(3):
+            self.manager.create_member(member_data(950 + index, phone=f'0539{950 + index:07d}',
+                                                   email=f'sayfa{index}@example.com'))
+    
+    def get(self, **args):
+        return self.client.get('/api/members', query_string=args, headers=self.headers)
+    
+    def test_walk_pages(self):
+        ids, cursor = [], None
+        while True:
+            args = {'sort': 'graduation_year', 'order': 'desc', 'limit': 2, 'include_total': 'true'}
+            if cursor:
+                args['cursor'] = cursor
+            data = self.get(**args).get_json()
+            self.assertLessEqual(len(data['members']), 2)
+            ids += [m['id'] for m in data['members']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        
+        active = self.manager.get_members_by_status('active')
+        self.assertEqual(data['total'], len(active))
+        self.assertEqual(sorted(ids), sorted(m.id for m in active))
+        self.assertEqual(len(ids), len(set(ids)))
+    
+    def test_invalid_arguments(self):
+        for args in ({'sort': 'phone'}, {'sort': 'name', 'order': 'up'}, {'limit': 0}, {'limit': 'abc'},
+                     {'cursor': 'bozuk!'}):
+            with self.subTest(args=args):
+                response = self.get(**args)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.get_json()['success'])
+    
+    def test_cursor_round_trip(self):
+        values = ['ad', 3, datetime(2026, 1, 2, 3, 4, 5), None]
+        self.assertEqual(decode_cursor(encode_cursor(*values)), values)
+        self.assertIsNone(decode_cursor('e30'))  # {} liste değil
+
+
+class MemberStatisticsTest(unittest.TestCase):
+    """Artımlı sayaçlar her değişiklikten sonra tüm üyeleri taramakla aynı sonucu vermeli"""
+    
+    UNIVERSITIES = ['ODTÜ', 'Hacettepe', 'Gazi']
+    
+    def setUp(self):
+        self.manager = MemberManager()
+        start = datetime(2024, 1, 1)
+        for index in range(1, 9):
+            self.manager.create_member(member_data(
+                index, graduation_year=2000 + index % 3, university=self.UNIVERSITIES[index % 3],
+                join_date=start + timedelta(days=index * 7 % 30)))
+    
+    def expected(self) -> dict:
+        active = [m for m in self.manager.members if m.status == 'active']
+        recent = sorted(active, key=lambda m: (m.join_date, m.id), reverse=True)
+        return {
+            'total_members': len(active),
+            'inactive_members': sum(m.status == 'inactive' for m in self.manager.members),
+            'graduation_year_distribution': dict(Counter(m.graduation_year for m in active)),
+            'university_distribution': dict(Counter(m.university for m in active)),
+            'recent_members': [m.id for m in recent[:MemberManager.RECENT_MEMBERS]]
+        }
+    
+    def assertStatistics(self):
+        statistics = self.manager.get_statistics()
+        statistics['recent_members'] = [m['id'] for m in statistics['recent_members']]
+        self.assertEqual(statistics, self.expected())
+    
+    def test_counters_follow_changes(self):
+        self.assertStatistics()
+        self.manager.update_member(1, {'university': 'Bilkent', 'graduation_year': 1999})
+        self.manager.update_member(2, {'join_date': '2025-01-01T00:00:00'})
+        self.assertStatistics()
+        self.manager.delete_member(3)
+        self.manager.delete_member(4)
+        self.assertStatistics()
+        # Geçersiz güncelleme sayaçları değiştirmez
+        self.assertFalse(self.manager.update_member(5, {'graduation_year': 'abc'})['success'])
+        self.assertStatistics()
+    
+    def test_counters_follow_sync_and_restore(self):
+        self.manager.load_entity(Member(id=5, **member_data(5, university='Bilkent', status='inactive')))
+        self.manager.load_entity(Member(id=20, **member_data(20, join_date=datetime(2030, 1, 1))))
+        self.manager.unload_entity(6)
+        self.assertStatistics()
+        self.assertEqual(self.manager.get_statistics()['recent_members'][0]['id'], 20)
+        
+        self.manager.restore_entities([Member(id=member.id, **member_data(member.id))
+                                       for member in self.manager.members[:3]])
+        self.assertStatistics()
+        self.assertEqual(self.manager.get_statistics()['university_distribution'], {'ODTÜ': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Restore Tests - Yedekten geri yükleme (depo ve indeksler)
+"""
+
+import json
+import unittest
+from datetime import datetime
+
+from app import app
+from models import member_manager, event_manager, enrollment_manager, rollup_manager
+from models.rollup import month_key
+from tests.test_etag import auth_headers
+
+
+def member_payload(index: int):
+    return {
+        'name': f'Yedek Üye {index}', 'phone': f'0533888{index:04d}',
+        'email': f'yedek{index}@example.com', 'graduation_year': 2011,
+        'university': 'ODTÜ', 'department': 'Fizik'
+    }
+
+
+class RestoreTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.client = app.test_client()
+        self.headers = auth_headers()
+    
+    def post(self, path, payload=None):
+        return self.client.post(path, headers=self.headers, json=payload)
+    
+    def test_restore_replaces_state_and_indexes(self):
+        kept = self.post('/api/members', member_payload(1)).get_json()['member']
+        event = self.post('/api/events', {
+            'title': 'Yedek Etkinlik', 'description': 'Açıklama', 'date': '2031-01-01', 'start_time': '10:00', 'location': 'L'
+        }).get_json()['event']
+        self.post(f"/api/events/{event['id']}/participants/{kept['id']}", {})
+        backup = json.loads(self.post('/api/admin/backup').get_data())['backup_data']
+        
+        dropped = self.post('/api/members', member_payload(2)).get_json()['member']
+        enrollment_manager.withdraw(kept['id'], event['id'])
+        
+        response = self.post('/api/admin/restore', {'backup_data': backup})
+        self.assertEqual(response.status_code, 200)
+        result = response.get_json()
+        self.assertEqual(result['restored_members'], len(backup['members']))
+        self.assertEqual(result['restored_logs'], len(backup['activity_logs']))
+        self.assertEqual(result['restored_enrollments'],
+                         sum(len(e['participants']) for e in backup['events']))
+        
+        self.assertIsNone(member_manager.get_member_by_id(dropped['id']))
+        self.assertIsNone(member_manager.get_member_by_email(dropped['email']))
+        restored = member_manager.get_member_by_email(kept['email'])
+        self.assertEqual(restored.id, kept['id'])
+        self.assertIsNotNone(event_manager.get_event_by_id(event['id']).start_datetime)
+        self.assertIsNotNone(enrollment_manager.get_enrollment(kept['id'], event['id']))
+        
+        # Silinen üyenin e-postası yeniden kullanılabilir, yeni ID'ler yedektekilerle çakışmaz
+        again = self.post('/api/members', member_payload(2))
+        self.assertEqual(again.status_code, 201)
+        self.assertNotIn(again.get_json()['member']['id'], [m['id'] for m in backup['members']])
+    
+    def test_restore_replaces_enrollments(self):
+        first = self.post('/api/members', member_payload(4)).get_json()['member']
+        event = self.post('/api/events', {
+            'title': 'Kayıt Etkinliği', 'description': 'Açıklama', 'date': '2031-02-01',
+            'start_time': '10:00', 'location': 'L'
+        }).get_json()['event']
+        self.post(f"/api/events/{event['id']}/participants/{first['id']}", {})
+        backup = json.loads(self.post('/api/admin/backup').get_data())['backup_data']
+        month = month_key(datetime.now())
+        
+        # Yedekten sonra: durum değişikliği, yeni kayıt ve yedekte olmayan üyenin kaydı
+        enrollment_manager.update_status(first['id'], event['id'], 'attended')
+        later = self.post('/api/members', member_payload(5)).get_json()['member']
+        enrollment_manager.enroll(later['id'], event['id'])
+        
+        self.assertEqual(self.post('/api/admin/restore', {'backup_data': backup}).status_code, 200)
+        self.assertEqual(enrollment_manager.get_enrollment(first['id'], event['id']).status,
+                         'registered')
+        self.assertIsNone(enrollment_manager.get_enrollment(later['id'], event['id']))
+        self.assertEqual(enrollment_manager.count_for_event(event['id']), 1)
+        self.assertEqual(event_manager.get_event_by_id(event['id']).to_dict()['participant_count'], 1)
+        # Aylık özet geri yüklenen kayıtlarla uyumlu
+        attended = [e for e in enrollment_manager.iter_entities()
+                    if e.status == 'attended' and month_key(e.status_date) == month]
+        self.assertEqual(rollup_manager.get_report(month, month, ['attendance'])[0]['attendance'],
+                         len(attended))
+    
+    def test_invalid_backup_leaves_state_untouched(self):
+        created = self.post('/api/members', member_payload(3)).get_json()['member']
+        response = self.post('/api/admin/restore', {'backup_data': {'members': [{'name': 'ID yok'}]}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNotNone(member_manager.get_member_by_id(created['id']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rollup Tests - Aylık özetlerin worker'lar arası tutarlılığı
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+from models.rollup import RollupManager
+from storage import SQLiteStore, StorageConflictError
+
+
+class RollupWorkersTest(unittest.TestCase):
+    """Aynı SQLite dosyasını paylaşan iki worker"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'ankader.db')
+        self.workers = []
+        for _ in range(2):
+            manager, store = RollupManager(), SQLiteStore(path)
+            store.attach(manager)
+            store.recover()
+            self.workers.append((manager, store))
+    
+    def tearDown(self):
+        for _, store in self.workers:
+            store.close()
+        shutil.rmtree(self.directory)
+    
+    def value(self, manager: RollupManager) -> int:
+        return manager.get_report('2026-03', '2026-03', ['attendance'])[0]['attendance']
+    
+    def test_concurrent_increments_are_not_lost(self):
+        (first, first_store), (second, second_store) = self.workers
+        moment = datetime(2026, 3, 5)
+        first.record('attendance', moment)
+        second_store.sync()
+        first.record('attendance', moment)
+        # İkinci worker'ın bellekteki değeri eski (1); artış depodaki değere eklenmeli
+        second.record('attendance', moment, 2)
+        self.assertEqual(self.value(second), 4)
+        first_store.sync()
+        self.assertEqual(self.value(first), 4)
+    
+    def test_insert_conflict_retries_as_increment(self):
+        (first, first_store), (second, second_store) = self.workers
+        moment = datetime(2026, 3, 5)
+        first.record('attendance', moment)
+        # İkinci worker satırı henüz görmedi; ekleme çakışır ve artışa dönmeli
+        second.record('attendance', moment)
+        self.assertEqual(self.value(second), 2)
+        first_store.sync()
+        second_store.sync()
+        self.assertEqual(self.value(first), 2)
+        self.assertEqual(self.value(second), 2)
+        self.assertEqual(len(second.iter_entities()), 1)
+    
+    def test_persistent_conflict_is_logged(self):
+        manager, store = self.workers[0]
+        with mock.patch.object(store, 'insert', side_effect=StorageConflictError('çakışma')), \
+                self.assertLogs('models.rollup', 'ERROR') as logs:
+            manager.record('attendance', datetime(2026, 3, 5))
+        self.assertIn('2026-03', logs.output[0])
+        self.assertEqual(self.value(manager), 0)
+    
+    def test_concurrent_backfill_loads_other_workers_rows(self):
+        (first, first_store), (second, second_store) = self.workers
+        members = SimpleNamespace(members=[SimpleNamespace(join_date=datetime(2026, 3, 1))])
+        events = SimpleNamespace(events=[])
+        enrollments = SimpleNamespace(iter_entities=lambda: [])
+        logs = SimpleNamespace(logs=[])
+        
+        self.assertEqual(first.backfill(members, events, enrollments, logs), 1)
+        # İkinci worker başlangıçta boş tabloyu gördü; çakışma çökmeye yol açmamalı
+        self.assertEqual(second.backfill(members, events, enrollments, logs), 0)
+        report = second.get_report('2026-03', '2026-03', ['new_members'])
+        self.assertEqual(report[0]['new_members'], 1)
+
+
+
+class RollupRebuildTest(unittest.TestCase):
+    
+    def test_rebuild_matches_raw_data(self):
+        manager = RollupManager()
+        manager.record('attendance', datetime(2026, 1, 10), 3)
+        manager.record('attendance', datetime(2026, 2, 10), 1)
+        manager.record('login_count', datetime(2026, 1, 10), 5)
+        enrollments = SimpleNamespace(iter_entities=lambda: [
+            SimpleNamespace(status='attended', status_date=datetime(2026, 2, 1)),
+            SimpleNamespace(status='attended', status_date=datetime(2026, 3, 1)),
+            SimpleNamespace(status='registered', status_date=datetime(2026, 3, 1))
+        ])
+        
+        changed = manager.rebuild(['attendance'], None, None, enrollments, None)
+        self.assertEqual(changed, 2)
+        report = manager.get_report('2026-01', '2026-03', ['attendance', 'login_count'])
+        self.assertEqual([r['attendance'] for r in report], [0, 1, 1])
+        # Yeniden hesaplanmayan metrikler olduğu gibi kalır
+        self.assertEqual(report[0]['login_count'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serialization Tests - Önbellekli JSON'un yenilenmesi ve alan seçimi (projeksiyonlar)
+"""
+
+import json
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from app import app
+from models import enrollment_manager, event_manager, member_manager
+from models.event import Event
+from models.member import Member
+from tests.test_etag import auth_headers
+from tests.test_events import event_data
+from tests.test_members import member_data
+
+
+class CachedJSONTest(unittest.TestCase):
+    """Adlandırılmış projeksiyonlar önbellekten döner; değişiklikte yeniden üretilir"""
+    
+    def setUp(self):
+        self.event = event_manager.get_event_by_id(
+            event_manager.create_event(event_data(3))['event']['id'])
+        member_id = member_manager.create_member(member_data(
+            self.event.id, phone=f'0538{self.event.id:07d}',
+            email=f'json{self.event.id}@example.com'))['member']['id']
+        self.member = member_manager.get_member_by_id(member_id)
+    
+    def test_member_field_change_invalidates(self):
+        detail = self.member.to_json()
+        self.assertIs(self.member.to_json(), detail)
+        self.assertEqual(json.loads(detail), self.member.to_dict())
+        
+        self.member.notes = 'güncel'
+        self.assertEqual(json.loads(self.member.to_json())['notes'], 'güncel')
+        # Özel alan listeleri önbelleğe alınmaz
+        custom = self.member.to_json(('id', 'notes'))
+        self.assertEqual(json.loads(custom), {'id': self.member.id, 'notes': 'güncel'})
+        self.assertIsNot(self.member.to_json(('id', 'notes')), custom)
+    
+    def test_enrollment_change_invalidates_both_sides(self):
+        summary_fields = Event.PROJECTIONS['summary']
+        member_detail = self.member.to_json()
+        event_summary = self.event.to_json(fields=summary_fields)
+        self.assertEqual(json.loads(event_summary)['participant_count'], 0)
+        
+        enrollment_manager.enroll(self.member.id, self.event.id)
+        self.assertEqual(json.loads(self.event.to_json(fields=summary_fields))['participant_count'], 1)
+        self.assertIsNot(self.member.to_json(), member_detail)
+        self.assertEqual(json.loads(self.member.to_json())['event_count'], 1)
+        self.assertEqual(json.loads(self.member.to_json(Member.PROJECTIONS['summary'])),
+                         self.member.to_dict(Member.PROJECTIONS['summary']))
+    
+    def test_event_turning_past_invalidates(self):
+        before = self.event.start_datetime - timedelta(hours=1)
+        after = self.event.start_datetime + timedelta(hours=1)
+        self.assertTrue(json.loads(self.event.to_json(before))['is_upcoming'])
+        self.assertIs(self.event.to_json(before), self.event.to_json(before))
+        self.assertTrue(json.loads(self.event.to_json(after))['is_past'])
+    
+    def test_detail_route_reflects_enrollment(self):
+        client = app.test_client()
+        url = f'/api/events/{self.event.id}'
+        self.assertEqual(client.get(url, headers=auth_headers()).get_json()['event']['participant_count'], 0)
+        enrollment_manager.enroll(self.member.id, self.event.id)
+        self.assertEqual(client.get(url, headers=auth_headers()).get_json()['event']['participant_count'], 1)
+
+
+class ProjectionTest(unittest.TestCase):
+    """fields= yalnızca istenen alanları hesaplar ve gönderir"""
+    
+    def test_resolve_fields(self):
+        self.assertIsNone(Member.resolve_fields(''))
+        self.assertEqual(Member.resolve_fields('summary'), Member.PROJECTIONS['summary'])
+        self.assertEqual(Member.resolve_fields(' email, name,email '), ('id', 'email', 'name'))
+        self.assertEqual(Member.projection_name(Member.resolve_fields('detail')), 'detail')
+        with self.assertRaises(ValueError):
+            Event.resolve_fields('title,sifre')
+    
+    def test_unrequested_fields_are_not_computed(self):
+        member = Member(id=1, **member_data(1))
+        getter = mock.Mock(return_value=[])
+        with mock.patch.dict(Member.FIELD_GETTERS, {'events': getter}):
+            self.assertEqual(set(member.to_dict(Member.PROJECTIONS['summary'])),
+                             set(Member.PROJECTIONS['summary']))
+            getter.assert_not_called()
+            member.to_dict()
+            getter.assert_called_once_with(member)
+    
+    def test_list_routes(self):
+        client = app.test_client()
+        event_manager.create_event(event_data(4))
+        member_manager.create_member(member_data(960, phone='05399000960', email='alan@example.com'))
+        response = client.get('/api/members', query_string={'fields': 'name,email'},
+                              headers=auth_headers())
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()['members'])
+        self.assertTrue(all(set(m) == {'id', 'name', 'email'} for m in response.get_json()['members']))
+        
+        events = client.get('/api/events', query_string={'fields': 'summary'},
+                            headers=auth_headers()).get_json()['events']
+        self.assertTrue(events)
+        self.assertTrue(all(set(e) == set(Event.PROJECTIONS['summary']) for e in events))
+        
+        response = client.get('/api/events', query_string={'fields': 'title,yok'}, headers=auth_headers())
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('yok', response.get_json()['message'])
+
+
+if __name__ == '__main__':
+    unittest.main()
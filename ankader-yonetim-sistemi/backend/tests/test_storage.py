@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Storage Tests - Kalıcı depoların yeniden yükleme ve worker senkronizasyonu
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from models.member import MemberManager
+from models.enrollment import EnrollmentManager
+from models.activity_log import ActivityLogManager
+from storage import SQLiteStore, JournalStore
+from tests.test_members import member_data
+
+
+def open_workers(store_factory):
+    """Depoya bağlı yeni yöneticiler (yeni bir worker ya da yeniden başlatma)"""
+    members, enrollments, store = MemberManager(), EnrollmentManager(), store_factory()
+    store.attach(members, enrollments)
+    store.recover()
+    return members, enrollments, store
+
+
+class RoundTripMixin:
+    """Yazılan durum, depo yeniden açıldığında aynen geri gelmeli"""
+    
+    def make_store(self):
+        raise NotImplementedError
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stores = []
+    
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+    
+    def open(self):
+        workers = open_workers(self.make_store)
+        self.stores.append(workers[2])
+        return workers
+    
+    def test_round_trip(self):
+        members, enrollments, store = self.open()
+        for index in range(1, 4):
+            members.create_member(member_data(index, custom_fields={'şehir': 'Ankara'}))
+        members.update_member(2, {'notes': 'güncellendi', 'graduation_year': 2015})
+        members.delete_member(3)
+        enrollments.enroll(1, 10, status='attended')
+        enrollments.enroll(2, 10)
+        enrollments.withdraw(2, 10)
+        store.close()
+        
+        members, enrollments, _ = self.open()
+        self.assertEqual([m.id for m in members.members], [1, 2, 3])
+        second = members.get_member_by_id(2)
+        self.assertEqual((second.notes, second.graduation_year), ('güncellendi', 2015))
+        self.assertEqual(second.custom_fields, {'şehir': 'Ankara'})
+        self.assertIsInstance(second.join_date, datetime)
+        self.assertEqual(members.members[2].status, 'inactive')
+        self.assertIsNone(members.get_member_by_id(3))
+        self.assertEqual(members.get_statistics()['total_members'], 2)
+        self.assertEqual(enrollments.status_counts_for_event(10), {'attended': 1})
+        self.assertIsNone(enrollments.get_enrollment(2, 10))
+        
+        # Yeni ID'ler eski kayıtlarla çakışmaz
+        self.assertTrue(members.create_member(member_data(4))['success'])
+        self.assertEqual(members.get_member_by_email('uye4@example.com').id, 4)
+
+
+class SQLiteRoundTripTest(RoundTripMixin, unittest.TestCase):
+    
+    def make_store(self):
+        return SQLiteStore(os.path.join(self.directory, 'ankader.db'))
+
+
+class JournalRoundTripTest(RoundTripMixin, unittest.TestCase):
+    
+    def make_store(self):
+        return JournalStore(self.directory, snapshot_interval=0)
+    
+    def test_snapshot_and_replay(self):
+        members, _, store = self.open()
+        members.create_member(member_data(1))
+        store.snapshot()
+        members.create_member(member_data(2))
+        members.update_member(1, {'notes': 'anlık görüntüden sonra'})
+        store.close()
+        
+        members, _, _ = self.open()
+        self.assertEqual(len(members.members), 2)
+        self.assertEqual(members.get_member_by_id(1).notes, 'anlık görüntüden sonra')
+    
+    def test_second_writer_refused(self):
+        _, _, store = self.open()
+        with self.assertRaisesRegex(RuntimeError, '-w 1'):
+            open_workers(self.make_store)
+        
+        store.close()
+        self.open()
+
+
+class JournalRecoveryTest(unittest.TestCase):
+    """Çökme sonrası açılış: yarım kalan kayıt, anlık görüntü nesilleri ve toplu işlemler"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stores = []
+    
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+    
+    def open(self, manager_class=MemberManager):
+        manager, store = manager_class(), JournalStore(self.directory, snapshot_interval=0)
+        store.attach(manager)
+        store.recover()
+        self.stores.append(store)
+        return manager, store
+    
+    def files(self) -> list:
+        return sorted(name for name in os.listdir(self.directory) if not name.startswith('.'))
+    
+    def test_snapshot_failure_is_logged(self):
+        members, store = MemberManager(), JournalStore(self.directory, snapshot_interval=0.01)
+        store.attach(members)
+        self.stores.append(store)
+        with mock.patch.object(store, 'snapshot', side_effect=OSError('disk dolu')), \
+                self.assertLogs('storage.journal_store', 'ERROR') as logs:
+            store.recover()
+            members.create_member(member_data(1))
+            deadline = time.monotonic() + 5
+            while not logs.output and time.monotonic() < deadline:
+                time.sleep(0.01)
+            store._stop.set()
+        self.assertIn('disk dolu', logs.output[0])
+    
+    def test_torn_tail_is_ignored(self):
+        members, store = self.open()
+        members.create_member(member_data(1))
+        members.create_member(member_data(2))
+        path = store._path('journal', store._generation)
+        store.close()
+        # Çökme: son kaydın yalnızca başlığı yazılmış
+        with open(path, 'ab') as f:
+            f.write(b'\x40\x00\x00\x00\x01\x02')
+        
+        members, store = self.open()
+        self.assertEqual(sorted(m.id for m in members.members), [1, 2])
+        self.assertEqual(store.recovery['replayed_journal_records'], 2)
+        self.assertTrue(members.create_member(member_data(3))['success'])
+        store.close()
+        
+        members, _ = self.open()
+        self.assertEqual(sorted(m.id for m in members.members), [1, 2, 3])
+    
+    def test_snapshot_drops_old_generations(self):
+        members, store = self.open()
+        members.create_member(member_data(1))
+        store.snapshot()
+        members.create_member(member_data(2))
+        store.snapshot()
+        members.update_member(1, {'notes': 'son'})
+        store.close()
+        
+        # Yalnızca son anlık görüntü, ondan önceki günlük ve yeni günlük kalır
+        self.assertEqual(self.files(), ['journal-00000002.log', 'journal-00000003.log',
+                                        'snapshot-00000003.bin'])
+        members, store = self.open()
+        self.assertEqual(store.recovery['snapshot_generation'], 3)
+        self.assertEqual(store.recovery['replayed_journal_records'], 2)
+        self.assertEqual(members.get_member_by_id(1).notes, 'son')
+        self.assertEqual(len(members.members), 2)
+    
+    def test_replace_and_purge_replay(self):
+        logs, store = self.open(ActivityLogManager)
+        for days_ago in (40, 20, 1):
+            logs.create_log({'user_id': 1, 'action': 'login',
+                             'created_at': datetime.now() - timedelta(days=days_ago)})
+        store.purge_before('activity_logs', datetime.now() - timedelta(days=30))
+        members = MemberManager()
+        store.attach(members)
+        store.replace('members', [MemberManager.model(id=7, **member_data(7))])
+        store.close()
+        
+        logs, store = self.open(ActivityLogManager)
+        self.assertEqual(logs.count_logs(), 2)
+        store.close()
+        members, store = self.open()
+        self.assertEqual([m.id for m in members.members], [7])
+        self.assertEqual(store.insert('members', members.members[0]), 8)
+
+
+class SQLiteSyncTest(unittest.TestCase):
+    """İki worker aynı veritabanını paylaşır; değişiklikler sync() ile yayılır"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'ankader.db')
+        self.first = open_workers(lambda: SQLiteStore(path))
+        self.second = open_workers(lambda: SQLiteStore(path))
+    
+    def tearDown(self):
+        self.first[2].close()
+        self.second[2].close()
+        shutil.rmtree(self.directory)
+    
+    def test_changes_propagate(self):
+        members, enrollments, _ = self.first
+        other_members, other_enrollments, other_store = self.second
+        
+        members.create_member(member_data(1))
+        members.create_member(member_data(2))
+        enrollments.enroll(1, 10)
+        enrollments.enroll(2, 10)
+        other_store.sync()
+        self.assertEqual(len(other_members.members), 2)
+        self.assertIsNotNone(other_members.get_member_by_email('uye2@example.com'))
+        self.assertEqual(other_enrollments.count_for_event(10), 2)
+        
+        members.update_member(1, {'email': 'yeni@example.com'})
+        enrollments.withdraw(2, 10)
+        other_store.sync()
+        self.assertIsNone(other_members.get_member_by_email('uye1@example.com'))
+        self.assertEqual(other_members.get_member_by_email('yeni@example.com').id, 1)
+        self.assertEqual(other_enrollments.count_for_event(10), 1)
+    
+    def test_own_writes_are_not_applied_twice(self):
+        members, _, store = self.first
+        other_members, _, other_store = self.second
+        members.create_member(member_data(1))
+        other_members.create_member(member_data(2))
+        
+        store.sync()
+        other_store.sync()
+        for manager in (members, other_members):
+            self.assertEqual(sorted(m.id for m in manager.members), [1, 2])
+            self.assertEqual(manager.get_statistics()['total_members'], 2)
+    
+    def test_unique_constraint_across_workers(self):
+        members, _, _ = self.first
+        other_members, _, _ = self.second
+        self.assertTrue(members.create_member(member_data(1))['success'])
+        # Diğer worker bu üyeyi henüz görmedi; depo kısıtı yine de ihlali engeller
+        result = other_members.create_member(member_data(2, email='uye1@example.com'))
+        self.assertFalse(result['success'])
+        self.assertEqual(len(other_members.members), 0)
+
+
+
+class SQLitePurgeSyncTest(unittest.TestCase):
+    """Kalıcı silmeler (log temizliği) diğer worker'lara da yansımalı"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'ankader.db')
+        self.workers = []
+        for _ in range(2):
+            manager, store = ActivityLogManager(), SQLiteStore(path)
+            store.attach(manager)
+            store.recover()
+            self.workers.append((manager, store))
+    
+    def tearDown(self):
+        for _, store in self.workers:
+            store.close()
+        shutil.rmtree(self.directory)
+    
+    def log(self, manager, days_ago: int = 0):
+        manager.create_log({'user_id': 1, 'action': 'member_update',
+                            'created_at': datetime.now() - timedelta(days=days_ago)})
+    
+    def test_clear_and_new_writes_reach_other_workers(self):
+        (first, first_store), (second, second_store) = self.workers
+        for _ in range(3):
+            self.log(first)
+        second_store.sync()
+        self.assertEqual(second.count_logs(), 3)
+        token = second_store.state_token('activity_logs')
+        
+        first.clear_all_logs()
+        self.log(first)
+        second_store.sync()
+        # Seq sayacı silmeden sonra geri gitmez; yeni log ve silme birlikte görülür
+        self.assertEqual(second.count_logs(), 1)
+        self.assertEqual([l.id for l in second.logs], [l.id for l in first.logs])
+        self.assertNotEqual(second_store.state_token('activity_logs'), token)
+        self.assertEqual(first_store.state_token('activity_logs'),
+                         second_store.state_token('activity_logs'))
+    
+    def test_retention_cleanup_reaches_other_workers(self):
+        (first, _), (second, second_store) = self.workers
+        self.log(first, days_ago=40)
+        self.log(first)
+        second_store.sync()
+        first.cleanup_logs_older_than(30)
+        second_store.sync()
+        self.assertEqual(second.count_logs(), 1)
+    
+    def test_worker_behind_pruned_tombstones_reloads(self):
+        (first, first_store), (second, second_store) = self.workers
+        self.log(first, days_ago=40)
+        self.log(first)
+        second_store.sync()
+        with mock.patch.object(SQLiteStore, 'TOMBSTONE_TTL', timedelta(seconds=-1)):
+            first.cleanup_logs_older_than(30)
+            # Sonraki temizlik ilk temizliğin izlerini siler
+            first.cleanup_logs_older_than(30)
+        second_store.sync()
+        self.assertEqual(second.count_logs(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
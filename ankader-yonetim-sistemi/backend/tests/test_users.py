@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+User Tests - Kullanıcı indeksleri ve istek başına kimlik doğrulama
+"""
+
+import unittest
+from unittest import mock
+
+from flask import g
+
+from app import app
+from middleware import auth_required, permission_required
+from models import user_manager
+from models.user import User, UserManager
+from tests.test_etag import auth_headers
+
+
+def user_data(index: int, **overrides):
+    data = {
+        'name': f'Kullanıcı {index}',
+        'phone': f'0533{index:07d}',
+        'password': 'gizli123',
+        'role': 'admin'
+    }
+    data.update(overrides)
+    return data
+
+
+class UserIndexTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.manager = UserManager()
+        for index in range(1, 4):
+            self.assertTrue(self.manager.create_user(user_data(index))['success'])
+    
+    def test_authenticate_normalizes_name(self):
+        user = self.manager.authenticate('  kullanıcı 2 ', '05330000002', 'gizli123')
+        self.assertIsNotNone(user)
+        self.assertEqual(user.id, 2)
+        self.assertIsNotNone(user.last_login)
+        self.assertIsNone(self.manager.authenticate('Kullanıcı 2', '05330000002', 'yanlış'))
+        self.assertIsNone(self.manager.authenticate('Kullanıcı 2', '05330000003', 'gizli123'))
+        
+        self.manager.delete_user(2)
+        self.assertIsNone(self.manager.authenticate('Kullanıcı 2', '05330000002', 'gizli123'))
+    
+    def test_update_reindexes_login(self):
+        result = self.manager.update_user(1, {'name': 'Yeni Ad', 'phone': '05339999999'})
+        self.assertTrue(result['success'])
+        self.assertIsNone(self.manager.authenticate('Kullanıcı 1', '05330000001', 'gizli123'))
+        self.assertIsNone(self.manager.get_user_by_phone('05330000001'))
+        self.assertEqual(self.manager.authenticate('yeni ad', '05339999999', 'gizli123').id, 1)
+    
+    def test_phone_collision_keeps_indexes(self):
+        result = self.manager.update_user(1, {'name': 'Çakışan', 'phone': '05330000002'})
+        self.assertFalse(result['success'])
+        self.assertEqual(self.manager.get_user_by_phone('05330000001').id, 1)
+        self.assertEqual(self.manager.get_user_by_phone('05330000002').id, 2)
+        self.assertEqual(self.manager.authenticate('Kullanıcı 1', '05330000001', 'gizli123').id, 1)
+    
+    def test_load_and_unload(self):
+        self.manager.load_entity(User(id=2, **user_data(2, name='Senkron')))
+        self.manager.load_entity(User(id=9, **user_data(9)))
+        self.assertEqual(self.manager.get_user_by_id(2).name, 'Senkron')
+        self.assertIsNone(self.manager.authenticate('Kullanıcı 2', '05330000002', 'gizli123'))
+        self.assertEqual(self.manager.get_user_by_phone('05330000009').id, 9)
+        
+        self.manager.unload_entity(9)
+        self.assertIsNone(self.manager.get_user_by_id(9))
+        self.assertIsNone(self.manager.get_user_by_phone('05330000009'))
+        self.assertEqual(len(self.manager.users), 3)
+
+
+class RequestAuthTest(unittest.TestCase):
+    """İç içe decorator'lar token'ı ve kullanıcıyı istek başına bir kez çözmeli"""
+    
+    def test_user_resolved_once(self):
+        @auth_required
+        @permission_required('members', 'read')
+        def view():
+            return g.user.id
+        
+        with mock.patch.object(user_manager, 'get_user_by_id',
+                               wraps=user_manager.get_user_by_id) as lookup:
+            with app.test_request_context(headers=auth_headers()):
+                self.assertEqual(view(), 1)
+        self.assertEqual(lookup.call_count, 1)
+    
+    def test_missing_token(self):
+        with app.test_request_context():
+            response, status = auth_required(lambda: 'ok')()
+        self.assertEqual(status, 401)
+        self.assertFalse(response.get_json()['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()